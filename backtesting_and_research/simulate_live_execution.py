@@ -1,7 +1,6 @@
 import os
 import json
 import logging
-import requests
 import pandas as pd
 from datetime import datetime, timedelta, date
 import pytz
@@ -9,12 +8,15 @@ import pandas_market_calendars as mcal
 from google.cloud import bigquery
 import time
 import math
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.enrichment.core.clients.research import fetch_minute_bars  # cached (POLYGON_CACHE_PATH)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 PROJECT_ID = "profitscout-fida8"
-POLYGON_API_KEY = os.environ.get("POLYGON_API_KEY", "")
 
 # Set up NYSE calendar
 nyse = mcal.get_calendar('NYSE')
@@ -56,30 +58,6 @@ def build_polygon_ticker(underlying: str, expiration: date, direction: str, stri
         logger.error(f"Failed to build ticker for {underlying}: {e}")
         return None
 
-def fetch_minute_bars(ticker: str, start_date: date, end_date: date) -> list:
-    """Fetch 1-minute bars from Polygon for the given window."""
-    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/minute/{start_date.isoformat()}/{end_date.isoformat()}"
-    params = {
-        "adjusted": "true",
-        "sort": "asc",
-        "limit": 50000,
-        "apiKey": POLYGON_API_KEY
-    }
-    
-    for attempt in range(3):
-        try:
-            resp = requests.get(url, params=params, timeout=15)
-            if resp.status_code == 429:
-                time.sleep(2 * (attempt + 1))
-                continue
-            resp.raise_for_status()
-            data = resp.json()
-            return data.get("results", [])
-        except Exception as e:
-            logger.warning(f"Attempt {attempt+1} failed for {ticker}: {e}")
-            time.sleep(1)
-    return []
-
 def run_simulation():
     client = bigquery.Client(project=PROJECT_ID)
     
@@ -0,0 +1,256 @@
+"""
+Offline parameter sweep over archived overnight-scanner metric rows.
+
+Re-runs scoring and the cluster boost (batch_scoring.score_arrays) for
+every combination in a parameter grid across every archived scan day,
+in parallel, and joins the signals each combination would have surfaced
+to their outcomes in signal_performance. No chain is refetched: the
+inputs are the daily metric rows the scanner archives under
+SCANNER_METRICS_URI (see pipelines/metrics_archive.py).
+
+    python backtesting_and_research/sweep_scoring_params.py --start 2026-01-01
+    python backtesting_and_research/sweep_scoring_params.py --archive /data/metrics \\
+        --grid grid.json --outcomes perf.csv --workers 8
+
+--grid is a JSON object of name -> list of values. Names are
+ScoreParams fields plus min_score, min_price_change_pct and top; anything
+not in the grid keeps the scanner's default. --outcomes reads a CSV
+export of signal_performance (scan_date, ticker, direction, peak_return,
+is_win) instead of querying BigQuery.
+
+Caveats when reading the results:
+- Only movers that passed Pass 1 on the day were archived, so
+  min_price_change_pct can only be tightened relative to the live value.
+- signal_performance only has outcomes for signals the live scanner
+  surfaced (and the enricher kept). A combination that surfaces other
+  tickers, or flips a ticker's direction, shows up as lower `coverage`
+  rather than as wins or losses; compare combinations at similar coverage.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.enrichment.core import config
+from src.enrichment.core.pipelines import batch_scoring, metrics_archive
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+PERFORMANCE_TABLE = f"{config.PROJECT_ID}.{config.BIGQUERY_DATASET}.signal_performance"
+
+# Scanner defaults for the knobs that are not ScoreParams fields.
+LIVE_MIN_SCORE = int(os.environ.get("MIN_SCORE", "6"))
+LIVE_MIN_PRICE_CHANGE_PCT = float(os.environ.get("MIN_PRICE_CHANGE", "1.0"))
+LIVE_TOP = 10
+
+DEFAULT_GRID = {
+    "min_score": [5, 6, 7],
+    "min_dollar_volume": [250_000, 500_000, 1_000_000],
+    "skew_strong": [2.5, 3.0, 4.0],
+    "vol_oi_weak": [0.5, 0.8, 1.2],
+    "uoa_weak": [250_000, 500_000, 1_000_000],
+    "cluster_min_size": [3, 4, 5],
+    "cluster_boost_threshold": [5, 6, 7],
+}
+_PARAM_FIELDS = {f.name for f in fields(batch_scoring.ScoreParams)}
+_EXTRA_FIELDS = {"min_score", "min_price_change_pct", "top"}
+
+
+def load_days(archive: metrics_archive.MetricsArchive, start: date | None, end: date | None) -> list[dict]:
+    """Archived days as score_arrays inputs: columns, industry codes, tickers."""
+    days = []
+    for d in archive.dates():
+        if (start and d < start) or (end and d > end):
+            continue
+        rows, metadata = metrics_archive.from_arrow(archive.read(d))
+        if not rows:
+            continue
+        tickers = [r["ticker"] for r in rows]
+        codes, _ = batch_scoring.industry_codes(tickers, metadata)
+        days.append({
+            "scan_date": d.isoformat(),
+            "tickers": np.array(tickers, dtype=object),
+            "cols": batch_scoring.columns_from_rows(rows),
+            "codes": codes,
+        })
+    return days
+
+
+def load_outcomes(path: str | None, start: date | None, end: date | None) -> dict:
+    """(scan_date, ticker) -> (bullish, is_win, peak_return) for final outcomes."""
+    if path:
+        with open(path, newline="", encoding="utf-8") as f:
+            records = list(csv.DictReader(f))
+    else:
+        from google.cloud import bigquery
+
+        where = ["is_final"]
+        if start:
+            where.append(f"scan_date >= '{start.isoformat()}'")
+        if end:
+            where.append(f"scan_date <= '{end.isoformat()}'")
+        query = f"""
+            SELECT CAST(scan_date AS STRING) AS scan_date, ticker, direction, peak_return, is_win
+            FROM `{PERFORMANCE_TABLE}`
+            WHERE {' AND '.join(where)}
+        """
+        client = bigquery.Client(project=config.PROJECT_ID)
+        records = [dict(r) for r in client.query(query).result()]
+    out = {}
+    for r in records:
+        is_win = r["is_win"] if isinstance(r["is_win"], bool) else str(r["is_win"]).lower() == "true"
+        out[(str(r["scan_date"])[:10], r["ticker"])] = (
+            r["direction"] == "BULLISH", is_win, float(r["peak_return"] or 0),
+        )
+    return out
+
+
+def attach_outcomes(days: list[dict], outcomes: dict):
+    """Per-day outcome arrays aligned to the day's tickers (-1 = no outcome)."""
+    for day in days:
+        n = len(day["tickers"])
+        direction = np.full(n, -1, dtype=np.int8)
+        win = np.zeros(n, dtype=bool)
+        peak = np.zeros(n)
+        for i, t in enumerate(day["tickers"]):
+            o = outcomes.get((day["scan_date"], t))
+            if o:
+                direction[i], win[i], peak[i] = int(o[0]), o[1], o[2]
+        day["out_dir"], day["out_win"], day["out_peak"] = direction, win, peak
+
+
+def expand_grid(grid: dict) -> list[dict]:
+    unknown = set(grid) - _PARAM_FIELDS - _EXTRA_FIELDS
+    if unknown:
+        raise SystemExit(f"Unknown grid parameters: {sorted(unknown)}")
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+_DAYS: list[dict] = []
+
+
+def _init_worker(days: list[dict]):
+    global _DAYS
+    _DAYS = days
+
+
+def evaluate(combo: dict) -> dict:
+    """Surface signals for one combination on every day and score them against outcomes."""
+    params = batch_scoring.ScoreParams(**{k: v for k, v in combo.items() if k in _PARAM_FIELDS})
+    min_score = combo.get("min_score", LIVE_MIN_SCORE)
+    min_change = combo.get("min_price_change_pct", LIVE_MIN_PRICE_CHANGE_PCT)
+    top = combo.get("top", LIVE_TOP)
+
+    signals = labelled = wins = 0
+    favorable = 0.0
+    for day in _DAYS:
+        movers = np.abs(day["cols"]["todaysChangePerc"]) >= min_change
+        idx = np.flatnonzero(movers)
+        if not len(idx):
+            continue
+        cols = {k: v[idx] for k, v in day["cols"].items()}
+        out = batch_scoring.score_arrays(cols, day["codes"][idx], params)
+        picked = np.flatnonzero(out["score"] >= min_score)
+        # Live order: highest score first, top N go on to enrichment
+        picked = picked[np.lexsort((day["tickers"][idx][picked], -out["score"][picked]))][:top]
+        signals += len(picked)
+
+        rows = idx[picked]
+        bullish = out["bullish"][picked]
+        match = day["out_dir"][rows] == bullish.astype(np.int8)
+        labelled += int(match.sum())
+        wins += int(day["out_win"][rows][match].sum())
+        peak = day["out_peak"][rows][match]
+        favorable += float(np.where(bullish[match], peak, -peak).sum())
+
+    return {
+        **combo,
+        "days": len(_DAYS),
+        "signals": signals,
+        "labelled": labelled,
+        "coverage": round(labelled / signals, 3) if signals else None,
+        "wins": wins,
+        "win_rate": round(wins / labelled, 4) if labelled else None,
+        "avg_favorable_peak": round(favorable / labelled, 3) if labelled else None,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--archive", default=config.SCANNER_METRICS_URI, help="metrics archive root (dir or gs://)")
+    ap.add_argument("--start", type=date.fromisoformat)
+    ap.add_argument("--end", type=date.fromisoformat)
+    ap.add_argument("--grid", help="JSON file: parameter -> list of values")
+    ap.add_argument("--outcomes", help="CSV export of signal_performance (default: query BigQuery)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--min-labelled", type=int, default=20, help="rank only combos with this many labelled signals")
+    ap.add_argument("--out", default="results/score_param_sweep.csv")
+    args = ap.parse_args()
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as f:
+            grid = json.load(f)
+    combos = expand_grid(grid)
+    live = {k: v for k, v in asdict(batch_scoring.ScoreParams()).items() if k in grid}
+    live.update({k: v for k, v in (("min_score", LIVE_MIN_SCORE), ("min_price_change_pct", LIVE_MIN_PRICE_CHANGE_PCT), ("top", LIVE_TOP)) if k in grid})
+    if live not in combos:
+        combos.append(live)  # always report the live configuration
+
+    start = time.perf_counter()
+    days = load_days(metrics_archive.MetricsArchive(args.archive), args.start, args.end)
+    if not days:
+        logger.error("No archived days under %s for that range.", args.archive)
+        return 1
+    attach_outcomes(days, load_outcomes(args.outcomes, args.start, args.end))
+    logger.info(
+        "Loaded %d days (%d metric rows) in %.1fs; sweeping %d combinations on %d workers.",
+        len(days), sum(len(d["tickers"]) for d in days), time.perf_counter() - start, len(combos), args.workers,
+    )
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(days,)) as pool:
+            results = list(pool.map(evaluate, combos, chunksize=max(1, len(combos) // (args.workers * 4))))
+    else:
+        _init_worker(days)
+        results = [evaluate(c) for c in combos]
+    logger.info("Swept %d combinations in %.1fs.", len(results), time.perf_counter() - start)
+
+    for r in results:
+        r["is_live"] = all(r.get(k) == v for k, v in live.items())
+    results.sort(key=lambda r: (r["labelled"] >= args.min_labelled, r["win_rate"] or 0, r["labelled"]), reverse=True)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+    logger.info("Wrote %s", args.out)
+
+    print(f"TOP COMBINATIONS (>= {args.min_labelled} labelled signals)")
+    for r in [r for r in results if r["labelled"] >= args.min_labelled][:20] + [r for r in results if r["is_live"]]:
+        knobs = ", ".join(f"{k}={r[k]}" for k in sorted(grid))
+        tag = "  <- live" if r["is_live"] else ""
+        print(
+            f"  win {r['win_rate']}  peak {r['avg_favorable_peak']}  "
+            f"labelled {r['labelled']}/{r['signals']}  | {knobs}{tag}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Polygon payload decode + mapping benchmark.
+
+Times the two big documents a scan parses, per JSON backend:
+
+    snapshot       the all-tickers stock snapshot -> _pass1_stock_snapshots movers
+    chain_pages    options chain pages -> _map_chain_columnar OptionChains
+
+Backends: json (stdlib), orjson (full decode), msgspec (polygon_json's
+typed decode that keeps only the fields the scanner reads). Each stage is
+timed as decode alone and decode + mapping; the mapped results of every
+backend are checked to be identical. The gzip-compressed size shows
+what goes over the wire (both HTTP clients negotiate gzip).
+
+Payloads are the responses in a recorded cassette (SCANNER_RECORD_CASSETTE)
+or, without one, Polygon-shaped documents built from the synthetic market
+with the fields Polygon sends but the scanner ignores.
+
+    python benchmarks/bench_decode.py
+    python benchmarks/bench_decode.py --cassette /tmp/scan.json.gz
+    python benchmarks/bench_decode.py --tickers 500 --snapshot-tickers 12000
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.enrichment.core.clients import polygon_json
+from src.enrichment.core.clients.cassette import REPLAY, Cassette
+from src.enrichment.core.clients.polygon_client import PolygonClient
+from src.enrichment.core.pipelines import overnight_scanner as scanner
+from fake_polygon import option_result, stock_snapshot
+from synthetic import TODAY, synthetic_market
+
+logging.getLogger().setLevel(logging.WARNING)
+
+SNAPSHOT_PATH = "/v2/snapshot/locale/us/markets/stocks/tickers"
+CHAIN_PREFIX = "/v3/snapshot/options/"
+
+
+# ---- payloads ------------------------------------------------------------
+
+def synthetic_payloads(n_tickers: int, snapshot_tickers: int, max_contracts: int) -> tuple[bytes, dict[str, list[bytes]]]:
+    """(snapshot body, underlying -> chain page bodies) from the synthetic market."""
+    market = synthetic_market(n_tickers, 50, max_contracts)
+    stocks = [stock_snapshot(m["ticker"], m["underlying_price"], m["todaysChangePerc"], m["day_volume"]) for m in market.movers]
+    stocks += [stock_snapshot(f"Z{i:05d}", 20.0 + i % 300, 0.3, 10_000) for i in range(max(0, snapshot_tickers - len(stocks)))]
+    snapshot = json.dumps({"status": "OK", "count": len(stocks), "tickers": stocks}).encode()
+
+    chains = {}
+    for m, chain in zip(market.movers, market.chains):
+        recs = [option_result(m["ticker"], m["underlying_price"], r) for r in chain.to_records()]
+        pages = []
+        for i in range(0, len(recs), 250):
+            doc = {"request_id": "bench", "status": "OK", "results": recs[i:i + 250]}
+            if i + 250 < len(recs):
+                doc["next_url"] = f"https://api.polygon.io{CHAIN_PREFIX}{m['ticker']}?cursor=c{i + 250}"
+            pages.append(json.dumps(doc).encode())
+        chains[m["ticker"]] = pages
+    return snapshot, chains
+
+
+def cassette_payloads(path: str) -> tuple[bytes | None, dict[str, list[bytes]]]:
+    """Recorded snapshot and chain pages (re-encoded to their wire form)."""
+    cassette = Cassette(path, mode=REPLAY)
+    snapshot, chains = None, {}
+    for key, payload in sorted(cassette._responses.items()):
+        route = key.partition("?")[0]
+        if route == SNAPSHOT_PATH:
+            snapshot = json.dumps(payload).encode()
+        elif route.startswith(CHAIN_PREFIX) and route.count("/") == 4:
+            chains.setdefault(route[len(CHAIN_PREFIX):], []).append(json.dumps(payload).encode())
+    return snapshot, chains
+
+
+# ---- stages --------------------------------------------------------------
+
+def _backends() -> dict:
+    out = {"json": lambda data, schema: json.loads(data)}
+    if polygon_json.orjson is not None:
+        out["orjson"] = lambda data, schema: polygon_json.orjson.loads(data)
+    if polygon_json.msgspec is not None:
+        out["msgspec"] = polygon_json.loads
+    return out
+
+
+class _SnapshotSource:
+    """Feeds a decoded snapshot to _pass1_stock_snapshots in place of a client."""
+
+    build_price_index = PolygonClient.build_price_index
+
+    def __init__(self, tickers: list[dict]):
+        self.tickers = tickers
+        self.price_index = None
+
+    def fetch_all_tickers_snapshot(self) -> list[dict]:
+        return self.tickers
+
+
+def _stages(snapshot: bytes | None, chains: dict[str, list[bytes]], decode, today: date) -> dict:
+    poly = PolygonClient(api_key="bench")
+    max_exp = today + timedelta(days=45)
+    stages = {}
+    if snapshot is not None:
+        universe = {t.get("ticker") for t in json.loads(snapshot).get("tickers") or []}
+
+        def snap_map():
+            tickers = decode(snapshot, polygon_json.SNAPSHOT).get("tickers") or []
+            return scanner._pass1_stock_snapshots(_SnapshotSource(tickers), universe)
+
+        stages["snapshot.decode"] = lambda: decode(snapshot, polygon_json.SNAPSHOT)
+        stages["snapshot.map"] = snap_map
+    if chains:
+        def chain_decode():
+            for pages in chains.values():
+                for body in pages:
+                    decode(body, polygon_json.CHAIN_PAGE)
+
+        def chain_map():
+            out = []
+            for ticker, pages in chains.items():
+                results = []
+                for body in pages:
+                    results.extend(decode(body, polygon_json.CHAIN_PAGE).get("results") or [])
+                out.append(poly._map_chain_columnar(results, today, max_exp, ticker))
+            return out
+
+        stages["chain_pages.decode"] = chain_decode
+        stages["chain_pages.map"] = chain_map
+    return stages
+
+
+def _fingerprint(name: str, value):
+    if name == "snapshot.map":
+        return json.dumps(value, sort_keys=True)
+    if name == "chain_pages.map":
+        return [(c.ticker, c.data.tobytes(), list(c.symbols)) for c in value]
+    return None
+
+
+def _time(fn, repeats: int, min_sample: float = 0.05) -> float:
+    """Best per-call seconds; fast stages are looped (timeit-style) so each sample >= min_sample."""
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    loops = max(1, int(min_sample / once) if once else 1000)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cassette", help="recorded scanner cassette (.json.gz) to take payloads from")
+    ap.add_argument("--tickers", type=int, default=100, help="synthetic: movers with chains")
+    ap.add_argument("--snapshot-tickers", type=int, default=10_000, help="synthetic: tickers in the stock snapshot")
+    ap.add_argument("--max-contracts", type=int, default=2_000, help="synthetic: largest chain")
+    ap.add_argument("--repeats", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.cassette:
+        snapshot, chains = cassette_payloads(args.cassette)
+        today = Cassette(args.cassette, mode=REPLAY).as_of
+    else:
+        snapshot, chains = synthetic_payloads(args.tickers, args.snapshot_tickers, args.max_contracts)
+        today = TODAY
+    sizes = {
+        "snapshot": [snapshot] if snapshot is not None else [],
+        "chain_pages": [b for pages in chains.values() for b in pages],
+    }
+    for name, bodies in sizes.items():
+        raw = sum(len(b) for b in bodies)
+        wire = sum(len(gzip.compress(b, 6)) for b in bodies)
+        print(f"{name:<12} {len(bodies):>6} docs  {raw / 2**20:>8.2f} MiB raw  {wire / 2**20:>7.2f} MiB gzip")
+
+    backends = _backends()
+    reference = {}
+    timings: dict[str, dict[str, float]] = {}
+    for backend, decode in backends.items():
+        for name, fn in _stages(snapshot, chains, decode, today).items():
+            fp = _fingerprint(name, fn())
+            if fp is not None:
+                if reference.setdefault(name, fp) != fp:
+                    print(f"MISMATCH: {name} differs between json and {backend}")
+                    return 1
+            timings.setdefault(name, {})[backend] = _time(fn, args.repeats)
+
+    print(f"\n{'stage':<20}" + "".join(f"{b:>12}" for b in backends) + f"{'speedup':>10}")
+    for name, by_backend in timings.items():
+        base = by_backend["json"]
+        best = min(by_backend.values())
+        cols = "".join(f"{by_backend[b] * 1000:>10.1f}ms" for b in backends)
+        print(f"{name:<20}{cols}{base / best:>9.1f}x")
+    print(f"\nmapped results identical across {', '.join(backends)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
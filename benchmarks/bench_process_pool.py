@@ -0,0 +1,80 @@
+"""
+Scaling curve for the Pass 2 CPU stage: threads vs. a process pool.
+
+Builds synthetic columnar chains (synthetic.py, 200-4,000 contracts)
+and reduces all of them with flow_metrics.compute_flow_metrics, first on
+a thread pool (the GIL-bound default) and then on a forkserver
+ProcessPoolExecutor, each at 1, 2, 4 and 8 workers. Chains cross the
+process boundary in OptionChain's packed pickle form.
+
+    python benchmarks/bench_process_pool.py [N_CHAINS] [REPEATS]
+
+Worker counts above os.cpu_count() are still run but cannot scale; run
+this on a machine sized like the Cloud Run instance (--cpu) to pick
+PASS2_CPU_PROCESSES.
+"""
+
+import multiprocessing
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.enrichment.core.clients.option_chain import OptionChain
+from src.enrichment.core.pipelines import flow_metrics
+from synthetic import TODAY, synthetic_market
+
+WORKERS = [1, 2, 4, 8]
+
+
+def synthetic_chains(n: int) -> list[tuple[OptionChain, float]]:
+    market = synthetic_market(n, min_contracts=200, max_contracts=4000, seed=7)
+    return [(c, m["underlying_price"]) for c, m in zip(market.chains, market.movers)]
+
+
+def _reduce(executor, chains) -> int:
+    futures = [
+        executor.submit(flow_metrics.compute_flow_metrics, chain, spot, TODAY)
+        for chain, spot in chains
+    ]
+    return sum(1 for f in futures if f.result())
+
+
+def _best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_chains: int = 400, repeats: int = 3):
+    chains = synthetic_chains(n_chains)
+    contracts = sum(len(c) for c, _ in chains)
+    payload = sum(len(pickle.dumps(c, protocol=pickle.HIGHEST_PROTOCOL)) for c, _ in chains)
+    print(
+        f"{n_chains} chains, {contracts:,} contracts, "
+        f"{payload / n_chains / 1024:.0f} KiB pickled per chain, cpu_count={os.cpu_count()}"
+    )
+
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload([flow_metrics.__name__])
+    print(f"{'workers':>7} {'threads s':>10} {'procs s':>9} {'procs chains/s':>15} {'speedup':>8}")
+    base = None
+    for w in WORKERS:
+        with ThreadPoolExecutor(max_workers=w) as ex:
+            t_threads = _best_of(lambda: _reduce(ex, chains), repeats)
+        with ProcessPoolExecutor(max_workers=w, mp_context=ctx) as ex:
+            _reduce(ex, chains[:w])  # warm the workers
+            t_procs = _best_of(lambda: _reduce(ex, chains), repeats)
+        base = base or t_procs
+        print(f"{w:>7} {t_threads:>10.3f} {t_procs:>9.3f} {n_chains / t_procs:>15.0f} {base / t_procs:>7.2f}x")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    r = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    main(n, r)
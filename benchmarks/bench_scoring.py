@@ -0,0 +1,254 @@
+"""
+Scoring hot-path benchmark with stored baselines.
+
+Times the scanner's CPU stages on a synthetic market (see synthetic.py):
+
+    flow_metrics     _compute_flow_metrics per chain (dict and/or columnar engine)
+    best_contract    _best_contract on the call and put side of every chain
+    score_ticker     _score_ticker on every metric row
+    cluster_boost    _apply_cluster_boost over all scored rows
+    end_to_end       metrics -> score -> cluster boost, as _scan runs them
+    batch_rows       batch_scoring.score_rows: scores + cluster boost + signal strings
+    batch_arrays     batch_scoring.score_arrays on prebuilt columns (threshold sweeps)
+
+and reports seconds per pass (median of --repeats samples of at least 0.2 s,
+GC off as in timeit), contracts/sec and peak traced memory (a separate
+tracemalloc pass, so timings are not skewed by it).
+
+    python benchmarks/bench_scoring.py --profile small
+    python benchmarks/bench_scoring.py --profile medium --save-baseline
+    python benchmarks/bench_scoring.py --profile medium --check --tolerance 0.2
+
+--check compares contracts/sec against benchmarks/baselines/<profile>.json
+and exits 1 if any stage is slower than baseline * (1 - tolerance). Stages
+that take under 5 ms per pass are timer- and cache-noise dominated and are
+held to --fast-tolerance instead. A stage that misses is re-timed up to
+--confirm times, a couple of seconds apart (shared boxes drift for seconds
+at a time), and only a miss that persists counts. --save-baseline records
+each stage's median over --baseline-runs interleaved passes, so one slow
+or fast stretch does not become the baseline. Baselines are machine-specific:
+record them on the box that runs --check, and only once --check passes
+there run after run.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from src.enrichment.core.pipelines import batch_scoring, flow_metrics
+from src.enrichment.core.pipelines import overnight_scanner as scanner
+from synthetic import TODAY, synthetic_market
+
+logging.getLogger().setLevel(logging.WARNING)
+
+PROFILES = {
+    "small": {"tickers": 100, "min_contracts": 50, "max_contracts": 2_000},
+    "medium": {"tickers": 1_000, "min_contracts": 50, "max_contracts": 5_000},
+    "large": {"tickers": 5_000, "min_contracts": 50, "max_contracts": 10_000},
+}
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+FAST_STAGE_SECONDS = 0.005  # stages below this per pass get --fast-tolerance
+CONFIRM_PAUSE_SECONDS = 2.0  # between --confirm re-timings, to outlast a slow stretch
+
+
+def _stages(market, engine: str) -> dict:
+    """name -> zero-arg callable running that stage over the whole market."""
+    if engine == "dict":
+        chains = [c.to_records() for c in market.chains]
+        sides = [
+            ([r for r in recs if r["option_type"] == "call"], [r for r in recs if r["option_type"] == "put"])
+            for recs in chains
+        ]
+
+        def best():
+            for (calls, puts), m in zip(sides, market.movers):
+                scanner._best_contract(calls, "call", m["underlying_price"], TODAY)
+                scanner._best_contract(puts, "put", m["underlying_price"], TODAY)
+    else:
+        chains = market.chains
+
+        def best():
+            for c, m in zip(chains, market.movers):
+                flow_metrics.best_contract(c.calls, "call", m["underlying_price"], TODAY)
+                flow_metrics.best_contract(c.puts, "put", m["underlying_price"], TODAY)
+
+    def metrics():
+        return [
+            {**m, **scanner._compute_flow_metrics(c, m["underlying_price"], TODAY)}
+            for c, m in zip(chains, market.movers)
+        ]
+
+    rows = metrics()
+    scored = [scanner._score_ticker(r) for r in rows]
+
+    def boost():
+        scanner._apply_cluster_boost([dict(s) for s in scored], market.metadata)
+
+    def end_to_end():
+        out = [scanner._score_ticker(r) for r in metrics()]
+        scanner._apply_cluster_boost(out, market.metadata)
+
+    cols = batch_scoring.columns_from_rows(rows)
+    codes, _ = batch_scoring.industry_codes([r["ticker"] for r in rows], market.metadata)
+
+    return {
+        "flow_metrics": metrics,
+        "best_contract": best,
+        "score_ticker": lambda: [scanner._score_ticker(r) for r in rows],
+        "cluster_boost": boost,
+        "end_to_end": end_to_end,
+        "batch_rows": lambda: batch_scoring.score_rows(rows, market.metadata),
+        "batch_arrays": lambda: batch_scoring.score_arrays(cols, codes),
+    }
+
+
+def _time(fn, repeats: int, min_sample: float = 0.2) -> float:
+    """Median per-call seconds; fast stages are looped (timeit-style) so each sample >= min_sample."""
+    fn()  # warm-up
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    loops = max(1, int(min_sample / once) if once else 1000)
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            samples.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return statistics.median(samples)
+
+
+def _peak_mib(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def run(spec: dict, engines: list[str], repeats: int) -> tuple[dict, dict]:
+    """(results document, stage key -> callable for re-timing)."""
+    start = time.perf_counter()
+    market = synthetic_market(spec["tickers"], spec["min_contracts"], spec["max_contracts"])
+    print(
+        f"market: {len(market.chains)} tickers, {market.contracts:,} contracts "
+        f"(built in {time.perf_counter() - start:.1f}s)"
+    )
+    results = {}
+    fns = {}
+    print(f"{'stage':<28} {'seconds':>9} {'contracts/s':>14} {'peak MiB':>9}")
+    for engine in engines:
+        for name, fn in _stages(market, engine).items():
+            secs = _time(fn, repeats)
+            key = f"{name}[{engine}]"
+            fns[key] = lambda fn=fn: market.contracts / _time(fn, repeats)
+            results[key] = {
+                "seconds": round(secs, 6),
+                "contracts_per_sec": round(market.contracts / secs) if secs else None,
+                "peak_mib": round(_peak_mib(fn), 1),
+            }
+            r = results[key]
+            print(f"{key:<28} {r['seconds']:>9.4f} {r['contracts_per_sec']:>14,} {r['peak_mib']:>9.1f}")
+    return {"contracts": market.contracts, "tickers": len(market.chains), "results": results}, fns
+
+
+def _settle(current: dict, retime: dict, runs: int):
+    """Replace each stage's rate with its median over `runs` interleaved passes."""
+    rates = {key: [r["contracts_per_sec"]] for key, r in current["results"].items()}
+    for _ in range(runs - 1):
+        for key, fn in retime.items():
+            rates[key].append(fn())
+    for key, r in current["results"].items():
+        r["contracts_per_sec"] = round(statistics.median(rates[key]))
+        r["seconds"] = round(current["contracts"] / r["contracts_per_sec"], 6)
+
+
+def check(profile: str, current: dict, tolerance: float, fast_tolerance: float, retime: dict, confirm: int) -> int:
+    path = os.path.join(BASELINE_DIR, f"{profile}.json")
+    if not os.path.exists(path):
+        print(f"No baseline at {path}; run with --save-baseline first.")
+        return 1
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    failures = 0
+    for key, base in baseline["results"].items():
+        cur = current["results"].get(key)
+        if cur is None or not base.get("contracts_per_sec"):
+            continue
+        fast = base["seconds"] < FAST_STAGE_SECONDS
+        allowed = fast_tolerance if fast else tolerance
+        ratio = cur["contracts_per_sec"] / base["contracts_per_sec"]
+        for _ in range(confirm if key in retime else 0):
+            if ratio >= 1 - allowed:
+                break
+            time.sleep(CONFIRM_PAUSE_SECONDS)
+            ratio = max(ratio, retime[key]() / base["contracts_per_sec"])
+        flag = "REGRESSION" if ratio < 1 - allowed else "ok"
+        failures += flag != "ok"
+        print(f"{key:<28} {ratio:>6.2f}x baseline  {flag}{f'  (short, {allowed:.0%})' if fast else ''}")
+    print(
+        f"{failures} regressions (tolerance {tolerance:.0%}, stages under {FAST_STAGE_SECONDS * 1000:g} ms {fast_tolerance:.0%}) against {path}."
+    )
+    return 1 if failures else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    ap.add_argument("--tickers", type=int, help="override the profile's ticker count")
+    ap.add_argument("--min-contracts", type=int)
+    ap.add_argument("--max-contracts", type=int)
+    ap.add_argument("--engine", choices=["dict", "columnar", "both"], default="both")
+    ap.add_argument("--repeats", type=int, default=7)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--check", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    ap.add_argument("--fast-tolerance", type=float, default=0.5, help="tolerance for stages under 5 ms per pass")
+    ap.add_argument(
+        "--baseline-runs", type=int, default=5, help="--save-baseline records each stage's median over this many passes"
+    )
+    ap.add_argument("--confirm", type=int, default=3, help="re-time a stage that misses up to this many times")
+    args = ap.parse_args()
+
+    spec = dict(PROFILES[args.profile])
+    for k in ("tickers", "min_contracts", "max_contracts"):
+        if getattr(args, k) is not None:
+            spec[k] = getattr(args, k)
+    engines = ["dict", "columnar"] if args.engine == "both" else [args.engine]
+    current, retime = run(spec, engines, args.repeats)
+
+    if args.save_baseline:
+        _settle(current, retime, args.baseline_runs)
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.profile}.json")
+        doc = {
+            "profile": args.profile,
+            "spec": spec,
+            "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            **current,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print(f"Saved baseline {path}")
+    if args.check:
+        return check(args.profile, current, args.tolerance, args.fast_tolerance, retime, args.confirm)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
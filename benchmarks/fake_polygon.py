@@ -0,0 +1,780 @@
+"""
+Local Polygon stand-in for load-testing the scanner and the trackers.
+
+Serves the endpoints the scanner, enrichment-trigger, win-tracker and
+forward-paper-trader call, in Polygon's response shapes, from either a
+seeded synthetic market or a recorded scanner cassette:
+
+    /v2/snapshot/locale/us/markets/stocks/tickers[/{T}]   stock snapshots
+    /v3/snapshot/options/{U}                              chains (gte/lte/sort/order/limit, next_url cursors)
+    /v3/snapshot/options/{U}/{C}                          one contract
+    /v3/snapshot?ticker.any_of=...                        universal snapshot (options)
+    /v2/aggs/ticker/{T}/range/{m}/{day|minute}/{from}/{to}  bars (limit, next_url cursors)
+    /v3/reference/tickers[/{T}]                           reference tickers with SIC descriptions
+    /_stats                                               request counters (not Polygon)
+
+Synthetic tickers are T0000, T0001, ...; each one's price, move, volume
+and chain are seeded from its name, so a ticker looks the same in every
+request and every run. Chains come from synthetic.synthetic_chain and
+expire relative to today, so the scanner's live DTE window applies.
+
+With --cassette, the recorded responses are the market instead: the
+all-tickers snapshot, per-ticker snapshots and reference pages are served
+as recorded, every recorded chain page of an underlying is merged into
+one chain (expirations moved forward by the days since the recording)
+and re-paginated, and recorded bars are replayed by exact query.
+Anything the cassette does not hold falls back to the synthetic market.
+
+Upstream trouble is injected per request: --latency-ms and --jitter-ms
+delay every response; --p429 (with Retry-After), --p500 and --p-timeout
+fail a share of them at random; --max-rps answers 429 beyond a per-second
+budget, as Polygon's plan limits do. An injected timeout holds the
+request for --timeout-s (default past the scanner's 30 s client timeout;
+the services give up after 10 s) and then drops the connection. As a
+library, FakePolygon.fail_symbols makes every request naming one of
+those option symbols answer 500.
+
+    python benchmarks/fake_polygon.py --port 8765 --tickers 2000 --latency-ms 80 --p429 0.02
+    POLYGON_BASE_URL=http://127.0.0.1:8765 POLYGON_API_KEY=fake python win-tracker/main.py
+
+As a library:
+
+    server, base_url = fake_polygon.start(FakePolygon(SyntheticMarket(500), latency_ms=50))
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import logging
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+from src.enrichment.core.clients.cassette import REPLAY, Cassette
+from synthetic import synthetic_chain
+
+logger = logging.getLogger(__name__)
+
+_ET = ZoneInfo("America/New_York")
+_NS = 1_700_000_000_000_000_000
+_OPTION_SYMBOL = re.compile(r"^O:(.+)(\d{6})([CP]\d{8})$")  # underlying, YYMMDD, type + strike
+
+# Real SIC descriptions, so the scanner's sector/industry mapping is exercised.
+SIC_DESCRIPTIONS = [
+    "SEMICONDUCTORS & RELATED DEVICES", "PHARMACEUTICAL PREPARATIONS",
+    "SERVICES-PREPACKAGED SOFTWARE", "NATIONAL COMMERCIAL BANKS",
+    "CRUDE PETROLEUM & NATURAL GAS", "BIOLOGICAL PRODUCTS (NO DIAGNOSTIC SUBSTANCES)",
+    "REAL ESTATE INVESTMENT TRUSTS", "SURGICAL & MEDICAL INSTRUMENTS & APPARATUS",
+    "SERVICES-BUSINESS SERVICES, NEC", "STATE COMMERCIAL BANKS",
+]
+
+
+# ---- payloads ------------------------------------------------------------
+
+def option_result(ticker: str, spot: float, rec: dict) -> dict:
+    """One options chain snapshot result as Polygon sends it, unused fields included."""
+    mid = rec["last_price"] or 0.05
+    return {
+        "break_even_price": (rec["strike"] or 0) + mid,
+        "day": {
+            "change": 0.05, "change_percent": 2.1, "close": rec["last_price"], "high": mid * 1.1,
+            "last_updated": _NS, "low": mid * 0.9, "open": mid, "previous_close": mid * 0.98,
+            "volume": rec["volume"], "vwap": mid,
+        },
+        "details": {
+            "contract_type": rec["option_type"], "exercise_style": "american",
+            "expiration_date": rec["expiration_date"], "shares_per_contract": 100,
+            "strike_price": rec["strike"], "ticker": rec["contract_symbol"],
+        },
+        "fmv": mid,
+        "greeks": {"delta": rec["delta"], "gamma": rec["gamma"], "theta": rec["theta"], "vega": rec["vega"]},
+        "implied_volatility": rec["implied_volatility"],
+        "last_quote": {
+            "ask": rec["ask"], "ask_exchange": 301, "ask_size": 12, "bid": rec["bid"], "bid_exchange": 302,
+            "bid_size": 10, "last_updated": _NS, "midpoint": mid, "timeframe": "REAL-TIME",
+        },
+        "last_trade": {
+            "conditions": [209], "exchange": 316, "price": rec["last_price"],
+            "sip_timestamp": _NS, "size": 2, "timeframe": "REAL-TIME",
+        },
+        "open_interest": rec["open_interest"],
+        "underlying_asset": {
+            "change_to_break_even": 0.4, "last_updated": _NS, "price": spot,
+            "ticker": ticker, "timeframe": "REAL-TIME",
+        },
+    }
+
+
+def stock_snapshot(ticker: str, price: float, change_pct: float, volume: int) -> dict:
+    """One all-tickers snapshot entry as Polygon sends it."""
+    prev = round(price / (1 + change_pct / 100), 2)
+    bar = {"o": prev, "h": price * 1.01, "l": prev * 0.99, "c": price, "v": volume, "vw": price}
+    return {
+        "day": bar,
+        "lastQuote": {"P": price + 0.01, "S": 3, "p": price - 0.01, "s": 5, "t": _NS},
+        "lastTrade": {"c": [14, 41], "i": "71675577320245", "p": price, "s": 100, "t": _NS, "x": 4},
+        "min": {**bar, "av": volume, "t": 1_700_000_000_000, "n": 12},
+        "prevDay": {"o": prev, "h": prev, "l": prev, "c": prev, "v": volume, "vw": prev},
+        "ticker": ticker,
+        "todaysChange": round(price - prev, 2),
+        "todaysChangePerc": change_pct,
+        "updated": _NS,
+    }
+
+
+def universal_option(result: dict) -> dict:
+    """A chain result in the universal snapshot's shape (/v3/snapshot)."""
+    out = {k: v for k, v in result.items() if k != "day"}
+    details = dict(out["details"])
+    symbol = details.pop("ticker")
+    return {
+        **out,
+        "details": details,
+        "market_status": "open",
+        "name": symbol,
+        "session": result.get("day") or {},
+        "ticker": symbol,
+        "type": "options",
+    }
+
+
+# ---- markets -------------------------------------------------------------
+
+def _seed(*parts) -> int:
+    return zlib.crc32("|".join(str(p) for p in parts).encode("utf-8"))
+
+
+def _trading_days(first: date, last: date) -> list[date]:
+    days, d = [], first
+    while d <= last:
+        if d.weekday() < 5:
+            days.append(d)
+        d += timedelta(days=1)
+    return days
+
+
+def _epoch_ms(d: date, hour: int = 0, minute: int = 0) -> int:
+    return int(datetime(d.year, d.month, d.day, hour, minute, tzinfo=_ET).timestamp() * 1000)
+
+
+class SyntheticMarket:
+    """
+    Seeded market of `n_tickers` optionable stocks plus `filler` stock-only
+    tickers (to size the all-tickers snapshot like the real one). Chains
+    are built on first request and the last `cache_chains` are kept.
+    """
+
+    def __init__(
+        self,
+        n_tickers: int = 500,
+        min_contracts: int = 50,
+        max_contracts: int = 2_000,
+        filler: int = 0,
+        seed: int = 42,
+        cache_chains: int = 256,
+    ):
+        self.tickers = [f"T{i:04d}" for i in range(n_tickers)]
+        self.filler = [f"Z{i:05d}" for i in range(filler)]
+        self.min_contracts = min_contracts
+        self.max_contracts = max_contracts
+        self.seed = seed
+        self._known = set(self.tickers)
+        self._stocks: dict[str, dict] = {}
+        self._chains: OrderedDict = OrderedDict()
+        self._cache_chains = cache_chains
+        self._lock = threading.Lock()
+
+    def _profile(self, ticker: str) -> dict:
+        p = self._stocks.get(ticker)
+        if p is None:
+            rng = np.random.default_rng(_seed(self.seed, ticker))
+            lo, hi = math.log(self.min_contracts), math.log(max(self.min_contracts, self.max_contracts))
+            p = {
+                "spot": float(np.round(rng.lognormal(4.0, 1.0), 2)) + 1.0,
+                "change": float(np.round(rng.choice([-1, 1]) * rng.lognormal(1.0, 0.6), 2)),
+                "volume": int(rng.lognormal(14, 1.5)),
+                "contracts": int(math.exp(rng.uniform(lo, hi))),
+                "sic": SIC_DESCRIPTIONS[_seed(ticker) % len(SIC_DESCRIPTIONS)],
+            }
+            self._stocks[ticker] = p
+        return p
+
+    def knows(self, ticker: str) -> bool:
+        return ticker in self._known
+
+    # ---- stocks ----------------------------------------------------------
+
+    def stock(self, ticker: str) -> dict | None:
+        if not self.knows(ticker):
+            return None
+        p = self._profile(ticker)
+        return stock_snapshot(ticker, p["spot"], p["change"], p["volume"])
+
+    def stocks(self) -> list[dict]:
+        return [self.stock(t) for t in self.tickers] + [
+            stock_snapshot(t, 20.0 + i % 300, 0.3, 10_000) for i, t in enumerate(self.filler)
+        ]
+
+    def reference(self) -> list[dict]:
+        return [self.reference_ticker(t) for t in self.tickers]
+
+    def reference_ticker(self, ticker: str) -> dict | None:
+        if not self.knows(ticker):
+            return None
+        return {
+            "ticker": ticker, "name": f"{ticker} Synthetic Inc.", "market": "stocks", "locale": "us",
+            "primary_exchange": "XNAS", "type": "CS", "active": True, "currency_name": "usd",
+            "sic_description": self._profile(ticker)["sic"],
+        }
+
+    # ---- options ---------------------------------------------------------
+
+    def chain(self, ticker: str) -> tuple[list[dict], dict[str, dict]]:
+        """(results sorted by contract symbol, symbol -> result) for one underlying."""
+        with self._lock:
+            hit = self._chains.get(ticker)
+            if hit is not None:
+                self._chains.move_to_end(ticker)
+                return hit
+        if not self.knows(ticker):
+            return [], {}
+        p = self._profile(ticker)
+        rng = np.random.default_rng(_seed(self.seed, ticker, "chain"))
+        chain = synthetic_chain(rng, ticker, p["spot"], p["contracts"], date.today())
+        results = sorted(
+            (option_result(ticker, p["spot"], r) for r in chain.to_records()),
+            key=lambda r: r["details"]["ticker"],
+        )
+        built = (results, {r["details"]["ticker"]: r for r in results})
+        with self._lock:
+            self._chains[ticker] = built
+            while len(self._chains) > self._cache_chains:
+                self._chains.popitem(last=False)
+        return built
+
+    # ---- aggregates ------------------------------------------------------
+
+    def _close(self, ticker: str, d: date) -> float:
+        """Deterministic close: slow waves around spot plus per-day noise."""
+        spot = self._profile(ticker)["spot"]
+        h = _seed(ticker)
+        x = d.toordinal()
+        wave = 0.15 * math.sin(x / 40 + h % 97) + 0.05 * math.sin(x / 9 + h % 13)
+        noise = (_seed(ticker, x) % 2001 - 1000) / 1000 * 0.01
+        return round(spot * math.exp(wave + noise), 2)
+
+    def day_bars(self, ticker: str, first: date, last: date) -> list[dict]:
+        if not self.knows(ticker):
+            return []
+        out = []
+        vol = self._profile(ticker)["volume"]
+        for d in _trading_days(first, min(last, date.today())):
+            prev, close = self._close(ticker, d - timedelta(days=1)), self._close(ticker, d)
+            hi, lo = max(prev, close) * 1.01, min(prev, close) * 0.99
+            v = int(vol * (0.5 + (_seed(ticker, d, "v") % 100) / 100))
+            out.append({"v": v, "vw": round((prev + close) / 2, 4), "o": prev, "c": close,
+                        "h": round(hi, 2), "l": round(lo, 2), "t": _epoch_ms(d), "n": v // 100})
+        return out
+
+    def minute_bars(self, ticker: str, first: date, last: date) -> list[dict]:
+        if not self.knows(ticker):
+            return []
+        out = []
+        for d in _trading_days(first, min(last, date.today())):
+            rnd = random.Random(_seed(ticker, d, "m"))
+            open_, close = self._close(ticker, d - timedelta(days=1)), self._close(ticker, d)
+            price = open_
+            for i in range(390):  # 09:30-16:00 ET
+                target = open_ + (close - open_) * (i + 1) / 390
+                c = round(max(0.01, target * (1 + rnd.gauss(0, 0.0008))), 4)
+                out.append({"v": rnd.randint(100, 20_000), "vw": round((price + c) / 2, 4), "o": price, "c": c,
+                            "h": round(max(price, c) * 1.0005, 4), "l": round(min(price, c) * 0.9995, 4),
+                            "t": _epoch_ms(d, 9 + (30 + i) // 60, (30 + i) % 60), "n": rnd.randint(1, 200)})
+                price = c
+        return out
+
+    def aggs(self, ticker: str, multiplier: int, timespan: str, first: date, last: date, path: str) -> list[dict] | None:
+        """Bars for the range, or None for an unsupported timespan."""
+        if timespan == "day":
+            bars = self.day_bars(ticker, first, last)
+        elif timespan == "minute":
+            bars = self.minute_bars(ticker, first, last)
+        else:
+            return None
+        if multiplier <= 1:
+            return bars
+        merged = []
+        for i in range(0, len(bars), multiplier):
+            group = bars[i:i + multiplier]
+            v = sum(b["v"] for b in group)
+            merged.append({"v": v, "vw": group[-1]["vw"], "o": group[0]["o"], "c": group[-1]["c"],
+                           "h": max(b["h"] for b in group), "l": min(b["l"] for b in group),
+                           "t": group[0]["t"], "n": sum(b["n"] for b in group)})
+        return merged
+
+
+class RecordedMarket(SyntheticMarket):
+    """
+    A scanner cassette as the market (see the module docstring). The
+    cassette's tickers make up the universe; whatever was not recorded
+    for them (bars, a chain) comes from the synthetic market underneath.
+    """
+
+    SNAPSHOT = "/v2/snapshot/locale/us/markets/stocks/tickers"
+    CHAINS = "/v3/snapshot/options/"
+    REFERENCE = "/v3/reference/tickers"
+
+    def __init__(self, path: str, **synthetic):
+        super().__init__(**synthetic)
+        cassette = Cassette(path, mode=REPLAY)
+        shift = timedelta(days=(date.today() - cassette.as_of).days)
+        self._responses = cassette._responses
+        self._recorded_stocks: list[dict] | None = None
+        self._recorded_stock: dict[str, dict] = {}
+        self._recorded_reference: dict[str, dict] = {}
+        self._recorded_details: dict[str, dict] = {}
+        recorded_chains: dict[str, dict[str, dict]] = {}
+        for key, payload in self._responses.items():
+            route = key.partition("?")[0]
+            if route == self.SNAPSHOT:
+                self._recorded_stocks = payload.get("tickers") or []
+            elif route.startswith(self.SNAPSHOT + "/"):
+                self._recorded_stock[route.rsplit("/", 1)[1]] = payload.get("ticker") or {}
+            elif route.startswith(self.CHAINS) and route.count("/") == 4:
+                chain = recorded_chains.setdefault(route[len(self.CHAINS):], {})
+                for r in payload.get("results") or []:
+                    r = self._shift(r, shift)
+                    chain[(r.get("details") or {}).get("ticker") or ""] = r
+            elif route == self.REFERENCE:
+                for t in payload.get("results") or []:
+                    self._recorded_reference[t.get("ticker")] = t
+            elif route.startswith(self.REFERENCE + "/"):
+                self._recorded_details[route.rsplit("/", 1)[1]] = payload.get("results") or {}
+        self._recorded_chains = {
+            u: (sorted(c.values(), key=lambda r: r["details"]["ticker"]), c) for u, c in recorded_chains.items()
+        }
+        recorded = set(self._recorded_chains) | set(self._recorded_stock) | set(self._recorded_reference)
+        recorded |= {t.get("ticker") for t in self._recorded_stocks or []}
+        recorded |= set(cassette.meta.get("universe") or [])
+        self.tickers = sorted(t for t in recorded if t)
+        self._known = set(self.tickers)
+        logger.info(
+            "Cassette %s: %d tickers, %d chains, recorded %s (expirations moved %d days).",
+            path, len(self.tickers), len(self._recorded_chains), cassette.as_of, shift.days,
+        )
+
+    @staticmethod
+    def _shift(r: dict, shift: timedelta) -> dict:
+        details = r.get("details") or {}
+        exp = details.get("expiration_date")
+        if not shift or not exp:
+            return r
+        new_exp = date.fromisoformat(exp) + shift
+        symbol = details.get("ticker") or ""
+        m = _OPTION_SYMBOL.match(symbol)
+        if m:
+            symbol = f"O:{m.group(1)}{new_exp:%y%m%d}{m.group(3)}"
+        return {**r, "details": {**details, "expiration_date": new_exp.isoformat(), "ticker": symbol}}
+
+    def stock(self, ticker: str) -> dict | None:
+        if ticker in self._recorded_stock:
+            return self._recorded_stock[ticker]
+        for t in self._recorded_stocks or []:
+            if t.get("ticker") == ticker:
+                return t
+        return super().stock(ticker)
+
+    def stocks(self) -> list[dict]:
+        if self._recorded_stocks is not None:
+            return self._recorded_stocks
+        return super().stocks()
+
+    def reference(self) -> list[dict]:
+        if self._recorded_reference:
+            return list(self._recorded_reference.values())
+        return super().reference()
+
+    def reference_ticker(self, ticker: str) -> dict | None:
+        return (
+            self._recorded_details.get(ticker)
+            or self._recorded_reference.get(ticker)
+            or super().reference_ticker(ticker)
+        )
+
+    def chain(self, ticker: str) -> tuple[list[dict], dict[str, dict]]:
+        if ticker in self._recorded_chains:
+            return self._recorded_chains[ticker]
+        return super().chain(ticker)
+
+    def aggs(self, ticker: str, multiplier: int, timespan: str, first: date, last: date, path: str) -> list[dict] | None:
+        for key, payload in self._responses.items():
+            if key.partition("?")[0] == path:
+                return payload.get("results") or []
+        return super().aggs(ticker, multiplier, timespan, first, last, path)
+
+
+# ---- server --------------------------------------------------------------
+
+class FakePolygon:
+    """Routing, failure injection and counters around a market."""
+
+    def __init__(
+        self,
+        market: SyntheticMarket,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        p429: float = 0.0,
+        p500: float = 0.0,
+        p_timeout: float = 0.0,
+        timeout_s: float = 31.0,
+        retry_after: int = 1,
+        max_rps: float = 0.0,
+        compress: bool = False,
+        seed: int | None = None,
+    ):
+        self.market = market
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.p429, self.p500, self.p_timeout = p429, p500, p_timeout
+        self.timeout_s = timeout_s
+        self.retry_after = retry_after
+        self.max_rps = max_rps
+        self.compress = compress
+        self.fail_symbols: set[str] = set()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window = (0, 0)  # (second, requests admitted in it)
+        self.counts: Counter = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.bytes_sent = 0
+        self.started = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                **dict(sorted(self.counts.items())),
+                "peak_in_flight": self.peak_in_flight,
+                "mib_sent": round(self.bytes_sent / 2**20, 2),
+                "requests_per_sec": round(self.counts["requests"] / elapsed, 1) if elapsed else None,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+            self.peak_in_flight = self.in_flight
+            self.bytes_sent = 0
+            self.started = time.monotonic()
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.counts["requests"] += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _leave(self, nbytes: int):
+        with self._lock:
+            self.in_flight -= 1
+            self.bytes_sent += nbytes
+
+    def _fault(self) -> str | None:
+        """'timeout', '429', '500' or None for this request."""
+        with self._lock:
+            roll = self._rng.random()
+            if roll < self.p_timeout:
+                return "timeout"
+            if roll < self.p_timeout + self.p429:
+                return "429"
+            if roll < self.p_timeout + self.p429 + self.p500:
+                return "500"
+            if self.max_rps:
+                second = int(time.monotonic())
+                now, n = self._window
+                n = n + 1 if second == now else 1
+                self._window = (second, n)
+                if n > self.max_rps:
+                    return "rate"
+        return None
+
+    def _delay(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+
+def _cursor(query: dict) -> str:
+    return base64.urlsafe_b64encode(urlencode(query).encode()).decode().rstrip("=")
+
+
+def _uncursor(token: str) -> dict:
+    raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+    return {k: v[0] for k, v in parse_qs(raw).items()}
+
+
+def _date_arg(value: str) -> date:
+    """An aggs range bound: YYYY-MM-DD or epoch milliseconds."""
+    if value.isdigit():
+        return datetime.fromtimestamp(int(value) / 1000, tz=_ET).date()
+    return date.fromisoformat(value)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def fake(self) -> FakePolygon:
+        return self.server.fake
+
+    def _send(self, status: int, body: dict, headers: dict | None = None):
+        data = json.dumps(body, separators=(",", ":")).encode()
+        gz = self.fake.compress and "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if gz:
+            data = gzip.compress(data, 1)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if gz:
+            self.send_header("Content-Encoding", "gzip")
+        for k, v in (headers or {}).items():
+            self.send_header(k, str(v))
+        self.end_headers()
+        self.wfile.write(data)
+        self._sent = len(data)
+        with self.fake._lock:
+            self.fake.counts[f"status_{status}"] += 1
+
+    def _injected_500(self):
+        with self.fake._lock:
+            self.fake.counts["injected_500"] += 1
+        self._send(500, {"status": "ERROR", "request_id": "fake", "error": "Internal error"})
+
+    def _not_found(self):
+        self._send(404, {"status": "NOT_FOUND", "request_id": "fake", "message": "Data not found."})
+
+    def _page(self, items: list, query: dict, limit: int, key: str = "results", **extra) -> dict:
+        """One page of `items` at query's cursor offset, with next_url if more remain."""
+        offset = int(query.get("offset", 0))
+        body = {"status": "OK", "request_id": "fake", key: items[offset:offset + limit], **extra}
+        if offset + limit < len(items):
+            nxt = {**query, "offset": offset + limit}
+            body["next_url"] = f"http://{self.headers.get('Host')}{self._path}?cursor={_cursor(nxt)}"
+        return body
+
+    def do_GET(self):
+        fake = self.fake
+        url = urlparse(self.path)
+        self._path = url.path
+        self._sent = 0
+        if url.path == "/_stats":
+            return self._send(200, fake.stats())
+        fake._enter()
+        try:
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if "apiKey" not in query:
+                return self._send(401, {"status": "ERROR", "error": "API Key was not provided"})
+            time.sleep(fake._delay())
+            fault = fake._fault()
+            if fault is not None:
+                with fake._lock:
+                    fake.counts[f"injected_{fault}"] += 1
+                if fault == "timeout":
+                    time.sleep(fake.timeout_s)
+                    self.close_connection = True
+                    return
+                if fault == "500":
+                    return self._send(500, {"status": "ERROR", "request_id": "fake", "error": "Internal error"})
+                return self._send(
+                    429,
+                    {"status": "ERROR", "request_id": "fake",
+                     "error": "You've exceeded the maximum requests per minute, please wait or upgrade your subscription to continue."},
+                    headers={"Retry-After": fake.retry_after},
+                )
+            if "cursor" in query:
+                query = {**_uncursor(query.pop("cursor")), **{k: v for k, v in query.items() if k != "apiKey"}}
+            query.pop("apiKey", None)
+            self._route(url.path.strip("/").split("/"), query)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            logger.exception("fake polygon: %s failed", self.path)
+            self._send(500, {"status": "ERROR", "error": str(e)})
+        finally:
+            fake._leave(self._sent)
+
+    def _route(self, parts: list[str], q: dict):
+        m = self.fake.market
+        with self.fake._lock:
+            self.fake.counts["/".join(parts[:3])] += 1
+
+        if parts[:6] == ["v2", "snapshot", "locale", "us", "markets", "stocks"] and parts[6:7] == ["tickers"]:
+            if len(parts) == 7:
+                tickers = m.stocks()
+                return self._send(200, {"status": "OK", "request_id": "fake", "count": len(tickers), "tickers": tickers})
+            snap = m.stock(parts[7])
+            return self._send(200, {"status": "OK", "request_id": "fake", "ticker": snap}) if snap else self._not_found()
+
+        if parts == ["v3", "snapshot"]:
+            symbols = [s for s in (q.get("ticker.any_of") or "").split(",") if s]
+            with self.fake._lock:
+                self.fake.counts["universal_symbols"] += len(symbols)
+            if len(symbols) > 250:
+                return self._send(400, {"status": "ERROR", "request_id": "fake", "error": "ticker.any_of accepts at most 250 tickers."})
+            if self.fake.fail_symbols.intersection(symbols):
+                return self._injected_500()
+            results = []
+            for s in symbols:
+                sym = _OPTION_SYMBOL.match(s)
+                r = m.chain(sym.group(1))[1].get(s) if sym else None
+                results.append(universal_option(r) if r else {"ticker": s, "error": "NOT_FOUND", "message": "Ticker not found."})
+            return self._send(200, self._page(results, q, int(q.get("limit", 10))))
+
+        if parts[:3] == ["v3", "snapshot", "options"] and len(parts) in (4, 5):
+            results, by_symbol = m.chain(parts[3])
+            if len(parts) == 5:
+                if parts[4] in self.fake.fail_symbols:
+                    return self._injected_500()
+                r = by_symbol.get(parts[4])
+                return self._send(200, {"status": "OK", "request_id": "fake", "results": r}) if r else self._not_found()
+            if not results and not m.knows(parts[3]):
+                return self._send(200, {"status": "OK", "request_id": "fake", "results": []})
+            return self._send(200, self._page(self._filter_chain(results, q), q, min(int(q.get("limit", 10)), 250)))
+
+        if parts[:3] == ["v2", "aggs", "ticker"] and len(parts) == 9 and parts[4] == "range":
+            ticker, multiplier, timespan = parts[3], int(parts[5]), parts[6]
+            try:
+                first, last = _date_arg(parts[7]), _date_arg(parts[8])
+            except ValueError:
+                return self._send(400, {"status": "ERROR", "error": "Could not parse the time range."})
+            bars = m.aggs(ticker, multiplier, timespan, first, last, "/" + "/".join(parts))
+            if bars is None:
+                return self._send(400, {"status": "ERROR", "error": f"Unsupported timespan {timespan!r}."})
+            if q.get("sort") == "desc":
+                bars = bars[::-1]
+            body = self._page(bars, q, min(int(q.get("limit", 5000)), 50000), ticker=ticker, adjusted=True)
+            body.update(queryCount=len(body["results"]), resultsCount=len(body["results"]))
+            return self._send(200, body)
+
+        if parts[:3] == ["v3", "reference", "tickers"]:
+            if len(parts) == 4:
+                t = m.reference_ticker(parts[3])
+                return self._send(200, {"status": "OK", "request_id": "fake", "results": t}) if t else self._not_found()
+            return self._send(200, self._page(m.reference(), q, min(int(q.get("limit", 100)), 1000)))
+
+        self._not_found()
+
+    @staticmethod
+    def _filter_chain(results: list[dict], q: dict) -> list[dict]:
+        gte, lte = q.get("expiration_date.gte"), q.get("expiration_date.lte")
+        kind = q.get("contract_type")
+        out = [
+            r for r in results
+            if (not gte or r["details"]["expiration_date"] >= gte)
+            and (not lte or r["details"]["expiration_date"] <= lte)
+            and (not kind or r["details"]["contract_type"] == kind)
+        ]
+        sort = q.get("sort")
+        if sort in ("expiration_date", "strike_price"):
+            out.sort(key=lambda r: (r["details"][sort], r["details"]["ticker"]), reverse=q.get("order") == "desc")
+        elif q.get("order") == "desc":
+            out.reverse()
+        return out
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # a scan opens dozens of connections at once
+
+    def __init__(self, address, fake: FakePolygon):
+        super().__init__(address, _Handler)
+        self.fake = fake
+
+
+def start(fake: FakePolygon, host: str = "127.0.0.1", port: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """Serve `fake` on a background thread; returns (server, base URL)."""
+    server = _Server((host, port), fake)
+    threading.Thread(target=server.serve_forever, name="fake-polygon", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_fault_args(ap: argparse.ArgumentParser):
+    """The failure-injection options, shared with the load-test drivers."""
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="delay before every response")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter on the delay")
+    ap.add_argument("--p429", type=float, default=0.0, help="share of requests answered 429 (with Retry-After)")
+    ap.add_argument("--p500", type=float, default=0.0, help="share of requests answered 500")
+    ap.add_argument("--p-timeout", type=float, default=0.0, help="share of requests held for --timeout-s, then dropped")
+    ap.add_argument("--timeout-s", type=float, default=31.0, help="how long an injected timeout holds the request")
+    ap.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on injected 429s")
+    ap.add_argument("--max-rps", type=float, default=0.0, help="answer 429 beyond this many requests per second (0 = off)")
+    ap.add_argument("--gzip", action="store_true", help="gzip responses when the client accepts it")
+    ap.add_argument("--fault-seed", type=int, default=None, help="seed for the fault rolls")
+
+
+def add_market_args(ap: argparse.ArgumentParser):
+    ap.add_argument("--cassette", help="serve a recorded scanner cassette (.json.gz) instead of the synthetic market")
+    ap.add_argument("--tickers", type=int, default=500, help="synthetic: optionable tickers")
+    ap.add_argument("--filler", type=int, default=0, help="synthetic: extra stock-only tickers in the all-tickers snapshot")
+    ap.add_argument("--min-contracts", type=int, default=50, help="synthetic: smallest chain")
+    ap.add_argument("--max-contracts", type=int, default=2_000, help="synthetic: largest chain")
+    ap.add_argument("--seed", type=int, default=42)
+
+
+def from_args(args: argparse.Namespace) -> FakePolygon:
+    synthetic = dict(
+        n_tickers=args.tickers, min_contracts=args.min_contracts,
+        max_contracts=args.max_contracts, filler=args.filler, seed=args.seed,
+    )
+    market = RecordedMarket(args.cassette, **synthetic) if args.cassette else SyntheticMarket(**synthetic)
+    return FakePolygon(
+        market, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, p429=args.p429, p500=args.p500,
+        p_timeout=args.p_timeout, timeout_s=args.timeout_s, retry_after=args.retry_after,
+        max_rps=args.max_rps, compress=args.gzip, seed=args.fault_seed,
+    )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    add_market_args(ap)
+    add_fault_args(ap)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    fake = from_args(args)
+    server, base_url = start(fake, args.host, args.port)
+    print(f"fake Polygon on {base_url} ({len(fake.market.tickers)} tickers); stats at {base_url}/_stats")
+    print(f"    POLYGON_BASE_URL={base_url} POLYGON_API_KEY=fake ...")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    server.shutdown()
+    print(json.dumps(fake.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Load test for the scanner's Polygon traffic against fake_polygon.py.
+
+Runs the scanner's own code paths end to end over HTTP: the reference
+tickers bulk load (as the universe), Pass 1 (all-tickers snapshot) and
+streaming Pass 2 (paginated chains, with the adaptive thread pool or the
+async client), with whatever latency and failures the fake is told to
+inject. Reports chains/sec, the client's request metrics (latency
+percentiles, retries, 429s, coalesced GETs), the rate limiter and the
+adaptive concurrency limits, and the fake's view of the traffic.
+
+The fake runs in-process unless --base-url points at one already running
+(python benchmarks/fake_polygon.py ...). No GCP credentials or Polygon
+key are used.
+
+    python benchmarks/load_test_pass2.py --tickers 300 --latency-ms 60 --jitter-ms 30
+    python benchmarks/load_test_pass2.py --tickers 300 --latency-ms 60 --p429 0.03 --max-rps 80 --async
+    python benchmarks/load_test_pass2.py --cassette /tmp/scan.json.gz --latency-ms 100
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import fake_polygon
+from src.enrichment.core import config
+from src.enrichment.core.clients.polygon_client import PolygonClient
+from src.enrichment.core.pipelines import overnight_scanner as scanner
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base-url", help="use a fake already running here instead of starting one")
+    ap.add_argument("--max-calls", type=float, default=config.POLYGON_MAX_CALLS_PER_SEC, help="client rate limit (req/s)")
+    ap.add_argument("--async", dest="use_async", action="store_true", help="Pass 2 on the async client (PASS2_ASYNC)")
+    ap.add_argument("--workers", type=int, default=scanner.MAX_WORKERS, help="initial Pass 2 IO workers (PASS2_IO_WORKERS)")
+    ap.add_argument("--verbose", action="store_true", help="show the scanner's log (limit changes, throttling)")
+    fake_polygon.add_market_args(ap)
+    fake_polygon.add_fault_args(ap)
+    args = ap.parse_args()
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    server = fake = None
+    base_url = args.base_url
+    if base_url is None:
+        fake = fake_polygon.from_args(args)
+        server, base_url = fake_polygon.start(fake)
+    scanner.PASS2_ASYNC = args.use_async
+    scanner.MAX_WORKERS = args.workers
+
+    poly = PolygonClient(api_key="fake", max_calls=args.max_calls, base_url=base_url)
+    start = time.perf_counter()
+    universe = set(scanner._load_metadata_from_polygon(poly))
+    t_universe = time.perf_counter() - start
+
+    start = time.perf_counter()
+    movers = scanner._prioritize_movers(scanner._pass1_stock_snapshots(poly, universe))
+    t_pass1 = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first_row = None
+    rows = 0
+    for _ in scanner._stream_pass2(poly, movers):
+        rows += 1
+        first_row = first_row or time.perf_counter() - start
+    t_pass2 = time.perf_counter() - start
+
+    metrics = poly.metrics.stats()
+    print(f"universe   {len(universe):>6} tickers  {t_universe:>7.2f}s")
+    print(f"pass 1     {len(movers):>6} movers   {t_pass1:>7.2f}s")
+    print(
+        f"pass 2     {rows:>6} rows     {t_pass2:>7.2f}s  "
+        f"({rows / t_pass2 if t_pass2 else 0:.1f} chains/s, {metrics['contracts'] / t_pass2 if t_pass2 else 0:,.0f} contracts/s, "
+        f"first row {first_row or 0:.2f}s)"
+    )
+    print(f"\nclient     {json.dumps(metrics)}")
+    print(f"limiter    {json.dumps(poly.rate_limiter.stats())}")
+    if fake is not None:
+        print(f"fake       {json.dumps(fake.stats())}")
+        server.shutdown()
+    else:
+        print(f"fake       {json.dumps(requests.get(f'{base_url}/_stats', timeout=10).json())}")
+    return 0 if rows or not movers else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Synthetic option chains for the scanner benchmarks.
+
+Chains look like what PolygonClient.fetch_options_chain returns: strikes
+on a grid around spot, weekly/monthly expiries inside the 45-day window,
+a volatility smile, Black-Scholes greeks, lognormal volume and open
+interest (most contracts quiet, a few very active), and bid/ask spreads
+that widen away from the money. A few quotes and greeks are missing, as
+they are in real snapshots.
+
+Everything is seeded, so two runs with the same arguments build the
+same market.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+
+from src.enrichment.core.clients.option_chain import CHAIN_DTYPE, OptionChain
+
+TODAY = date(2026, 3, 20)
+
+INDUSTRIES = [
+    "Semiconductors", "Software - Application", "Biotechnology", "Banks - Regional",
+    "Oil & Gas Exploration & Production", "Drug Manufacturers", "REIT",
+    "Medical - Instruments & Supplies", "Business Services", "Financial Services",
+]
+
+
+@dataclass
+class Market:
+    movers: list[dict]          # Pass 1 rows (ticker, todaysChangePerc, day_volume, underlying_price, ...)
+    chains: list[OptionChain]   # one per mover, same order
+    metadata: dict              # ticker -> {"sector", "industry"}
+
+    @property
+    def contracts(self) -> int:
+        return sum(len(c) for c in self.chains)
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.vectorize(math.erf)(x / math.sqrt(2.0)))
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+
+
+def synthetic_chain(rng: np.random.Generator, ticker: str, spot: float, n: int, today: date = TODAY) -> OptionChain:
+    """One chain of ~n contracts (calls then puts), as a columnar OptionChain."""
+    n_exp = max(1, min(8, n // 40))
+    expiries = sorted({today + timedelta(days=int(d)) for d in rng.integers(1, 46, n_exp)})
+    per_exp = max(1, n // (2 * len(expiries)))
+    step = 0.5 if spot < 25 else 1.0 if spot < 100 else 2.5 if spot < 250 else 5.0
+    strikes = np.round((spot + step * (np.arange(per_exp) - per_exp // 2)) / step) * step
+    strikes = strikes[strikes > 0]
+
+    exp_o = np.repeat([e.toordinal() for e in expiries], len(strikes))
+    k = np.tile(strikes, len(expiries))
+    size = len(k)
+    t = np.maximum(exp_o - today.toordinal(), 0.5) / 365.0
+    base_iv = rng.uniform(0.2, 0.9)
+    mny = np.log(k / spot)
+    iv = base_iv + 0.6 * mny * mny + 0.05 * rng.standard_normal(size) * base_iv
+    iv = np.clip(iv, 0.05, 4.0)
+    d1 = (mny * -1 + 0.5 * iv * iv * t) / (iv * np.sqrt(t))
+    d2 = d1 - iv * np.sqrt(t)
+    gamma = _norm_pdf(d1) / (spot * iv * np.sqrt(t))
+    vega = spot * _norm_pdf(d1) * np.sqrt(t) / 100
+    theta_c = -(spot * _norm_pdf(d1) * iv) / (2 * np.sqrt(t)) / 365
+
+    rows = []
+    for is_call in (True, False):
+        d = np.empty(size, dtype=CHAIN_DTYPE)
+        delta = _norm_cdf(d1) if is_call else _norm_cdf(d1) - 1
+        value = (spot * _norm_cdf(d1) - k * _norm_cdf(d2)) if is_call else (k * _norm_cdf(-d2) - spot * _norm_cdf(-d1))
+        value = np.maximum(value, 0.01)
+        half_spread = value * (0.02 + 0.3 * np.abs(mny)) + 0.01
+        activity = np.exp(-8 * mny * mny)
+        d["strike"] = k
+        d["bid"] = np.round(np.maximum(value - half_spread, 0), 2)
+        d["ask"] = np.round(value + half_spread, 2)
+        d["last_price"] = np.round(value * rng.uniform(0.9, 1.1, size), 2)
+        d["volume"] = np.floor(rng.lognormal(3.0, 2.0, size) * activity)
+        d["open_interest"] = np.floor(rng.lognormal(5.0, 2.0, size) * activity)
+        d["implied_volatility"] = iv
+        d["delta"] = delta
+        d["gamma"] = gamma
+        d["theta"] = theta_c
+        d["vega"] = vega
+        d["underlying_price"] = spot
+        d["expiry"] = exp_o
+        d["is_call"] = is_call
+        for field, p in (("bid", 0.02), ("ask", 0.02), ("delta", 0.03), ("gamma", 0.03), ("implied_volatility", 0.03)):
+            d[field][rng.random(size) < p] = np.nan
+        rows.append(d)
+
+    data = np.concatenate(rows)
+    kinds = np.where(data["is_call"], "C", "P")
+    symbols = np.array(
+        [f"O:{ticker}{date.fromordinal(int(e)):%y%m%d}{c}{int(s * 1000):08d}"
+         for e, c, s in zip(data["expiry"], kinds, data["strike"])],
+        dtype=object,
+    )
+    return OptionChain(data, symbols, size, ticker)
+
+
+def synthetic_market(
+    n_tickers: int,
+    min_contracts: int = 50,
+    max_contracts: int = 10_000,
+    seed: int = 42,
+    today: date = TODAY,
+) -> Market:
+    """n_tickers movers with chain sizes log-uniform in [min_contracts, max_contracts]."""
+    rng = np.random.default_rng(seed)
+    movers, chains, metadata = [], [], {}
+    for i in range(n_tickers):
+        ticker = f"T{i:04d}"
+        spot = float(np.round(rng.lognormal(4.0, 1.0), 2)) + 1.0
+        n = int(math.exp(rng.uniform(math.log(min_contracts), math.log(max_contracts))))
+        movers.append({
+            "ticker": ticker,
+            "todaysChangePerc": float(np.round(rng.choice([-1, 1]) * rng.lognormal(1.0, 0.6), 2)),
+            "day_volume": int(rng.lognormal(14, 1.5)),
+            "underlying_price": spot,
+            "prev_close": spot,
+        })
+        chains.append(synthetic_chain(rng, ticker, spot, n, today))
+        industry = INDUSTRIES[int(rng.integers(len(INDUSTRIES)))]
+        metadata[ticker] = {"sector": "Synthetic", "industry": industry}
+    return Market(movers, chains, metadata)
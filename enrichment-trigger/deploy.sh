@@ -2,6 +2,10 @@
 # Deploy enrichment-trigger to Cloud Run
 set -e
 
+# Shared modules main.py imports from the repo's src tree
+cp ../src/enrichment/core/clients/adaptive_concurrency.py .
+cp ../src/enrichment/core/clients/http_cache.py .
+
 gcloud run deploy enrichment-trigger \
   --project=profitscout-fida8 \
   --region=us-central1 \
@@ -14,3 +18,6 @@ gcloud run deploy enrichment-trigger \
   --max-instances=2 \
   --set-env-vars="PROJECT_ID=profitscout-fida8,DATASET=profit_scout,GCS_BUCKET=profit-scout-data" \
   --set-secrets="POLYGON_API_KEY=POLYGON_API_KEY:latest,GOOGLE_API_KEY=GOOGLE_API_KEY:latest"
+
+# Cleanup
+rm -f adaptive_concurrency.py http_cache.py
@@ -18,6 +18,10 @@ from google.cloud import bigquery, storage
 from google import genai
 from google.genai import types
 
+# Copied next to main.py from src/enrichment/core/clients by deploy.sh
+from adaptive_concurrency import AdaptiveConcurrency
+from http_cache import ResponseCache
+
 app = Flask(__name__)
 
 logging.basicConfig(level=logging.INFO)
@@ -30,8 +34,18 @@ GCS_BUCKET = os.getenv("GCS_BUCKET", "profit-scout-data")
 SIGNALS_TABLE = f"{PROJECT_ID}.{DATASET}.overnight_signals"
 MIN_SCORE = int(os.getenv("MIN_ENRICHMENT_SCORE", "6"))
 
+# Fan-out ceilings; the in-flight count adapts (AIMD) below these on latency/429s
+NEWS_CONCURRENCY_START = int(os.getenv("NEWS_CONCURRENCY_START", "2"))
+NEWS_CONCURRENCY_MAX = int(os.getenv("NEWS_CONCURRENCY_MAX", "6"))
+TECHNICALS_CONCURRENCY_START = int(os.getenv("TECHNICALS_CONCURRENCY_START", "4"))
+TECHNICALS_CONCURRENCY_MAX = int(os.getenv("TECHNICALS_CONCURRENCY_MAX", "16"))
+
 # Polygon
 POLYGON_API_KEY = os.getenv("POLYGON_API_KEY", "").strip()
+POLYGON_BASE_URL = os.getenv("POLYGON_BASE_URL", "https://api.polygon.io").rstrip("/")
+# Optional on-disk cache for the daily bars (SQLite file); unset disables it.
+POLYGON_CACHE_PATH = os.getenv("POLYGON_CACHE_PATH")
+_bars_cache = ResponseCache(POLYGON_CACHE_PATH) if POLYGON_CACHE_PATH else None
 
 # Vertex AI / Gemini
 VERTEX_PROJECT = os.getenv("VERTEX_PROJECT", PROJECT_ID)
@@ -86,10 +100,17 @@ def get_signal_tickers(bq_client: bigquery.Client, scan_date: str = None) -> lis
 # STEP 2: Fetch & Analyze news (Gemini Grounded Search)
 # =====================================================================
 
-def fetch_and_analyze_news(ticker: str, direction: str, price_change_pct: float, flow_volume: float = 0) -> dict | None:
+def fetch_and_analyze_news(
+    ticker: str,
+    direction: str,
+    price_change_pct: float,
+    flow_volume: float = 0,
+    concurrency: AdaptiveConcurrency | None = None,
+) -> dict | None:
     """
     Use Gemini with Google Search grounding to fetch and analyze
-    recent news for a ticker in a single call.
+    recent news for a ticker in a single call. With `concurrency`, each
+    Gemini call holds one of its slots (retry waits do not).
     """
     import time as _time
 
@@ -158,11 +179,23 @@ If you find no relevant news, set catalyst_type to "No Clear Catalyst", catalyst
             # REMOVED: response_mime_type="application/json" (causes issues with grounding)
         )
 
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt,
-            config=cfg,
-        )
+        if concurrency is None:
+            response = client.models.generate_content(
+                model=MODEL_NAME,
+                contents=prompt,
+                config=cfg,
+            )
+        else:
+            with concurrency.slot() as slot:
+                try:
+                    response = client.models.generate_content(
+                        model=MODEL_NAME,
+                        contents=prompt,
+                        config=cfg,
+                    )
+                except Exception as e:
+                    slot.throttled = any(str(code) in str(e) for code in RETRY_CODES)
+                    raise
 
         text = response.text.strip()
         logger.info(f"  {ticker}: Grounded search response length={len(text)}")
@@ -248,7 +281,6 @@ def fetch_and_analyze_news_batch(
     Fetch + analyze news for all tickers using Gemini grounded search.
     Stores results in GCS and returns analysis dict.
     """
-    import time
     from concurrent.futures import ThreadPoolExecutor, as_completed
 
     bucket = gcs_client.bucket(GCS_BUCKET)
@@ -265,7 +297,7 @@ def fetch_and_analyze_news_batch(
         else:
             flow_vol = float(signal.get("put_dollar_volume", 0) or 0)
 
-        analysis = fetch_and_analyze_news(ticker, direction, move_pct, flow_vol)
+        analysis = fetch_and_analyze_news(ticker, direction, move_pct, flow_vol, concurrency)
 
         # Store result in GCS for audit trail
         if analysis:
@@ -278,13 +310,16 @@ def fetch_and_analyze_news_batch(
 
         return ticker, analysis
 
-    # 2 concurrent workers to avoid 429 rate limits on grounded search
-    with ThreadPoolExecutor(max_workers=2) as pool:
+    # Grounded search 429s under load: start low and let AIMD find the quota
+    concurrency = AdaptiveConcurrency(
+        "news", initial=NEWS_CONCURRENCY_START, max_limit=NEWS_CONCURRENCY_MAX, window=5
+    )
+    with ThreadPoolExecutor(max_workers=concurrency.max_limit) as pool:
         futures = {pool.submit(_process_one, s): s["ticker"] for s in signals}
         for future in as_completed(futures):
             ticker, analysis = future.result()
             results[ticker] = analysis
-            time.sleep(0.5)  # Rate limit: ~2 req/sec to stay under quota
+    logger.info(f"Grounded news concurrency: {concurrency.stats()}")
 
     news_found = sum(1 for v in results.values() if v and v.get("news_found"))
     no_news = sum(1 for v in results.values() if v and not v.get("news_found"))
@@ -299,23 +334,50 @@ def fetch_and_analyze_news_batch(
 # STEP 3: Fetch technicals for each ticker (Polygon + pandas_ta)
 # =====================================================================
 
-def fetch_technicals_for_ticker(ticker: str, polygon_key: str) -> dict | None:
-    """Fetch price history and compute technical indicators."""
+def _fetch_bars(url: str, params: dict, concurrency: AdaptiveConcurrency | None) -> list[dict]:
     import requests
 
+    if concurrency is None:
+        resp = requests.get(url, params=params, timeout=10)
+    else:
+        with concurrency.slot() as slot:
+            resp = requests.get(url, params=params, timeout=10)
+            slot.status = resp.status_code
+    resp.raise_for_status()
+    return resp.json().get("results", [])
+
+
+def fetch_technicals_for_ticker(
+    ticker: str, polygon_key: str, concurrency: AdaptiveConcurrency | None = None
+) -> dict | None:
+    """
+    Fetch price history and compute technical indicators. With
+    `concurrency`, the Polygon requests hold one of its slots.
+
+    The history is two requests: ~420 days up to the end of last month,
+    a closed range whose URL stays the same all month (so the bars cache
+    can serve it), and this month to date, always fetched.
+    """
     try:
-        # Get 300 days of daily bars (need 200+ for SMA_200)
+        # Need 200+ trading days for SMA_200
         from datetime import timedelta
-        end_date = date.today().isoformat()
-        start_date = (date.today() - timedelta(days=420)).isoformat()
-
-        url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_date}/{end_date}"
+        today = date.today()
+        month_start = today.replace(day=1)
+        closed_end = month_start - timedelta(days=1)
+        closed_start = closed_end - timedelta(days=420)
         params = {"adjusted": "true", "sort": "asc", "apiKey": polygon_key}
-
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        bars = data.get("results", [])
+        base = f"{POLYGON_BASE_URL}/v2/aggs/ticker/{ticker}/range/1/day"
+
+        closed_url = f"{base}/{closed_start.isoformat()}/{closed_end.isoformat()}"
+        data = _bars_cache.get(closed_url, params) if _bars_cache is not None else None
+        if data is None:
+            data = {"results": _fetch_bars(closed_url, params, concurrency)}
+            if _bars_cache is not None:
+                _bars_cache.put(closed_url, params, data)
+        bars = data["results"]
+        recent = _fetch_bars(f"{base}/{month_start.isoformat()}/{today.isoformat()}", params, concurrency)
+        last_t = bars[-1]["t"] if bars else None
+        bars = bars + [b for b in recent if last_t is None or b["t"] > last_t]
 
         if len(bars) < 20:
             logger.warning(f"  {ticker}: only {len(bars)} bars, skipping technicals")
@@ -422,7 +484,6 @@ def fetch_technicals_for_ticker(ticker: str, polygon_key: str) -> dict | None:
 
 def fetch_technicals_batch(tickers: list[str], polygon_key: str, gcs_client: storage.Client) -> dict:
     """Fetch technicals for all tickers and store in GCS."""
-    import time
     from concurrent.futures import ThreadPoolExecutor, as_completed
 
     bucket = gcs_client.bucket(GCS_BUCKET)
@@ -430,7 +491,7 @@ def fetch_technicals_batch(tickers: list[str], polygon_key: str, gcs_client: sto
     today = date.today().isoformat()
 
     def _fetch_one(ticker):
-        tech = fetch_technicals_for_ticker(ticker, polygon_key)
+        tech = fetch_technicals_for_ticker(ticker, polygon_key, concurrency)
         if tech:
             blob_path = f"{TECHNICALS_OUTPUT_PREFIX}{ticker}_{today}.json"
             blob = bucket.blob(blob_path)
@@ -440,14 +501,17 @@ def fetch_technicals_batch(tickers: list[str], polygon_key: str, gcs_client: sto
             )
         return ticker, tech
 
-    with ThreadPoolExecutor(max_workers=8) as pool:
+    concurrency = AdaptiveConcurrency(
+        "technicals", initial=TECHNICALS_CONCURRENCY_START, max_limit=TECHNICALS_CONCURRENCY_MAX, window=10
+    )
+    with ThreadPoolExecutor(max_workers=concurrency.max_limit) as pool:
         futures = {pool.submit(_fetch_one, t): t for t in tickers}
         for future in as_completed(futures):
             ticker, tech = future.result()
             results[ticker] = tech
-            time.sleep(0.15)
 
     logger.info(f"Technicals computed for {len([v for v in results.values() if v])} tickers")
+    logger.info(f"Technicals concurrency: {concurrency.stats()}")
     return results
 
 
@@ -6,6 +6,9 @@ PROJECT_ID="profitscout-fida8"
 REGION="us-central1"
 SERVICE_NAME="forward-paper-trader"
 
+# Shared modules main.py imports from the repo's src tree
+cp ../src/enrichment/core/clients/http_cache.py .
+
 echo "Deploying $SERVICE_NAME to Cloud Run in project $PROJECT_ID..."
 
 gcloud run deploy $SERVICE_NAME \
@@ -23,4 +26,7 @@ gcloud run deploy $SERVICE_NAME \
   --set-secrets="POLYGON_API_KEY=POLYGON_API_KEY:latest,FMP_API_KEY=FMP_API_KEY:latest" \
   --service-account="firebase-adminsdk-fbsvc@$PROJECT_ID.iam.gserviceaccount.com"
 
+# Cleanup
+rm -f http_cache.py
+
 echo "Done!"
\ No newline at end of file
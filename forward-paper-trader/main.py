@@ -11,6 +11,9 @@ import yfinance as yf
 import time
 from flask import Flask, jsonify, request
 
+# Copied next to main.py from src/enrichment/core/clients by deploy.sh
+from http_cache import ResponseCache
+
 app = Flask(__name__)
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -18,6 +21,10 @@ logger = logging.getLogger(__name__)
 
 PROJECT_ID = "profitscout-fida8"
 POLYGON_API_KEY = os.environ.get("POLYGON_API_KEY", "").strip()
+POLYGON_BASE_URL = os.environ.get("POLYGON_BASE_URL", "https://api.polygon.io").rstrip("/")
+# Optional on-disk cache for closed minute bars (SQLite file); unset disables it.
+POLYGON_CACHE_PATH = os.environ.get("POLYGON_CACHE_PATH")
+_bars_cache = ResponseCache(POLYGON_CACHE_PATH) if POLYGON_CACHE_PATH else None
 FMP_API_KEY = os.environ.get("FMP_API_KEY", "").strip()
 
 nyse = mcal.get_calendar("NYSE")
@@ -55,8 +62,11 @@ def fetch_minute_bars(ticker: str, start_date: date, end_date: date) -> list:
         logger.error("POLYGON_API_KEY is not set.")
         return []
 
-    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/minute/{start_date.isoformat()}/{end_date.isoformat()}"
+    url = f"{POLYGON_BASE_URL}/v2/aggs/ticker/{ticker}/range/1/minute/{start_date.isoformat()}/{end_date.isoformat()}"
     params = {"adjusted": "true", "sort": "asc", "limit": 50000, "apiKey": POLYGON_API_KEY}
+    cached = _bars_cache.get(url, params) if _bars_cache is not None else None
+    if cached is not None:
+        return cached.get("results", [])
     for attempt in range(3):
         try:
             resp = requests.get(url, params=params, timeout=10)
@@ -64,7 +74,10 @@ def fetch_minute_bars(ticker: str, start_date: date, end_date: date) -> list:
                 time.sleep(2 * (attempt + 1))
                 continue
             resp.raise_for_status()
-            return resp.json().get("results", [])
+            data = resp.json()
+            if _bars_cache is not None:
+                _bars_cache.put(url, params, data)
+            return data.get("results", [])
         except Exception as e:
             logger.warning(f"Polygon API Error: {e}")
             time.sleep(1)
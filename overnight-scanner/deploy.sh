@@ -8,7 +8,22 @@ mkdir -p src/enrichment/core/clients
 
 cp ../src/enrichment/core/config.py src/enrichment/core/
 cp ../src/enrichment/core/pipelines/overnight_scanner.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/flow_metrics.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/batch_scoring.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/object_store.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/scan_checkpoint.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/metadata_index.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/signal_sink.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/metrics_archive.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/chain_archive.py src/enrichment/core/pipelines/
+cp ../src/enrichment/core/pipelines/scan_shards.py src/enrichment/core/pipelines/
 cp ../src/enrichment/core/clients/polygon_client.py src/enrichment/core/clients/
+cp ../src/enrichment/core/clients/async_polygon_client.py src/enrichment/core/clients/
+cp ../src/enrichment/core/clients/polygon_json.py src/enrichment/core/clients/
+cp ../src/enrichment/core/clients/http_cache.py src/enrichment/core/clients/
+cp ../src/enrichment/core/clients/cassette.py src/enrichment/core/clients/
+cp ../src/enrichment/core/clients/option_chain.py src/enrichment/core/clients/
+cp ../src/enrichment/core/clients/adaptive_concurrency.py src/enrichment/core/clients/
 
 # Create __init__.py files
 touch src/__init__.py
@@ -0,0 +1,49 @@
+"""
+Sharded overnight scan as a Cloud Run job (or N local processes).
+
+Each task of the job scans the tickers of shard CLOUD_RUN_TASK_INDEX of
+CLOUD_RUN_TASK_COUNT and writes a partial result to SCANNER_SHARD_URI;
+the last task to finish merges them (global cluster boost, sort, top-10,
+single BigQuery write). With one task it is the plain scanner run.
+SCANNER_SHARD_MAX_RETRIES and SCANNER_MERGE_LOCK_TTL_SEC should match
+--max-retries and --task-timeout: a shard out of retries is reported as
+an ERROR (nothing will merge), and a merge claim older than the timeout
+is taken over by the next task.
+
+    gcloud run jobs deploy overnight-scanner-job --source=. \\
+        --tasks=4 --parallelism=4 --max-retries=1 --task-timeout=900 \\
+        --command=python --args=job.py ...
+    python job.py --local 4      # 4 shard processes on this machine, then merge
+    python job.py --merge 4      # re-run only the merge of today's 4 partials
+"""
+
+import argparse
+import logging
+import sys
+
+from src.enrichment.core.pipelines import overnight_scanner
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--local", type=int, metavar="N", help="run N shard processes here, then merge")
+    ap.add_argument("--merge", type=int, metavar="N", help="merge today's N shard partials only")
+    args = ap.parse_args()
+    try:
+        if args.local:
+            overnight_scanner.run_sharded_local(args.local)
+        elif args.merge:
+            overnight_scanner.run_merge(args.merge)
+        else:
+            overnight_scanner.run_job()
+    except Exception as e:
+        logger.error("Overnight scanner job failed: %s", e, exc_info=True)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
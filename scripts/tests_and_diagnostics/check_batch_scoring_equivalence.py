@@ -0,0 +1,96 @@
+"""
+Check that the batch scoring engine matches the per-ticker scorer.
+
+Builds synthetic Pass 2 metric rows and requires
+batch_scoring.score_rows(rows, metadata) to equal
+_apply_cluster_boost([_score_ticker(r) for r in rows], metadata) row for
+row: same keys in the same order, same scores, directions, cluster
+sizes/boosts and signal strings.
+
+    python scripts/tests_and_diagnostics/check_batch_scoring_equivalence.py [N_DAYS] [TICKERS_PER_DAY]
+
+Rows sit on and around every signal cut-off, include missing metrics,
+flat (0%) and None price changes, divergence flips and tickers without
+industry metadata, and days are dense enough to form boosted clusters.
+"""
+
+import logging
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.enrichment.core.pipelines import batch_scoring
+from src.enrichment.core.pipelines import overnight_scanner as scanner
+
+logging.getLogger().setLevel(logging.WARNING)
+
+INDUSTRIES = ["Semiconductors", "Biotechnology", "Banks - Regional", "Software - Application", ""]
+
+
+def _pick(rng: random.Random, cutoffs: list[float], lo: float, hi: float):
+    """A value exactly on a cut-off, just either side of one, or anywhere in range."""
+    c = rng.choice(cutoffs)
+    return rng.choice([c, c * (1 + 1e-9), c * (1 - 1e-9), rng.uniform(lo, hi)])
+
+
+def synthetic_rows(rng: random.Random, n: int) -> tuple[list[dict], dict]:
+    rows, metadata = [], {}
+    for i in range(n):
+        ticker = f"S{i:04d}"
+        call_dv = rng.choice([0, None, _pick(rng, [250_000, 500_000, 1_000_000], 0, 2e7)])
+        put_dv = rng.choice([0, _pick(rng, [250_000, 500_000, 1_000_000], 0, 2e7)])
+        if rng.random() < 0.15:  # force a divergence candidate
+            put_dv, call_dv = (call_dv or 0) * 2 + 1_000_001, put_dv
+        row = {
+            "ticker": ticker,
+            "todaysChangePerc": rng.choice([None, 0, _pick(rng, [1.5, -1.5], -12, 12)]),
+            "underlying_price": round(rng.uniform(2, 500), 2),
+            "day_volume": rng.randint(0, 10**8),
+            "call_dollar_vol": call_dv,
+            "put_dollar_vol": put_dv,
+            "call_vol_oi": _pick(rng, [0.8, 2.0], 0, 6),
+            "put_vol_oi": _pick(rng, [0.8, 2.0], 0, 6),
+            "call_active_strikes": rng.randint(0, 9),
+            "put_active_strikes": rng.randint(0, 9),
+            "call_uoa_depth": _pick(rng, [500_000, 2_000_000], 0, 8e6),
+            "put_uoa_depth": _pick(rng, [500_000, 2_000_000], 0, 8e6),
+            "best_call": {"contract_symbol": f"O:{ticker}C", "strike": 10.0, "dte": 7} if rng.random() < 0.8 else None,
+            "best_put": {"contract_symbol": f"O:{ticker}P", "strike": 9.0, "dte": 7} if rng.random() < 0.8 else None,
+        }
+        rows.append(row)
+        if rng.random() < 0.9:
+            metadata[ticker] = {"sector": "Synthetic", "industry": rng.choice(INDUSTRIES)}
+    return rows, metadata
+
+
+def _diff(expected: list[dict], actual: list[dict]) -> list[str]:
+    if len(expected) != len(actual):
+        return [f"{len(expected)} rows != {len(actual)} rows"]
+    out = []
+    for e, a in zip(expected, actual):
+        if list(e) != list(a):
+            out.append(f"{e['ticker']}: key order {list(e)} != {list(a)}")
+        out += [f"{e['ticker']}.{k}: {e[k]!r} != {a.get(k)!r}" for k in e if e[k] != a.get(k)]
+    return out
+
+
+def main(n_days: int = 50, tickers: int = 300) -> int:
+    rng = random.Random(1234)
+    failures = 0
+    for day in range(n_days):
+        rows, metadata = synthetic_rows(rng, tickers)
+        expected = scanner._apply_cluster_boost([scanner._score_ticker(r) for r in rows], metadata)
+        actual = batch_scoring.score_rows(rows, metadata)
+        diffs = _diff(expected, actual)
+        if diffs:
+            failures += 1
+            print(f"day #{day}:", *diffs[:5], sep="\n  ")
+    print(f"{n_days} days x {tickers} tickers checked, {failures} days mismatched.")
+    return failures
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    t = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    sys.exit(1 if main(n, t) else 0)
@@ -0,0 +1,120 @@
+"""
+Check PolygonClient.fetch_option_contract_snapshots against the local
+Polygon stand-in (benchmarks/fake_polygon.py; no key, no network).
+
+The fake serves both the universal snapshot (/v3/snapshot?ticker.any_of=...)
+and the single-contract snapshot (/v3/snapshot/options/{underlying}/{contract})
+from one synthetic market, with a fixed latency per request. Some
+contracts have their greeks or last trade removed, as in real data. The
+check requires:
+
+- every known symbol comes back, mapped exactly as
+  fetch_option_contract_snapshot maps it; unknown symbols are left out
+- duplicates are requested once, no request carries more than
+  SNAPSHOT_BATCH_SIZE symbols, and the groups are fetched concurrently
+- a group whose request fails only loses its own symbols
+
+    python scripts/tests_and_diagnostics/check_contract_snapshots.py [N_CONTRACTS] [LATENCY_MS]
+"""
+
+import logging
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks"))
+import fake_polygon
+from src.enrichment.core.clients.polygon_client import SNAPSHOT_BATCH_SIZE, PolygonClient
+
+logging.getLogger().setLevel(logging.CRITICAL)
+
+
+class _SparseMarket(fake_polygon.SyntheticMarket):
+    """Synthetic chains where every 7th contract lacks greeks and every 5th its last trade."""
+
+    def chain(self, ticker: str):
+        results, by_symbol = super().chain(ticker)
+        for r in results:
+            h = zlib.crc32(r["details"]["ticker"].encode())
+            if h % 7 == 0:
+                r.pop("greeks", None)
+            if h % 5 == 0:
+                r.pop("last_trade", None)
+        return results, by_symbol
+
+
+def _contracts(market: fake_polygon.SyntheticMarket, n: int) -> dict[str, str]:
+    """n contract symbols -> underlying, spread over the market's tickers."""
+    per_ticker = [market.chain(t)[0] for t in market.tickers]
+    out: dict[str, str] = {}
+    i = 0
+    while len(out) < n and any(i < len(c) for c in per_ticker):
+        for t, chain in zip(market.tickers, per_ticker):
+            if i < len(chain) and len(out) < n:
+                out[chain[i]["details"]["ticker"]] = t
+        i += 1
+    return out
+
+
+def main() -> int:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1100
+    latency_ms = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    market = _SparseMarket(n_tickers=5, min_contracts=400, max_contracts=800, seed=7)
+    fake = fake_polygon.FakePolygon(market, latency_ms=latency_ms)
+    server, base_url = fake_polygon.start(fake)
+    poly = PolygonClient(api_key="fake", max_calls=1000, base_url=base_url)
+    pairs = _contracts(market, n)  # contract -> underlying
+    unknown = ["O:ZZZZ261120C00001000", "O:NOPE261127P00002000"]
+    failures = []
+
+    requested = list(pairs) + unknown + list(pairs)[:50]  # unknowns and duplicates
+    fake.reset()
+    start = time.perf_counter()
+    batch = poly.fetch_option_contract_snapshots(requested)
+    batch_secs = time.perf_counter() - start
+    stats = fake.stats()
+    unique = len(set(requested))
+    expected_calls = -(-unique // SNAPSHOT_BATCH_SIZE)
+
+    if set(batch) != set(pairs):
+        failures.append(f"returned {len(batch)} symbols, expected {len(pairs)}")
+    if stats.get("v3/snapshot", 0) != expected_calls:
+        failures.append(f"{stats.get('v3/snapshot', 0)} batch requests, expected {expected_calls}")
+    if stats.get("status_400"):
+        failures.append("a request carried more than SNAPSHOT_BATCH_SIZE symbols")
+    if stats.get("universal_symbols") != unique:
+        failures.append("some symbols were requested more than once")
+    if expected_calls > 1 and stats["peak_in_flight"] < 2:
+        failures.append("batch requests were not fetched concurrently")
+
+    fake.reset()
+    start = time.perf_counter()
+    mismatched = 0
+    for contract, underlying in pairs.items():
+        if poly.fetch_option_contract_snapshot(underlying, contract) != batch.get(contract):
+            mismatched += 1
+    single_secs = time.perf_counter() - start
+    single_calls = fake.stats().get("v3/snapshot/options", 0)
+    if mismatched:
+        failures.append(f"{mismatched} records differ from fetch_option_contract_snapshot")
+
+    fake.fail_symbols = {list(pairs)[0]}
+    partial = poly.fetch_option_contract_snapshots(list(pairs))
+    if len(partial) != len(pairs) - min(SNAPSHOT_BATCH_SIZE, len(pairs)):
+        failures.append(f"a failed group lost {len(pairs) - len(partial)} symbols, expected {SNAPSHOT_BATCH_SIZE}")
+
+    server.shutdown()
+    print(
+        f"{len(pairs)} contracts: {expected_calls} batch requests in {batch_secs:.2f}s "
+        f"(peak {stats['peak_in_flight']} in flight) vs {single_calls} single requests in {single_secs:.2f}s"
+    )
+    for f in failures:
+        print(f"FAIL: {f}")
+    print("OK" if not failures else f"{len(failures)} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
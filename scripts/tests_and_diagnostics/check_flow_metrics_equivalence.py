@@ -0,0 +1,121 @@
+"""
+Check that the vectorized flow-metrics engine matches the dict implementation.
+
+Runs overnight_scanner._compute_flow_metrics on list-of-dict chains and
+on the same chains as columnar OptionChains, and requires every metric
+and every best-contract field to be identical (same float bits).
+
+    python scripts/tests_and_diagnostics/check_flow_metrics_equivalence.py [N_CHAINS] [CASSETTE.json.gz]
+
+Synthetic chains deliberately include missing quotes/greeks, zero bids,
+tied strikes, unparseable expirations and near-tie contract scores. When
+a recorded cassette is given, every chain in it is checked as well.
+"""
+
+import logging
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.enrichment.core.clients.cassette import REPLAY, Cassette
+from src.enrichment.core.clients.option_chain import OptionChain
+from src.enrichment.core.clients.polygon_client import PolygonClient
+from src.enrichment.core.pipelines import overnight_scanner as scanner
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def _maybe(rng: random.Random, v, p_none: float = 0.08):
+    return None if rng.random() < p_none else v
+
+
+def synthetic_chain(rng: random.Random, today: date, n: int, spot: float) -> list[dict]:
+    out = []
+    for i in range(n):
+        strike = round(spot * rng.uniform(0.6, 1.5) / 2.5) * 2.5
+        # Mostly penny quotes; some unrounded so summation order shows up in the bits.
+        digits = rng.choice([2, 2, 2, 9])
+        bid = round(rng.choice([0, 0, rng.uniform(0.01, 20)]), digits)
+        ask = round(bid + rng.uniform(0, 3), digits) if bid else rng.choice([0, None, 1.25])
+        exp = today + timedelta(days=rng.randint(0, 120))
+        kind = rng.choice(["call", "put", "call", "put", ""])
+        strike = rng.choice([strike, int(strike)]) or 2.5
+        out.append({
+            "contract_symbol": f"O:SYN{exp:%y%m%d}{i:06d}",
+            "option_type": kind,
+            "expiration_date": rng.choice([exp.isoformat()] * 20 + [None, "not-a-date"]),
+            # A missing put strike makes the dict path divide by zero.
+            "strike": _maybe(rng, strike) if kind != "put" else strike,
+            "last_price": _maybe(rng, round(rng.uniform(0, 25), 2), 0.3),
+            "bid": _maybe(rng, bid),
+            "ask": _maybe(rng, ask),
+            "volume": _maybe(rng, rng.choice([0, rng.randint(0, 50), rng.randint(0, 20000)])),
+            "open_interest": _maybe(rng, rng.choice([0, rng.randint(0, 50000)])),
+            "implied_volatility": _maybe(rng, rng.choice([0, rng.uniform(0.05, 3.0)])),
+            "delta": _maybe(rng, rng.uniform(-1, 1)),
+            "theta": _maybe(rng, rng.choice([0, -rng.uniform(0, 2)])),
+            "vega": _maybe(rng, rng.choice([0, rng.uniform(0, 1)])),
+            "gamma": _maybe(rng, rng.choice([0, rng.uniform(0, 0.2)])),
+            "underlying_price": spot,
+        })
+    # Duplicate some contracts so first-max / first-min tie-breaking matters.
+    out += [dict(c, contract_symbol=c["contract_symbol"] + "D") for c in rng.sample(out, min(5, len(out)))]
+    return out
+
+
+def _diff(a, b, path="") -> list[str]:
+    if isinstance(a, dict) and isinstance(b, dict):
+        if a.keys() != b.keys():
+            return [f"{path}: keys {sorted(a.keys() ^ b.keys())}"]
+        return [d for k in a for d in _diff(a[k], b[k], f"{path}.{k}")]
+    if isinstance(a, float) or isinstance(b, float):
+        if a is None or b is None or float(a).hex() != float(b).hex():
+            return [f"{path}: {a!r} != {b!r}"]
+        return []
+    return [] if a == b else [f"{path}: {a!r} != {b!r}"]
+
+
+def check(chain: list[dict], spot: float, today: date) -> list[str]:
+    try:
+        expected = scanner._compute_flow_metrics(chain, spot, today)
+    except ZeroDivisionError:
+        return []  # dict path raises on zero-strike puts; documented difference
+    actual = scanner._compute_flow_metrics(OptionChain.from_records(chain), spot, today)
+    return _diff(expected, actual)
+
+
+def main(n_chains: int = 500, cassette_path: str | None = None):
+    rng = random.Random(1234)
+    today = date(2026, 3, 20)
+    failures = 0
+    for k in range(n_chains):
+        spot = rng.choice([0, rng.uniform(2, 900)])
+        chain = synthetic_chain(rng, today, rng.choice([0, 1, 5, 60, 400]), spot)
+        diffs = check(chain, spot, today)
+        if diffs:
+            failures += 1
+            print(f"synthetic chain #{k} (spot={spot}):", *diffs[:5], sep="\n  ")
+
+    if cassette_path:
+        poly = PolygonClient(api_key="replay", cassette=Cassette(cassette_path, mode=REPLAY))
+        movers = scanner._pass1_stock_snapshots(poly, set(poly.cassette.meta.get("universe") or []))
+        for m in movers:
+            try:
+                chain = poly.fetch_options_chain(m["ticker"], max_days=45)
+            except KeyError:
+                continue
+            diffs = check(chain, m["underlying_price"], poly.today())
+            if diffs:
+                failures += 1
+                print(f"{m['ticker']}:", *diffs[:5], sep="\n  ")
+        n_chains += len(movers)
+
+    print(f"{n_chains} chains checked, {failures} mismatched.")
+    return failures
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sys.exit(1 if main(n, sys.argv[2] if len(sys.argv) > 2 else None) else 0)
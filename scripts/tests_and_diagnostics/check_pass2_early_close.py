@@ -0,0 +1,92 @@
+"""
+Check that streaming Pass 2 winds down when its consumer stops early,
+against the local Polygon stand-in (benchmarks/fake_polygon.py; no key,
+no network).
+
+A full Pass 2 over the fake's movers is run once for its chain request
+count. Then, for the adaptive thread pool and for the async client, the
+_stream_pass2 generator is closed after its first row. The check
+requires, for each mode:
+
+- close() returns only after every pass2-* thread has exited
+- no chain request reaches the fake after close() returns
+- far fewer chain requests were made than in the full run
+- the adaptive concurrency controller is detached from the client
+
+    python scripts/tests_and_diagnostics/check_pass2_early_close.py [N_TICKERS] [LATENCY_MS]
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks"))
+import fake_polygon
+from src.enrichment.core.clients.polygon_client import PolygonClient
+from src.enrichment.core.pipelines import overnight_scanner as scanner
+
+logging.getLogger().setLevel(logging.CRITICAL)
+
+CHAIN_PATH = "v3/snapshot/options"
+
+
+def _pass2_threads() -> list[str]:
+    return [t.name for t in threading.enumerate() if t.name.startswith("pass2")]
+
+
+def main() -> int:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    latency_ms = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    market = fake_polygon.SyntheticMarket(n_tickers=n, min_contracts=50, max_contracts=400, seed=11)
+    fake = fake_polygon.FakePolygon(market, latency_ms=latency_ms)
+    server, base_url = fake_polygon.start(fake)
+    scanner.PASS2_MAX_IN_FLIGHT = scanner.MAX_WORKERS  # same fan-out in both modes
+    failures = []
+
+    poly = PolygonClient(api_key="fake", max_calls=1000, base_url=base_url)
+    universe = set(scanner._load_metadata_from_polygon(poly))
+    movers = scanner._prioritize_movers(scanner._pass1_stock_snapshots(poly, universe))
+
+    fake.reset()
+    rows = sum(1 for _ in scanner._stream_pass2(poly, movers))
+    full = fake.stats().get(CHAIN_PATH, 0)
+    print(f"full run: {len(movers)} movers, {rows} rows, {full} chain requests")
+    if not rows:
+        failures.append("the full run produced no rows")
+
+    for mode, use_async in (("threads", False), ("async", True)):
+        scanner.PASS2_ASYNC = use_async
+        poly = PolygonClient(api_key="fake", max_calls=1000, base_url=base_url)
+        fake.reset()
+        gen = scanner._stream_pass2(poly, movers)
+        next(gen, None)
+        start = time.perf_counter()
+        gen.close()
+        close_secs = time.perf_counter() - start
+        left = _pass2_threads()
+        at_close = fake.stats().get(CHAIN_PATH, 0)
+        time.sleep(max(1.0, 10 * latency_ms / 1000))
+        after = fake.stats().get(CHAIN_PATH, 0)
+        print(f"{mode:>8}: closed in {close_secs:.2f}s after {at_close} chain requests")
+
+        if left:
+            failures.append(f"{mode}: threads still running after close(): {left}")
+        if after != at_close:
+            failures.append(f"{mode}: {after - at_close} chain requests after close()")
+        if at_close * 2 > full:
+            failures.append(f"{mode}: {at_close} chain requests before stopping (full run: {full})")
+        if poly.concurrency is not None:
+            failures.append(f"{mode}: concurrency controller left attached")
+
+    server.shutdown()
+    for f in failures:
+        print(f"FAIL: {f}")
+    print("OK" if not failures else f"{len(failures)} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Check that signal_sink's Arrow schema matches the overnight_signals table.
+
+The BigQuery load sink writes to_arrow() output as Parquet into a table
+created by overnight_scanner._ensure_table (OVERNIGHT_SIGNALS_SCHEMA).
+The check requires, column for column and in order:
+
+- the same names
+- Arrow types that load as the BigQuery type (DATE, TIMESTAMP, STRING,
+  INTEGER, FLOAT; list<string> for the REPEATED STRING column)
+- nullable=False exactly where the table says REQUIRED, and the written
+  Parquet file keeps those columns REQUIRED
+
+    python scripts/tests_and_diagnostics/check_signal_schema.py
+"""
+
+import io
+import logging
+import os
+import sys
+from datetime import date, datetime, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.enrichment.core.pipelines import overnight_scanner as scanner
+from src.enrichment.core.pipelines import signal_sink
+
+logging.getLogger().setLevel(logging.WARNING)
+
+BQ_TYPES = {
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "STRING": pa.string(),
+    "INTEGER": pa.int64(),
+    "FLOAT": pa.float64(),
+}
+
+
+def main() -> int:
+    failures = []
+    table_fields = scanner.OVERNIGHT_SIGNALS_SCHEMA
+    arrow = signal_sink.SCHEMA
+
+    if [f.name for f in table_fields] != arrow.names:
+        failures.append(f"column order differs:\n  table {[f.name for f in table_fields]}\n  arrow {arrow.names}")
+
+    for bq_field in table_fields:
+        if bq_field.name not in arrow.names:
+            continue
+        field = arrow.field(bq_field.name)
+        want = BQ_TYPES[bq_field.field_type]
+        if bq_field.mode == "REPEATED":
+            want = pa.list_(want)
+        if field.type != want:
+            failures.append(f"{bq_field.name}: arrow {field.type}, table {bq_field.field_type} {bq_field.mode}")
+        if field.nullable != (bq_field.mode != "REQUIRED"):
+            failures.append(f"{bq_field.name}: arrow nullable={field.nullable}, table mode {bq_field.mode}")
+
+    # What the load job actually sees: the written Parquet file's column modes.
+    row = {"ticker": "AAPL", "direction": "BULLISH", "overnight_score": 7, "signals": ["a", "b"]}
+    out = signal_sink.to_arrow([row], date(2026, 10, 16), datetime(2026, 10, 16, 23, 0, tzinfo=timezone.utc))
+    buf = io.BytesIO()
+    pq.write_table(out, buf)
+    written = pq.ParquetFile(io.BytesIO(buf.getvalue())).schema_arrow
+    for bq_field in table_fields:
+        if bq_field.mode == "REQUIRED" and written.field(bq_field.name).nullable:
+            failures.append(f"{bq_field.name}: written as OPTIONAL Parquet column, table mode REQUIRED")
+
+    for f in failures:
+        print(f"FAIL {f}")
+    print(f"{len(table_fields)} columns: {'OK' if not failures else f'{len(failures)} mismatches'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Replay a recorded overnight-scanner cassette offline and time each stage.
+
+Record a cassette by running the scanner with
+SCANNER_RECORD_CASSETTE=/path/scan.json.gz, then:
+
+    python scripts/tests_and_diagnostics/replay_scanner.py /path/scan.json.gz
+
+Every Polygon response comes from the archive, so stage timings are pure
+CPU cost and two commits can be compared on identical inputs.
+"""
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.enrichment.core.clients.cassette import REPLAY, Cassette
+from src.enrichment.core.clients.polygon_client import PolygonClient
+from src.enrichment.core.pipelines import overnight_scanner as scanner
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def main(path: str):
+    cassette = Cassette(path, mode=REPLAY)
+    poly = PolygonClient(api_key="replay", cassette=cassette)
+    universe = set(cassette.meta.get("universe") or [])
+    timings = {}
+
+    t0 = time.perf_counter()
+    metadata = scanner._load_metadata_from_polygon(poly)
+    timings["metadata"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    movers = scanner._pass1_stock_snapshots(poly, universe)
+    timings["pass1"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    enriched = scanner._pass2_options(poly, movers)
+    timings["pass2"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scored = [scanner._score_ticker(d) for d in enriched]
+    timings["score"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scored = scanner._apply_cluster_boost(scored, metadata)
+    timings["cluster_boost"] = time.perf_counter() - t0
+
+    top = [s for s in scored if s["overnight_score"] >= scanner.MIN_SCORE]
+    print(f"Cassette {path}: as of {cassette.as_of}, {len(cassette)} responses")
+    print(f"Universe {len(universe)} | movers {len(movers)} | with options {len(enriched)} | score >= {scanner.MIN_SCORE}: {len(top)}")
+    for stage, secs in timings.items():
+        print(f"  {stage:<14} {secs * 1000:10.1f} ms")
+    print(f"  {'total':<14} {sum(timings.values()) * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit(f"usage: {sys.argv[0]} CASSETTE.json.gz")
+    main(sys.argv[1])
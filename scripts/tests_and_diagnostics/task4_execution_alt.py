@@ -1,19 +1,21 @@
 import os
 import json
 import logging
-import requests
 import pandas as pd
 from datetime import datetime, timedelta, date
 import pytz
 import pandas_market_calendars as mcal
 from google.cloud import bigquery
 import time
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.enrichment.core.clients.research import fetch_minute_bars  # cached (POLYGON_CACHE_PATH)
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
 PROJECT_ID = "profitscout-fida8"
-POLYGON_API_KEY = os.environ.get("POLYGON_API_KEY", "")
 
 nyse = mcal.get_calendar("NYSE")
 est = pytz.timezone("America/New_York")
@@ -37,21 +39,6 @@ def build_polygon_ticker(underlying: str, expiration: date, direction: str, stri
     strike_str = f"{int(round(strike * 1000)):08d}"
     return f"O:{sym}{exp_str}{opt_type}{strike_str}"
 
-def fetch_minute_bars(ticker: str, start_date: date, end_date: date) -> list:
-    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/minute/{start_date.isoformat()}/{end_date.isoformat()}"
-    params = {"adjusted": "true", "sort": "asc", "limit": 50000, "apiKey": POLYGON_API_KEY}
-    for attempt in range(3):
-        try:
-            resp = requests.get(url, params=params, timeout=10)
-            if resp.status_code == 429:
-                time.sleep(2 * (attempt + 1))
-                continue
-            resp.raise_for_status()
-            return resp.json().get("results", [])
-        except:
-            time.sleep(1)
-    return []
-
 def run_execution_test():
     print("="*80)
     print("TASK 4D (Alt Gate): EXECUTION VIABILITY ON GATED COHORT")
@@ -0,0 +1,222 @@
+# enrichment/core/clients/adaptive_concurrency.py
+"""
+AIMD adaptive concurrency limit for fan-out fetch pools.
+
+Instead of a hard-coded pool size plus a sleep between submissions, the
+pool is sized for the ceiling and every unit of work takes a slot from an
+AdaptiveConcurrency. The limit on slots moves with what the upstream
+service tells us:
+
+- additive increase: after each window of healthy responses (low error
+  rate, p95 latency within `latency_tolerance` of the best p95 seen) the
+  limit grows by `increase`, but only if the pool actually used it;
+- multiplicative decrease: a 429 or a timeout cuts the limit by
+  `backoff` at once, and so does a window with rising p95 or too many
+  errors. Only requests started after the last cut can cut again, so one
+  wave of 429s from the same burst counts once.
+
+Every change of the effective limit is logged with the reason, and
+stats() reports the limit range and throughput for the run summary.
+
+    ctl = AdaptiveConcurrency("technicals", initial=4, max_limit=16)
+    with ThreadPoolExecutor(max_workers=ctl.max_limit) as pool:
+        ...
+        with ctl.slot() as slot:        # in each task
+            resp = requests.get(...)
+            slot.status = resp.status_code
+
+A slot records its own latency and status; exceptions count as errors
+(timeouts, or any exception after `slot.throttled = True`, as
+throttling). Callers whose requests are observed elsewhere (e.g.
+PolygonClient reports every HTTP response via observe()) use
+slot(observe=False) purely for admission.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def _is_timeout(exc: BaseException) -> bool:
+    return isinstance(exc, TimeoutError) or "timeout" in type(exc).__name__.lower()
+
+
+class _Slot:
+    """One admitted unit of work; set `status` (HTTP code) before leaving."""
+
+    __slots__ = ("status", "throttled")
+
+    def __init__(self):
+        self.status = 200
+        self.throttled = False
+
+
+class _SlotContext:
+    def __init__(self, ctl: "AdaptiveConcurrency", observe: bool):
+        self.ctl = ctl
+        self.observe = observe
+        self.slot = _Slot()
+
+    def __enter__(self) -> _Slot:
+        self.ctl.acquire()
+        self.start = time.perf_counter()
+        return self.slot
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self.observe:
+                elapsed = time.perf_counter() - self.start
+                if exc is not None:
+                    self.ctl.observe(elapsed, status=0, timeout=self.slot.throttled or _is_timeout(exc))
+                else:
+                    self.ctl.observe(elapsed, status=self.slot.status, timeout=self.slot.throttled)
+        finally:
+            self.ctl.release()
+        return False
+
+
+class AdaptiveConcurrency:
+    """Thread-safe AIMD limit on in-flight requests (see module docstring)."""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        window: int = 20,
+        latency_tolerance: float = 2.0,
+        max_error_rate: float = 0.1,
+    ):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.increase = increase
+        self.backoff = backoff
+        self.window = window
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+
+        self._cond = threading.Condition()
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._saturated = False
+        self._samples: deque = deque(maxlen=window)
+        self._fresh = 0
+        self._baseline_p95: float | None = None
+        self._last_decrease = 0.0
+
+        self._start = time.monotonic()
+        self._requests = 0
+        self._errors = 0
+        self._throttled = 0
+        self._increases = 0
+        self._decreases = 0
+        self._low = self._high = int(self._limit)
+        self._limit_seconds = 0.0
+        self._limit_since = self._start
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    # ---- admission -------------------------------------------------------
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._saturated = True
+                self._cond.wait()
+            self._in_flight += 1
+            if self._in_flight >= int(self._limit):
+                self._saturated = True
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def slot(self, observe: bool = True) -> _SlotContext:
+        return _SlotContext(self, observe)
+
+    # ---- feedback --------------------------------------------------------
+
+    def observe(self, seconds: float, status: int = 200, timeout: bool = False):
+        """Record one response (status 0 = failed without one)."""
+        with self._cond:
+            self._requests += 1
+            throttled = timeout or status == 429
+            error = throttled or status == 0 or status >= 500
+            self._throttled += throttled
+            self._errors += error
+            self._samples.append((seconds, error))
+            self._fresh += 1
+
+            now = time.monotonic()
+            if throttled:
+                if now - seconds >= self._last_decrease:  # sent after the last cut
+                    self._set_limit(self._limit * self.backoff, "timeout" if timeout else "429")
+                    self._last_decrease = now
+                self._fresh = 0
+                return
+            if self._fresh < self.window:
+                return
+
+            self._fresh = 0
+            latencies = sorted(s for s, _ in self._samples)
+            p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+            error_rate = sum(e for _, e in self._samples) / len(self._samples)
+            base = self._baseline_p95
+            # Best p95 seen, drifting up slowly so a permanently slower upstream is accepted.
+            self._baseline_p95 = p95 if base is None else min(p95, 0.9 * base + 0.1 * p95)
+            if error_rate > self.max_error_rate:
+                self._set_limit(self._limit * self.backoff, f"error rate {error_rate:.0%}")
+                self._last_decrease = now
+            elif base is not None and p95 > base * self.latency_tolerance:
+                self._set_limit(self._limit * self.backoff, f"p95 {p95 * 1000:.0f}ms vs {base * 1000:.0f}ms")
+                self._last_decrease = now
+            elif self._saturated:
+                self._set_limit(self._limit + self.increase, f"p95 {p95 * 1000:.0f}ms healthy")
+            self._saturated = False
+
+    def _set_limit(self, value: float, reason: str):
+        old = int(self._limit)
+        value = min(max(value, float(self.min_limit)), float(self.max_limit))
+        now = time.monotonic()
+        self._limit_seconds += old * (now - self._limit_since)
+        self._limit_since = now
+        self._limit = value
+        new = int(value)
+        if new == old:
+            return
+        if new > old:
+            self._increases += 1
+        else:
+            self._decreases += 1
+        self._low, self._high = min(self._low, new), max(self._high, new)
+        logger.info("[%s] concurrency %d -> %d (%s)", self.name, old, new, reason)
+        self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            elapsed = now - self._start
+            weighted = self._limit_seconds + int(self._limit) * (now - self._limit_since)
+            return {
+                "name": self.name,
+                "limit": int(self._limit),
+                "limit_min": self._low,
+                "limit_max": self._high,
+                "limit_mean": round(weighted / elapsed, 2) if elapsed else int(self._limit),
+                "increases": self._increases,
+                "decreases": self._decreases,
+                "requests": self._requests,
+                "errors": self._errors,
+                "throttled": self._throttled,
+                "requests_per_sec": round(self._requests / elapsed, 2) if elapsed else None,
+            }
@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+import aiohttp
+import numpy as np
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from . import polygon_json
+from .cassette import Cassette
+from .option_chain import OptionChain
+from .polygon_client import (
+    PolygonClient,
+    _RateLimiter,
+    _RequestMetrics,
+    _count_retry,
+    _retry_after_seconds,
+    _wire_bytes,
+)
+
+
+class AsyncPolygonClient:
+    """
+    Asyncio Polygon REST client for options snapshots (Enrichment-scoped).
+
+    Mirrors the read methods of PolygonClient as coroutines. Use as an
+    async context manager so the underlying aiohttp session is closed:
+
+        async with AsyncPolygonClient(api_key) as poly:
+            chain = await poly.fetch_options_chain("AAPL", max_days=45)
+    """
+
+    BASE = PolygonClient.BASE
+
+    # Response mapping is shared with the sync client.
+    _extract_underlying_price = staticmethod(PolygonClient._extract_underlying_price)
+    _extract_best_price_fields = staticmethod(PolygonClient._extract_best_price_fields)
+    _price_from_stock_snapshot = classmethod(PolygonClient._price_from_stock_snapshot.__func__)
+    _backfill_underlying_price = staticmethod(PolygonClient._backfill_underlying_price)
+    _map_options_result = PolygonClient._map_options_result
+    _map_chain_page = PolygonClient._map_chain_page
+    _map_chain_columnar = PolygonClient._map_chain_columnar
+    _chain_params = staticmethod(PolygonClient._chain_params)
+    _split_expiry_window = staticmethod(PolygonClient._split_expiry_window)
+    _split_first_page = staticmethod(PolygonClient._split_first_page)
+    today = PolygonClient.today
+
+    def __init__(
+        self,
+        api_key: str,
+        max_calls: float = 20,
+        period: float = 1.0,
+        max_connections: int = 256,
+        rate_limiter: _RateLimiter | None = None,
+        cassette: Cassette | None = None,
+        metrics: _RequestMetrics | None = None,
+        price_index: dict[str, float] | None = None,
+        base_url: str | None = None,
+    ):
+        if not api_key:
+            raise ValueError("POLYGON_API_KEY is required")
+        self.api_key = api_key.strip()
+        if base_url:
+            self.BASE = base_url.rstrip("/")
+        # Pass a sync client's rate_limiter to keep both on one budget.
+        self._rl = rate_limiter or _RateLimiter(max_calls=max_calls, period=period)
+        self.metrics = metrics or _RequestMetrics()
+        self.cassette = cassette
+        # Read-only ticker -> price (PolygonClient.build_price_index) for chain backfills
+        self.price_index = price_index
+        self._max_connections = max_connections
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "AsyncPolygonClient":
+        connector = aiohttp.TCPConnector(limit=self._max_connections)
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=30)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, url: str, params: dict | None = None, schema: str | None = None) -> dict:
+        if self.cassette is not None:
+            if self.cassette.replaying:
+                return self.cassette.replay(url, params)
+            schema = None  # cassettes keep whole payloads
+        j = await self._fetch(url, params, schema)
+        if self.cassette is not None:
+            self.cassette.record(url, params, j)
+        return j
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=1, max=8),
+        before_sleep=_count_retry,
+        reraise=True,
+    )
+    async def _fetch(self, url: str, params: dict | None = None, schema: str | None = None) -> dict:
+        if self._session is None:
+            raise RuntimeError("AsyncPolygonClient used outside 'async with'")
+        wait = self._rl.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        while (wait := self._rl.admit()) > 0:
+            await asyncio.sleep(wait)
+        params = {k: str(v) for k, v in (params or {}).items()}
+        params["apiKey"] = self.api_key
+        sent = time.monotonic()
+        start = time.perf_counter()
+        async with self._session.get(url, params=params) as r:
+            body = await r.read()
+            self.metrics.on_response(time.perf_counter() - start, r.status, _wire_bytes(r.headers, body))
+            retry_after = _retry_after_seconds(r.headers)
+            if r.status == 429 or retry_after is not None:
+                self._rl.on_throttle(retry_after, sent_at=sent)
+            if r.status >= 400:
+                logging.error(
+                    "Polygon GET %s failed: HTTP %s | body=%s",
+                    url, r.status, body.decode("utf-8", errors="replace"),
+                )
+                r.raise_for_status()
+            self._rl.on_success()
+            return polygon_json.loads(body, schema)
+
+    async def fetch_stock_snapshot(self, ticker: str) -> dict | None:
+        url = f"{self.BASE}/v2/snapshot/locale/us/markets/stocks/tickers/{ticker}"
+        try:
+            return await self._get(url)
+        except Exception as e:
+            logging.error("Stocks snapshot failed for %s: %s", ticker, e)
+            return None
+
+    async def fetch_option_contract_snapshot(
+        self, underlying_asset: str, contract_symbol: str
+    ) -> dict | None:
+        url = f"{self.BASE}/v3/snapshot/options/{underlying_asset}/{contract_symbol}"
+        try:
+            res = await self._get(url)
+            r = res.get("results")
+            if r:
+                return self._map_options_result(r)
+            return None
+        except Exception as e:
+            logging.error(
+                "Option contract snapshot failed for %s: %s", contract_symbol, e
+            )
+            return None
+
+    async def fetch_all_tickers_snapshot(self) -> list[dict]:
+        """
+        Get snapshot for ALL stock tickers in one call.
+        /v2/snapshot/locale/us/markets/stocks/tickers
+        """
+        url = f"{self.BASE}/v2/snapshot/locale/us/markets/stocks/tickers"
+        try:
+            res = await self._get(url, schema=polygon_json.SNAPSHOT)
+            return res.get("tickers") or []
+        except Exception as e:
+            logging.error("All-tickers snapshot failed: %s", e)
+            return []
+
+    async def fetch_underlying_price(self, ticker: str) -> float | None:
+        """
+        Fetch current/latest price for a ticker (for backfilling options data).
+        """
+        try:
+            return self._price_from_stock_snapshot(await self.fetch_stock_snapshot(ticker))
+        except Exception:
+            return None
+
+    async def _backfill_price(self, ticker: str) -> float | None:
+        if self.price_index is not None:
+            p = self.price_index.get(ticker)
+            if p is not None:
+                return p
+        return await self.fetch_underlying_price(ticker)
+
+    async def _page_chain(self, url: str, params: dict) -> tuple[list[dict], int]:
+        """Follow next_url cursors for one query; returns (raw results, pages)."""
+        results: list[dict] = []
+        pages = 0
+        while True:
+            j = await self._get(url, params=params, schema=polygon_json.CHAIN_PAGE)
+            pages += 1
+            results.extend(j.get("results") or [])
+            next_url = j.get("next_url")
+            if not next_url:
+                return results, pages
+            url, params = next_url, {}
+
+    async def _fetch_chain_results(self, ticker: str, max_days: int, expiry_buckets: int):
+        """
+        Same server-side DTE window and expiry-bucket split as
+        PolygonClient._fetch_chain_results, with the buckets gathered.
+        """
+        url = f"{self.BASE}/v3/snapshot/options/{ticker}"
+        today = self.today()
+        max_exp = today + timedelta(days=max_days)
+
+        first = await self._get(url, params=self._chain_params(today, max_exp), schema=polygon_json.CHAIN_PAGE)
+        raw = list(first.get("results") or [])  # the response may be shared; don't extend it
+        pages = 1
+        if first.get("next_url"):
+            split = self._split_first_page(raw) if expiry_buckets > 1 else None
+            if split is None:
+                rest, n = await self._page_chain(first["next_url"], {})
+                raw.extend(rest)
+                pages += n
+            else:
+                raw, boundary = split
+                ranges = self._split_expiry_window(boundary, max_exp, expiry_buckets)
+                parts = await asyncio.gather(
+                    *(self._page_chain(url, self._chain_params(*r)) for r in ranges)
+                )
+                for part, n in parts:
+                    raw.extend(part)
+                    pages += n
+        raw.sort(key=lambda r: (r.get("details") or {}).get("ticker") or "")
+        return raw, today, max_exp, pages
+
+    async def fetch_options_chain(
+        self,
+        ticker: str,
+        max_days: int = 90,
+        expiry_buckets: int = 4,
+        columnar: bool = False,
+    ) -> list[dict] | OptionChain:
+        """
+        Snapshot active option contracts expiring within max_days (paged),
+        in contract-symbol order. With columnar=True an OptionChain is
+        returned instead of a list of dicts.
+        """
+        start = time.perf_counter()
+        raw, today, max_exp, pages = await self._fetch_chain_results(ticker, max_days, expiry_buckets)
+
+        if columnar:
+            chain = self._map_chain_columnar(raw, today, max_exp, ticker)
+            if len(chain) and np.isnan(chain.data["underlying_price"]).any():
+                chain.fill_underlying_price(await self._backfill_price(ticker))
+            self.metrics.on_chain(time.perf_counter() - start, pages, len(chain))
+            return chain
+
+        out = self._map_chain_page(raw, today, max_exp)
+
+        # Backfill underlying price if missing
+        if out and any(o.get("underlying_price") is None for o in out):
+            self._backfill_underlying_price(out, await self._backfill_price(ticker))
+
+        self.metrics.on_chain(time.perf_counter() - start, pages, len(out))
+        return out
@@ -0,0 +1,90 @@
+"""
+Record/replay archive ("cassette") of Polygon responses for offline runs.
+
+In record mode every decoded response that passes through a client's _get
+is kept in memory and written out as one gzip-compressed JSON file by
+save(). In replay mode the client answers every GET from the archive and
+never touches the network, the rate limiter or the response cache.
+
+Besides responses, a cassette carries free-form run metadata (the scanner
+stores its universe and the trading date here) so a replay sees exactly
+the inputs of the recorded run.
+"""
+
+import gzip
+import json
+import logging
+import threading
+from datetime import date, datetime, timezone
+from urllib.parse import parse_qsl, urlsplit
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMiss(KeyError):
+    """A replayed GET that was never recorded."""
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str = RECORD):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.meta: dict = {}
+        self._responses: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if mode == REPLAY:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                doc = json.load(f)
+            self.meta = doc.get("meta") or {}
+            self._responses = doc.get("responses") or {}
+            logging.info(
+                "Loaded cassette %s: %d responses recorded %s",
+                path, len(self._responses), self.meta.get("recorded_at"),
+            )
+        else:
+            self.meta["as_of"] = date.today().isoformat()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @property
+    def as_of(self) -> date:
+        """Trading date of the recorded run."""
+        return date.fromisoformat(self.meta["as_of"])
+
+    @staticmethod
+    def key(url: str, params: dict | None = None) -> str:
+        """Host-independent request key: path + sorted query, API key dropped."""
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query) if k != "apiKey"]
+        query += [(k, str(v)) for k, v in (params or {}).items() if k != "apiKey"]
+        qs = "&".join(f"{k}={v}" for k, v in sorted(query))
+        return f"{parts.path}?{qs}" if qs else parts.path
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def record(self, url: str, params: dict | None, payload: dict):
+        with self._lock:
+            self._responses[self.key(url, params)] = payload
+
+    def replay(self, url: str, params: dict | None = None) -> dict:
+        k = self.key(url, params)
+        try:
+            return self._responses[k]
+        except KeyError:
+            raise CassetteMiss(k) from None
+
+    def save(self):
+        if self.mode != RECORD:
+            return
+        self.meta["recorded_at"] = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            doc = {"meta": self.meta, "responses": self._responses}
+            with gzip.open(self.path, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump(doc, f, separators=(",", ":"))
+        logging.info("Saved cassette %s with %d responses.", self.path, len(self._responses))
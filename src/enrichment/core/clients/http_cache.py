@@ -0,0 +1,199 @@
+"""
+Persistent on-disk cache for Polygon GET responses.
+
+Responses are stored zlib-compressed in a single SQLite file, keyed by URL
+plus query params (API key excluded). How long an entry lives is decided
+per URL pattern:
+
+- closed historical aggregates (range end before today): never expire if
+  unadjusted (adjusted=false); a week if split/dividend adjusted, since a
+  later corporate action rewrites adjusted history
+- aggregates that include today: a few minutes
+- reference data (/v3/reference/...): hours
+- live snapshots: never cached
+
+The file is size-bounded; the least recently used entries are evicted
+once the total body size exceeds max_bytes.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+
+IMMUTABLE = math.inf
+ADJUSTED_AGGS_TTL = 7 * 24 * 3600
+
+_AGGS_RANGE = re.compile(
+    r"/v2/aggs/ticker/[^/]+/range/\d+/\w+/(?P<start>[\d-]+)/(?P<end>[\d-]+)"
+)
+
+
+def _aggs_ttl(url: str, params: dict | None = None) -> float | None:
+    m = _AGGS_RANGE.search(url)
+    if not m:
+        return None
+    end = m.group("end")
+    try:
+        # Ranges may be given as dates or as epoch-ms timestamps.
+        end_day = date.fromtimestamp(int(end) / 1000) if end.isdigit() else date.fromisoformat(end)
+    except (ValueError, OverflowError, OSError):
+        return None
+    if end_day >= date.today():
+        return 15 * 60
+    # Polygon adjusts for splits unless told otherwise.
+    adjusted = str((params or {}).get("adjusted", "true")).lower() != "false"
+    return ADJUSTED_AGGS_TTL if adjusted else IMMUTABLE
+
+
+# (pattern, ttl) pairs, first match wins. ttl is seconds, IMMUTABLE, None
+# (do not cache) or a callable (url, params) -> one of those.
+DEFAULT_POLICIES = [
+    (re.compile(r"/v\d/snapshot/"), None),
+    (re.compile(r"/v2/aggs/ticker/"), _aggs_ttl),
+    (re.compile(r"/v3/reference/"), 6 * 3600),
+]
+
+
+class ResponseCache:
+    """SQLite-backed, size-bounded LRU cache of decoded JSON responses."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        policies: list | None = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.policies = policies if policies is not None else DEFAULT_POLICIES
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)"
+        )
+        self._size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def ttl_for(self, url: str, params: dict | None = None) -> float | None:
+        for pattern, ttl in self.policies:
+            if pattern.search(url):
+                return ttl(url, params) if callable(ttl) else ttl
+        return None
+
+    @staticmethod
+    def _key(url: str, params: dict | None) -> str:
+        items = sorted((k, str(v)) for k, v in (params or {}).items() if k != "apiKey")
+        return hashlib.sha256(f"{url}?{items}".encode()).hexdigest()
+
+    def get(self, url: str, params: dict | None = None) -> dict | None:
+        if not self.ttl_for(url, params):
+            self.bypassed += 1
+            return None
+        key = self._key(url, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, url: str, params: dict | None, payload: dict):
+        ttl = self.ttl_for(url, params)
+        if not ttl:
+            return
+        body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl != IMMUTABLE else IMMUTABLE
+        key = self._key(url, params)
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, body, len(body), expires_at, now),
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self.stores += 1
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop expired rows, then LRU rows until under max_bytes. Lock held."""
+        now = time.time()
+        cur = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self.evictions += max(cur.rowcount, 0)
+        self._size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        excess = self._size - self.max_bytes
+        if excess <= 0:
+            return
+        freed, victims = 0, []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._size -= freed
+        self.evictions += len(victims)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "size_bytes": self._size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+        logging.info("Polygon response cache closed: %s", self.stats())
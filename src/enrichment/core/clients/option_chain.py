@@ -0,0 +1,163 @@
+"""
+Columnar option-chain representation.
+
+An OptionChain keeps one contiguous NumPy structured array (one row per
+contract) plus a parallel array of contract symbols. Rows are ordered
+calls first, then puts, each side in fetch order, so `chain.calls` and
+`chain.puts` are zero-copy slices of the same buffer.
+
+Missing numeric fields are NaN; a missing or unparseable expiration is
+stored as ordinal -1. to_records() reproduces the dicts built by
+PolygonClient._map_options_result.
+
+Chains pickle as two flat buffers (the structured array and the symbols
+as fixed-width ASCII), so shipping one to a worker process costs a
+couple of memcpys rather than a per-contract object walk.
+"""
+
+from datetime import date
+
+import numpy as np
+
+CHAIN_DTYPE = np.dtype(
+    [
+        ("strike", "f8"),
+        ("bid", "f8"),
+        ("ask", "f8"),
+        ("last_price", "f8"),
+        ("volume", "f8"),
+        ("open_interest", "f8"),
+        ("implied_volatility", "f8"),
+        ("delta", "f8"),
+        ("gamma", "f8"),
+        ("theta", "f8"),
+        ("vega", "f8"),
+        ("underlying_price", "f8"),
+        ("expiry", "i4"),  # date.toordinal(), -1 if missing
+        ("is_call", "?"),
+    ]
+)
+
+_FLOAT_FIELDS = [n for n in CHAIN_DTYPE.names if CHAIN_DTYPE[n].kind == "f"]
+_NO_EXPIRY = -1
+
+
+def _num(v) -> float:
+    return float(v) if isinstance(v, (int, float)) else np.nan
+
+
+def _rebuild(data: np.ndarray, symbols: np.ndarray, n_calls: int, ticker: str | None) -> "OptionChain":
+    if symbols.dtype.kind in "SU":
+        symbols = symbols.astype(str).astype(object)
+    return OptionChain(data, symbols, n_calls, ticker)
+
+
+def _expiry_ordinal(v) -> int:
+    if not v:
+        return _NO_EXPIRY
+    try:
+        return date.fromisoformat(str(v)[:10]).toordinal()
+    except (ValueError, TypeError):
+        return _NO_EXPIRY
+
+
+class OptionChain:
+    """One underlying's option chain as contiguous arrays."""
+
+    __slots__ = ("ticker", "data", "symbols", "n_calls")
+
+    def __init__(self, data: np.ndarray, symbols: np.ndarray, n_calls: int, ticker: str | None = None):
+        self.ticker = ticker
+        self.data = data
+        self.symbols = symbols
+        self.n_calls = int(n_calls)
+
+    @classmethod
+    def empty(cls, ticker: str | None = None) -> "OptionChain":
+        return cls(np.empty(0, dtype=CHAIN_DTYPE), np.empty(0, dtype=object), 0, ticker)
+
+    @classmethod
+    def from_columns(cls, columns: dict, symbols: list, option_types: list, ticker: str | None = None) -> "OptionChain":
+        """
+        Build from per-field Python lists. Contracts that are neither call
+        nor put are dropped; calls are moved ahead of puts (stable).
+        """
+        kinds = np.array([t == "call" for t in option_types], dtype=bool)
+        keep = kinds | np.array([t == "put" for t in option_types], dtype=bool)
+        order = np.flatnonzero(keep)
+        order = order[np.argsort(~kinds[order], kind="stable")]
+
+        data = np.empty(len(order), dtype=CHAIN_DTYPE)
+        for name in _FLOAT_FIELDS:
+            data[name] = np.asarray(columns[name], dtype="f8")[order]
+        data["expiry"] = np.asarray(columns["expiry"], dtype="i4")[order]
+        data["is_call"] = kinds[order]
+        syms = np.empty(len(symbols), dtype=object)
+        syms[:] = symbols
+        return cls(data, syms[order], int(kinds[order].sum()), ticker)
+
+    @classmethod
+    def from_records(cls, records: list[dict], ticker: str | None = None) -> "OptionChain":
+        """Build from _map_options_result-style dicts."""
+        columns = {name: [_num(r.get(name)) for r in records] for name in _FLOAT_FIELDS}
+        columns["expiry"] = [_expiry_ordinal(r.get("expiration_date")) for r in records]
+        return cls.from_columns(
+            columns,
+            [r.get("contract_symbol") for r in records],
+            [r.get("option_type") for r in records],
+            ticker,
+        )
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __reduce__(self):
+        symbols = self.symbols
+        if len(symbols) and all(isinstance(s, str) for s in symbols):
+            try:
+                symbols = symbols.astype("S")  # OCC symbols are ASCII
+            except UnicodeEncodeError:
+                symbols = symbols.astype(str)
+        return _rebuild, (self.data, symbols, self.n_calls, self.ticker)
+
+    def _side(self, sl: slice) -> "OptionChain":
+        data = self.data[sl]
+        n_calls = int(data["is_call"].sum())
+        return OptionChain(data, self.symbols[sl], n_calls, self.ticker)
+
+    @property
+    def calls(self) -> "OptionChain":
+        """Zero-copy view of the call rows."""
+        return self._side(slice(0, self.n_calls))
+
+    @property
+    def puts(self) -> "OptionChain":
+        """Zero-copy view of the put rows."""
+        return self._side(slice(self.n_calls, None))
+
+    def expiration_date(self, i: int) -> str | None:
+        o = int(self.data["expiry"][i])
+        return date.fromordinal(o).isoformat() if o != _NO_EXPIRY else None
+
+    def fill_underlying_price(self, price: float | None):
+        if isinstance(price, (int, float)):
+            col = self.data["underlying_price"]
+            col[np.isnan(col)] = float(price)
+
+    def to_records(self) -> list[dict]:
+        """
+        Expand back to _map_options_result-style dicts (calls first).
+        Numeric fields come back as floats, missing ones as None.
+        """
+        out = []
+        for i, row in enumerate(self.data):
+            rec = {
+                "contract_symbol": self.symbols[i],
+                "option_type": "call" if row["is_call"] else "put",
+                "expiration_date": self.expiration_date(i),
+            }
+            for name in _FLOAT_FIELDS:
+                v = float(row[name])
+                rec[name] = None if np.isnan(v) else v
+            out.append(rec)
+        return out
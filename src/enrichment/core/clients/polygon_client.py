@@ -1,54 +1,411 @@
 import logging
+import re
+import sys
+import threading
 import time
-from datetime import date
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import numpy as np
 import requests
 from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from . import polygon_json
+from .cassette import Cassette
+from .http_cache import ResponseCache
+from .option_chain import OptionChain, _expiry_ordinal, _num
+
+
+def _retry_after_seconds(headers) -> float | None:
+    """Parse a Retry-After header (delta-seconds form only)."""
+    v = (headers or {}).get("Retry-After")
+    if v is None:
+        return None
+    try:
+        return max(float(v), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _wire_bytes(headers, body: bytes) -> int:
+    """Bytes on the wire: Content-Length for an encoded body, else its size."""
+    headers = headers or {}
+    if headers.get("Content-Encoding"):
+        try:
+            return int(headers["Content-Length"])
+        except (KeyError, TypeError, ValueError):
+            pass
+    return len(body)
+
+
 class _RateLimiter:
-    def __init__(self, max_calls: int, period: float):
+    """
+    Thread-safe GCRA limiter shared by every caller of one client.
+
+    reserve() books the next conformance slot under the lock and returns
+    how long the caller must wait; the sleep happens outside the lock so
+    callers queue in reservation order. There is no burst allowance:
+    requests are spaced period / max_calls apart. A caller that wakes late
+    could still land closer to the next one than that, so admit() then
+    checks the actual send times of the last max_calls requests and holds
+    the caller until no window of length `period` exceeds max_calls (the
+    old sliding window's bound).
+
+    A 429 / Retry-After pauses admission for the advertised window (callers
+    that reserved earlier are held in admit() and rebooked after it) and
+    halves the rate, once per throttle episode: only a request sent after
+    the last cut can cut again, so a wave of 429s from requests already in
+    flight counts once. Each success grows the rate back additively.
+    """
+
+    def __init__(
+        self,
+        max_calls: float,
+        period: float,
+        min_rate_frac: float = 0.1,
+        recovery_frac: float = 0.02,
+    ):
         self.max_calls, self.period = max_calls, period
-        self._ts = []
+        self._max_rate = max_calls / period
+        self._min_rate = self._max_rate * min_rate_frac
+        self._step = self._max_rate * recovery_frac
+        self._rate = self._max_rate
+        self._tat = 0.0  # theoretical arrival time of the next request
+        self._sent: deque = deque(maxlen=max(1, int(max_calls)))  # actual admission times
+        self._last_cut = float("-inf")
+        self._paused_until = 0.0  # Retry-After: nothing is sent before this
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.throttled = 0
+        self.waited_ms = 0.0
+        self.backoffs = 0
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            wait = tat - now
+            self._tat = tat + 1.0 / self._rate
+            self.admitted += 1
+            if wait > 0:
+                self.throttled += 1
+                self.waited_ms += wait * 1000
+            return wait
+
+    def admit(self) -> float:
+        """Record a send now, or return how much longer the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                # Reserved before the 429: take a fresh slot after the pause.
+                tat = max(self._tat, self._paused_until)
+                self._tat = tat + 1.0 / self._rate
+                wait = tat - now
+                self.waited_ms += wait * 1000
+                return wait
+            if len(self._sent) == self._sent.maxlen and now - self._sent[0] < self.period:
+                wait = self._sent[0] + self.period - now
+                self.waited_ms += wait * 1000
+                return wait
+            self._sent.append(now)
+            return 0.0
 
     def acquire(self):
-        now = time.time()
-        self._ts = [t for t in self._ts if now - t < self.period]
-        if len(self._ts) >= self.max_calls:
-            sleep_for = (self._ts[0] + self.period) - now
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-        self._ts.append(time.time())
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        while (wait := self.admit()) > 0:
+            time.sleep(wait)
+
+    def on_throttle(self, retry_after: float | None = None, sent_at: float | None = None):
+        """`sent_at`: time.monotonic() when the throttled request was sent."""
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self._tat = max(self._tat, self._paused_until)
+            if sent_at is not None and sent_at < self._last_cut:
+                return  # same episode as the last cut
+            self._rate = max(self._min_rate, self._rate / 2)
+            self._last_cut = now
+            self.backoffs += 1
+        logging.warning(
+            "Polygon throttled (retry_after=%s); rate now %.1f/s", retry_after, self._rate
+        )
+
+    def on_success(self):
+        if self._rate >= self._max_rate:
+            return
+        with self._lock:
+            self._rate = min(self._max_rate, self._rate + self._step)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "admitted": self.admitted,
+                "throttled": self.throttled,
+                "waited_ms": round(self.waited_ms, 1),
+                "backoffs": self.backoffs,
+                "rate_per_sec": round(self._rate, 2),
+                "max_rate_per_sec": round(self._max_rate, 2),
+            }
+
+def _percentiles(values: list[float], ps=(50, 95, 99)) -> dict:
+    """Nearest-rank percentiles, e.g. {"p50": .., "p95": .., "p99": ..}."""
+    if not values:
+        return {f"p{p}": None for p in ps}
+    v = sorted(values)
+    return {f"p{p}": round(v[min(len(v) - 1, max(0, -(-p * len(v) // 100) - 1))], 1) for p in ps}
+
+
+class _RequestMetrics:
+    """
+    Per-run request counters shared by a client and its async sibling:
+    HTTP latency, bytes on the wire, retries, 429s, and per-chain fetch
+    latency / page count / contract count.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.response_bytes = 0
+        self._latency_ms: list[float] = []
+        self._chain_ms: list[float] = []
+        self._chain_pages: list[int] = []
+        self.contracts = 0
+        self.coalesced = 0
+        self.memo_hits = 0
+
+    def on_response(self, seconds: float, status: int, nbytes: int):
+        with self._lock:
+            self.requests += 1
+            self._latency_ms.append(seconds * 1000)
+            self.response_bytes += nbytes
+            if status == 429:
+                self.throttled += 1
+            if status >= 400:
+                self.errors += 1
+
+    def on_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def on_dedup(self, memo_hit: bool):
+        with self._lock:
+            if memo_hit:
+                self.memo_hits += 1
+            else:
+                self.coalesced += 1
+
+    def on_chain(self, seconds: float, pages: int, contracts: int):
+        with self._lock:
+            self._chain_ms.append(seconds * 1000)
+            self._chain_pages.append(pages)
+            self.contracts += contracts
+
+    def stats(self) -> dict:
+        with self._lock:
+            pages = self._chain_pages
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "throttled_429": self.throttled,
+                "response_bytes": self.response_bytes,
+                "request_latency_ms": _percentiles(self._latency_ms),
+                "chains": len(self._chain_ms),
+                "chain_fetch_ms": _percentiles(self._chain_ms),
+                "pages_per_chain": {
+                    "mean": round(sum(pages) / len(pages), 2) if pages else None,
+                    "max": max(pages) if pages else None,
+                },
+                "contracts": self.contracts,
+                "coalesced": self.coalesced,
+                "memo_hits": self.memo_hits,
+            }
+
+
+class _Flight:
+    """One in-flight GET that identical concurrent GETs wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+# Most symbols /v3/snapshot accepts in one ticker.any_of (its page limit).
+SNAPSHOT_BATCH_SIZE = 250
+
+# Small per-ticker / per-contract resources worth keeping for the whole run.
+# Chain pages and the all-tickers snapshot are big and asked for once.
+MEMO_ROUTES = [
+    re.compile(r"/v2/snapshot/locale/us/markets/stocks/tickers/[^/]+$"),
+    re.compile(r"/v3/snapshot/options/[^/]+/[^/]+$"),
+    re.compile(r"/v3/reference/tickers/[^/]+$"),
+]
+
+
+def _count_retry(retry_state):
+    """tenacity before_sleep hook: args[0] is the client."""
+    retry_state.args[0].metrics.on_retry()
+
 
 class PolygonClient:
     """
     Polygon REST client for options snapshots (Enrichment-scoped).
+
+    Identical GETs (same path and query) in flight at the same time share
+    one request (single-flight). Successful responses on MEMO_ROUTES are
+    also memoized for the client's lifetime, i.e. one run; invalidate()
+    drops them. Responses may be shared between callers, so treat them
+    as read-only. metrics.stats() reports "coalesced" and "memo_hits":
+    the GETs each layer saved.
     """
 
     BASE = "https://api.polygon.io"
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        max_calls: float = 20,
+        period: float = 1.0,
+        cache: ResponseCache | None = None,
+        cassette: Cassette | None = None,
+        memo_routes: list | None = None,
+        base_url: str | None = None,
+    ):
         if not api_key:
             raise ValueError("POLYGON_API_KEY is required")
         self.api_key = api_key.strip()
-        self._rl = _RateLimiter(max_calls=20, period=1.0)
+        if base_url:
+            self.BASE = base_url.rstrip("/")  # e.g. a local stand-in (benchmarks/fake_polygon.py)
+        self._rl = _RateLimiter(max_calls=max_calls, period=period)
+        self.memo_routes = MEMO_ROUTES if memo_routes is None else memo_routes
+        self._flight_lock = threading.Lock()
+        self._in_flight: dict[tuple, _Flight] = {}
+        self._memo: dict[tuple, dict] = {}
+        self.metrics = _RequestMetrics()
+        # Optional AdaptiveConcurrency fed every HTTP response (set by fan-out callers)
+        self.concurrency = None
+        # Optional ticker -> price from the all-tickers snapshot (build_price_index);
+        # chain fetches backfill underlying_price from it without a request.
+        self.price_index: dict[str, float] | None = None
+        self.cache = cache
+        self.cassette = cassette
         self._session = requests.Session()
         adapter = HTTPAdapter(pool_connections=100, pool_maxsize=100)
         self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @property
+    def rate_limiter(self) -> _RateLimiter:
+        """The limiter shared by every _get caller (and any async sibling)."""
+        return self._rl
+
+    def today(self) -> date:
+        """Trading date for DTE windows (the recorded date when replaying)."""
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.as_of
+        return date.today()
+
+    def _get(self, url: str, params: dict | None = None, schema: str | None = None) -> dict:
+        """GET a decoded response; `schema` (polygon_json) trims it to the fields we read."""
+        if self.cassette is not None:
+            if self.cassette.replaying:
+                return self.cassette.replay(url, params)
+            schema = None  # cassettes keep whole payloads
+        key = (Cassette.key(url, params), schema)
+        memo = any(p.search(key[0].partition("?")[0]) for p in self.memo_routes)
+        with self._flight_lock:
+            if memo and key in self._memo:
+                self.metrics.on_dedup(memo_hit=True)
+                return self._memo[key]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+        if not leader:
+            self.metrics.on_dedup(memo_hit=False)
+            return flight.wait()
+        try:
+            flight.result = self._load(url, params, schema)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flight_lock:
+                del self._in_flight[key]
+                if memo and flight.error is None:
+                    self._memo[key] = flight.result
+            flight.done.set()
+        return flight.result
+
+    def invalidate(self, route: str | None = None) -> int:
+        """Drop memoized responses whose path starts with `route` (all if None); returns how many."""
+        with self._flight_lock:
+            keys = [k for k in self._memo if route is None or k[0].startswith(route)]
+            for k in keys:
+                del self._memo[k]
+        return len(keys)
+
+    def _load(self, url: str, params: dict | None, schema: str | None) -> dict:
+        """Response cache, then the network; records to the cassette."""
+        if self.cache is None:
+            j = self._fetch(url, params, schema)
+        else:
+            j = self.cache.get(url, params)
+            if j is None:
+                j = self._fetch(url, params, schema)
+                self.cache.put(url, params, j)
+        if self.cassette is not None:
+            self.cassette.record(url, params, j)
+        return j
 
     @retry(
-        stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8), reraise=True
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=1, max=8),
+        before_sleep=_count_retry,
+        reraise=True,
     )
-    def _get(self, url: str, params: dict | None = None) -> dict:
+    def _fetch(self, url: str, params: dict | None = None, schema: str | None = None) -> dict:
         self._rl.acquire()
         params = dict(params or {})
         params["apiKey"] = self.api_key
         try:
-            r = self._session.get(url, params=params, timeout=30)
+            sent = time.monotonic()
+            start = time.perf_counter()
+            try:
+                r = self._session.get(url, params=params, timeout=30)
+            except requests.Timeout:
+                if self.concurrency is not None:
+                    self.concurrency.observe(time.perf_counter() - start, status=0, timeout=True)
+                raise
+            elapsed = time.perf_counter() - start
+            self.metrics.on_response(elapsed, r.status_code, _wire_bytes(r.headers, r.content))
+            if self.concurrency is not None:
+                self.concurrency.observe(elapsed, r.status_code)
+            retry_after = _retry_after_seconds(r.headers)
+            if r.status_code == 429 or retry_after is not None:
+                self._rl.on_throttle(retry_after, sent_at=sent)
             r.raise_for_status()
         except requests.HTTPError as e:
             logging.error("Polygon GET %s failed: %s | body=%s", url, e, r.text)
             raise
-        return r.json()
+        self._rl.on_success()
+        return polygon_json.loads(r.content, schema)
 
     @staticmethod
     def _extract_underlying_price(und: dict) -> float | None:
@@ -142,6 +499,87 @@ class PolygonClient:
             )
             return None
 
+    def _map_universal_option(self, r: dict) -> dict | None:
+        """
+        Map one /v3/snapshot result like _map_options_result. The universal
+        snapshot puts the contract symbol at the top level and the day bar
+        under `session`; per-ticker failures come back as {"ticker", "error"}.
+        """
+        if r.get("error") or r.get("type", "options") != "options":
+            return None
+        details = r.get("details") or {}
+        if not details.get("ticker"):
+            details = {**details, "ticker": r.get("ticker")}
+        return self._map_options_result({**r, "details": details, "day": r.get("day") or r.get("session") or {}})
+
+    def _fetch_universal_snapshot(self, symbols: list[str]) -> dict[str, dict]:
+        url = f"{self.BASE}/v3/snapshot"
+        params = {"ticker.any_of": ",".join(symbols), "limit": SNAPSHOT_BATCH_SIZE}
+        out: dict[str, dict] = {}
+        while url:
+            j = self._get(url, params=params)
+            for r in j.get("results") or []:
+                rec = self._map_universal_option(r)
+                if rec is not None and rec["contract_symbol"]:
+                    out[rec["contract_symbol"]] = rec
+            url, params = j.get("next_url"), None
+        return out
+
+    def fetch_option_contract_snapshots(
+        self, contract_symbols: list[str], max_workers: int = 8
+    ) -> dict[str, dict]:
+        """
+        Batch fetch_option_contract_snapshot: contract symbol -> mapped
+        record, from /v3/snapshot?ticker.any_of=... in groups of up to
+        SNAPSHOT_BATCH_SIZE symbols, fetched concurrently. Symbols Polygon
+        does not know, and those of a group whose request failed, are left
+        out.
+        """
+        symbols = list(dict.fromkeys(s for s in contract_symbols if s))
+        groups = [symbols[i:i + SNAPSHOT_BATCH_SIZE] for i in range(0, len(symbols), SNAPSHOT_BATCH_SIZE)]
+        if not groups:
+            return {}
+
+        def _one(group: list[str]) -> dict[str, dict]:
+            try:
+                return self._fetch_universal_snapshot(group)
+            except Exception as e:
+                logging.error(
+                    "Option contract snapshots failed for %d symbols (%s..): %s", len(group), group[0], e
+                )
+                return {}
+
+        out: dict[str, dict] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as pool:
+            for part in pool.map(_one, groups):
+                out.update(part)
+        return out
+
+    def fetch_aggs(
+        self,
+        ticker: str,
+        start: date,
+        end: date,
+        timespan: str = "day",
+        multiplier: int = 1,
+        adjusted: bool = True,
+    ) -> list[dict]:
+        """
+        Aggregate bars for [start, end], served from the response cache when
+        enabled: ranges that closed before today are kept for a week when
+        adjusted (a later split rewrites them) and for good when not.
+        """
+        url = (
+            f"{self.BASE}/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/"
+            f"{start.isoformat()}/{end.isoformat()}"
+        )
+        params = {"adjusted": "true" if adjusted else "false", "sort": "asc", "limit": 50000}
+        try:
+            return self._get(url, params=params).get("results") or []
+        except Exception as e:
+            logging.error("Aggs fetch failed for %s: %s", ticker, e)
+            return []
+
     def fetch_all_tickers_snapshot(self) -> list[dict]:
         """
         Get snapshot for ALL stock tickers in one call.
@@ -149,72 +587,246 @@ class PolygonClient:
         """
         url = f"{self.BASE}/v2/snapshot/locale/us/markets/stocks/tickers"
         try:
-            res = self._get(url)
+            res = self._get(url, schema=polygon_json.SNAPSHOT)
             return res.get("tickers") or []
         except Exception as e:
             logging.error("All-tickers snapshot failed: %s", e)
             return []
 
+    @classmethod
+    def _price_from_stock_snapshot(cls, snap: dict | None) -> float | None:
+        if not snap:
+            return None
+        t = snap.get("ticker") or {}
+        # 1. lastTrade.p
+        lt = t.get("lastTrade") or {}
+        p = lt.get("p")
+        if p is not None: return float(p)
+        # 2. day.c
+        day = t.get("day") or {}
+        c = day.get("c")
+        if c is not None: return float(c)
+        # 3. prevDay.c
+        pd = t.get("prevDay") or {}
+        pc = pd.get("c")
+        if pc is not None: return float(pc)
+
+        return cls._extract_underlying_price(t)
+
+    @classmethod
+    def build_price_index(cls, snapshot: list[dict]) -> dict[str, float]:
+        """
+        Ticker -> price for every item of fetch_all_tickers_snapshot(),
+        picked like fetch_underlying_price (lastTrade, day close, prevDay
+        close). Keys are interned; the dict is read-only once built.
+        """
+        out: dict[str, float] = {}
+        for item in snapshot:
+            ticker = item.get("ticker")
+            if not ticker:
+                continue
+            try:
+                p = cls._price_from_stock_snapshot({"ticker": item})
+            except (TypeError, ValueError):
+                continue
+            if p is not None:
+                out[sys.intern(ticker)] = p
+        return out
+
     def fetch_underlying_price(self, ticker: str) -> float | None:
         """
         Fetch current/latest price for a ticker (for backfilling options data).
         """
         try:
-            snap = self.fetch_stock_snapshot(ticker)
-            if not snap:
-                return None
-            t = snap.get("ticker") or {}
-            # 1. lastTrade.p
-            lt = t.get("lastTrade") or {}
-            p = lt.get("p")
-            if p is not None: return float(p)
-            # 2. day.c
-            day = t.get("day") or {}
-            c = day.get("c")
-            if c is not None: return float(c)
-            # 3. prevDay.c
-            pd = t.get("prevDay") or {}
-            pc = pd.get("c")
-            if pc is not None: return float(pc)
-            
-            return self._extract_underlying_price(t)
+            return self._price_from_stock_snapshot(self.fetch_stock_snapshot(ticker))
         except Exception:
             return None
 
-    def fetch_options_chain(self, ticker: str, max_days: int = 90) -> list[dict]:
-        """
-        Snapshot all active option contracts for an underlying (paged).
-        """
-        from datetime import timedelta
+    def _backfill_price(self, ticker: str) -> float | None:
+        """Price for backfilling a chain: the price index if it has one, else a snapshot call."""
+        if self.price_index is not None:
+            p = self.price_index.get(ticker)
+            if p is not None:
+                return p
+        return self.fetch_underlying_price(ticker)
 
-        url = f"{self.BASE}/v3/snapshot/options/{ticker}"
-        params = {"limit": 250}
+    def _map_chain_page(self, results: list[dict], today: date, max_exp: date) -> list[dict]:
+        """Map one chain page, dropping contracts outside [today, max_exp]."""
         out: list[dict] = []
-        today = date.today()
-        max_exp = today + timedelta(days=max_days)
-
-        while True:
-            j = self._get(url, params=params)
-            for r in j.get("results") or []:
-                exp = (r.get("details") or {}).get("expiration_date")
-                try:
-                    if exp and not (today <= date.fromisoformat(exp) <= max_exp):
-                        continue
-                except Exception:
+        for r in results:
+            exp = (r.get("details") or {}).get("expiration_date")
+            try:
+                if exp and not (today <= date.fromisoformat(exp) <= max_exp):
                     continue
-                out.append(self._map_options_result(r))
+            except Exception:
+                continue
+            out.append(self._map_options_result(r))
+        return out
+
+    @staticmethod
+    def _backfill_underlying_price(out: list[dict], upx: float | None) -> None:
+        if isinstance(upx, (int, float)):
+            for o in out:
+                if o.get("underlying_price") is None:
+                    o["underlying_price"] = float(upx)
 
+    @staticmethod
+    def _chain_params(first: date, last: date) -> dict:
+        """Server-side DTE window, earliest expirations first."""
+        return {
+            "expiration_date.gte": first.isoformat(),
+            "expiration_date.lte": last.isoformat(),
+            "sort": "expiration_date",
+            "order": "asc",
+            "limit": 250,
+        }
+
+    @staticmethod
+    def _split_expiry_window(first: date, last: date, n: int) -> list[tuple[date, date]]:
+        """Split [first, last] into up to n contiguous, non-overlapping date ranges."""
+        days = (last - first).days + 1
+        n = max(1, min(n, days))
+        bounds = [first + timedelta(days=days * i // n) for i in range(n + 1)]
+        return [(bounds[i], bounds[i + 1] - timedelta(days=1)) for i in range(n)]
+
+    @staticmethod
+    def _split_first_page(results: list[dict]) -> tuple[list[dict], date] | None:
+        """
+        Page 1 of an expiration-sorted chain is complete for every expiration
+        before its last one; that last expiration may continue on page 2.
+        Returns (complete contracts, last expiration) or None if unparseable.
+        """
+        exps = [(r.get("details") or {}).get("expiration_date") for r in results]
+        boundary = max((e for e in exps if e), default=None)
+        try:
+            boundary_date = date.fromisoformat(boundary) if boundary else None
+        except ValueError:
+            boundary_date = None
+        if boundary_date is None:
+            return None
+        complete = [r for r, e in zip(results, exps) if not e or e < boundary]
+        return complete, boundary_date
+
+    def _page_chain(self, url: str, params: dict) -> tuple[list[dict], int]:
+        """Follow next_url cursors for one query; returns (raw results, pages)."""
+        results: list[dict] = []
+        pages = 0
+        while True:
+            j = self._get(url, params=params, schema=polygon_json.CHAIN_PAGE)
+            pages += 1
+            results.extend(j.get("results") or [])
             next_url = j.get("next_url")
             if not next_url:
-                break
+                return results, pages
             url, params = next_url, {}
 
+    def _map_chain_columnar(
+        self, results: list[dict], today: date, max_exp: date, ticker: str | None = None
+    ) -> OptionChain:
+        """
+        Same filtering and field extraction as _map_chain_page, written
+        straight into columns without building a dict per contract.
+        """
+        cols: dict[str, list] = {name: [] for name in (
+            "strike", "bid", "ask", "last_price", "volume", "open_interest",
+            "implied_volatility", "delta", "gamma", "theta", "vega",
+            "underlying_price", "expiry",
+        )}
+        symbols: list = []
+        types: list = []
+        today_o, max_o = today.toordinal(), max_exp.toordinal()
+        for r in results:
+            details = r.get("details") or {}
+            exp = details.get("expiration_date")
+            exp_o = _expiry_ordinal(exp)
+            if exp and not (today_o <= exp_o <= max_o):
+                continue
+            greeks = r.get("greeks") or {}
+            day = r.get("day") or {}
+            last_price, bid, ask = self._extract_best_price_fields(r)
+            symbols.append(details.get("ticker"))
+            types.append((details.get("contract_type") or "").lower())
+            cols["strike"].append(_num(details.get("strike_price")))
+            cols["bid"].append(_num(bid))
+            cols["ask"].append(_num(ask))
+            cols["last_price"].append(_num(last_price))
+            cols["volume"].append(_num(r.get("volume", day.get("volume"))))
+            cols["open_interest"].append(_num(r.get("open_interest")))
+            cols["implied_volatility"].append(_num(r.get("implied_volatility")))
+            cols["delta"].append(_num(greeks.get("delta")))
+            cols["gamma"].append(_num(greeks.get("gamma")))
+            cols["theta"].append(_num(greeks.get("theta")))
+            cols["vega"].append(_num(greeks.get("vega")))
+            cols["underlying_price"].append(
+                _num(self._extract_underlying_price(r.get("underlying_asset") or {}))
+            )
+            cols["expiry"].append(exp_o)
+        return OptionChain.from_columns(cols, symbols, types, ticker)
+
+    def _fetch_chain_results(self, ticker: str, max_days: int, expiry_buckets: int):
+        """
+        Raw chain results within the DTE window, plus (today, max_exp) and
+        the number of pages fetched.
+
+        The DTE window is filtered server-side. Cursors are strictly
+        sequential, so when the first page shows the chain is large the
+        rest of the window is split into `expiry_buckets` expiration
+        ranges that are paged concurrently.
+        """
+        url = f"{self.BASE}/v3/snapshot/options/{ticker}"
+        today = self.today()
+        max_exp = today + timedelta(days=max_days)
+
+        first = self._get(url, params=self._chain_params(today, max_exp), schema=polygon_json.CHAIN_PAGE)
+        raw = list(first.get("results") or [])  # the response may be shared; don't extend it
+        pages = 1
+        if first.get("next_url"):
+            split = self._split_first_page(raw) if expiry_buckets > 1 else None
+            if split is None:
+                rest, n = self._page_chain(first["next_url"], {})
+                raw.extend(rest)
+                pages += n
+            else:
+                raw, boundary = split
+                ranges = self._split_expiry_window(boundary, max_exp, expiry_buckets)
+                with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                    parts = pool.map(
+                        lambda r: self._page_chain(url, self._chain_params(*r)), ranges
+                    )
+                    for part, n in parts:
+                        raw.extend(part)
+                        pages += n
+        # Canonical order, independent of how the pages were fetched.
+        raw.sort(key=lambda r: (r.get("details") or {}).get("ticker") or "")
+        return raw, today, max_exp, pages
+
+    def fetch_options_chain(
+        self,
+        ticker: str,
+        max_days: int = 90,
+        expiry_buckets: int = 4,
+        columnar: bool = False,
+    ) -> list[dict] | OptionChain:
+        """
+        Snapshot active option contracts expiring within max_days (paged),
+        in contract-symbol order. With columnar=True an OptionChain is
+        returned instead of a list of dicts.
+        """
+        start = time.perf_counter()
+        raw, today, max_exp, pages = self._fetch_chain_results(ticker, max_days, expiry_buckets)
+
+        if columnar:
+            chain = self._map_chain_columnar(raw, today, max_exp, ticker)
+            if len(chain) and np.isnan(chain.data["underlying_price"]).any():
+                chain.fill_underlying_price(self._backfill_price(ticker))
+            self.metrics.on_chain(time.perf_counter() - start, pages, len(chain))
+            return chain
+
+        out = self._map_chain_page(raw, today, max_exp)
+
         # Backfill underlying price if missing
         if out and any(o.get("underlying_price") is None for o in out):
-            upx = self.fetch_underlying_price(ticker)
-            if isinstance(upx, (int, float)):
-                for o in out:
-                    if o.get("underlying_price") is None:
-                        o["underlying_price"] = float(upx)
+            self._backfill_underlying_price(out, self._backfill_price(ticker))
 
+        self.metrics.on_chain(time.perf_counter() - start, pages, len(out))
         return out
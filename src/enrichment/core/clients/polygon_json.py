@@ -0,0 +1,146 @@
+"""
+Fast JSON decoding for the large Polygon payloads.
+
+The all-tickers stock snapshot (~10k tickers, several MB) and options
+chain pages (250 deeply nested results each) are most of the bytes a
+scan parses, and most of each document is never read. With msgspec
+installed, those two documents are decoded against Structs that declare
+only the fields PolygonClient's mapping (_map_options_result,
+_map_chain_columnar, build_price_index) and _pass1_stock_snapshots read:
+the parser skips everything else without building it, and the result is
+handed back as plain dicts/lists holding just those keys. Keys missing
+from the payload stay missing and explicit nulls stay None, so .get()
+based mapping code sees the same values as with a full decode.
+
+Everything else (and every payload when msgspec is unavailable) is a
+full decode with orjson if installed, else the stdlib json module.
+
+Responses are negotiated gzip-compressed by both HTTP clients (requests
+and aiohttp send Accept-Encoding: gzip by default) and inflated before
+they get here.
+"""
+
+import json
+import logging
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+try:
+    import msgspec
+    from msgspec import UNSET, UnsetType
+except ImportError:  # optional
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT = "snapshot"      # /v2/snapshot/locale/us/markets/stocks/tickers
+CHAIN_PAGE = "chain_page"  # /v3/snapshot/options/{underlying} (and its next_url pages)
+
+_DECODERS: dict = {}
+
+if msgspec is not None:
+
+    class _Struct(msgspec.Struct, omit_defaults=True):
+        pass
+
+    # ---- options chain page ---------------------------------------------
+
+    class _Details(_Struct):
+        ticker: Any = UNSET
+        contract_type: Any = UNSET
+        expiration_date: Any = UNSET
+        strike_price: Any = UNSET
+
+    class _OptionDay(_Struct):
+        volume: Any = UNSET
+        close: Any = UNSET
+        low: Any = UNSET
+        high: Any = UNSET
+
+    class _Trade(_Struct):
+        price: Any = UNSET
+
+    class _Quote(_Struct):
+        bid: Any = UNSET
+        ask: Any = UNSET
+
+    class _Greeks(_Struct):
+        delta: Any = UNSET
+        gamma: Any = UNSET
+        theta: Any = UNSET
+        vega: Any = UNSET
+
+    class _Underlying(_Struct):
+        # price is what Polygon sends; the rest are _extract_underlying_price fallbacks
+        price: Any = UNSET
+        session: Any = UNSET
+        last_trade: Any = UNSET
+        last_quote: Any = UNSET
+        day: Any = UNSET
+
+    class _OptionResult(_Struct):
+        details: _Details | None | UnsetType = UNSET
+        day: _OptionDay | None | UnsetType = UNSET
+        last_trade: _Trade | None | UnsetType = UNSET
+        last_quote: _Quote | None | UnsetType = UNSET
+        greeks: _Greeks | None | UnsetType = UNSET
+        underlying_asset: _Underlying | None | UnsetType = UNSET
+        volume: Any = UNSET
+        open_interest: Any = UNSET
+        implied_volatility: Any = UNSET
+
+    class _ChainPage(_Struct):
+        results: list[_OptionResult] | None | UnsetType = UNSET
+        next_url: Any = UNSET
+
+    # ---- all-tickers stock snapshot -------------------------------------
+
+    class _StockDay(_Struct):
+        c: Any = UNSET
+        v: Any = UNSET
+
+    class _StockTrade(_Struct):
+        p: Any = UNSET
+
+    class _StockTicker(_Struct):
+        ticker: Any = UNSET
+        todaysChangePerc: Any = UNSET
+        day: _StockDay | None | UnsetType = UNSET
+        lastTrade: _StockTrade | None | UnsetType = UNSET
+        prevDay: _StockDay | None | UnsetType = UNSET
+
+    class _Snapshot(_Struct):
+        tickers: list[_StockTicker] | None | UnsetType = UNSET
+
+    _DECODERS = {
+        SNAPSHOT: msgspec.json.Decoder(_Snapshot),
+        CHAIN_PAGE: msgspec.json.Decoder(_ChainPage),
+    }
+
+
+def backend(schema: str | None = None) -> str:
+    """Which decoder loads() uses for `schema`: msgspec, orjson or json."""
+    if schema in _DECODERS:
+        return "msgspec"
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(data: bytes, schema: str | None = None) -> Any:
+    """
+    Decode a response body. With a `schema` (SNAPSHOT, CHAIN_PAGE) and
+    msgspec available, only the fields the scanner reads are kept.
+    """
+    decoder = _DECODERS.get(schema)
+    if decoder is not None:
+        try:
+            return msgspec.to_builtins(decoder.decode(data))
+        except msgspec.ValidationError as e:
+            # Unexpected shape: fall back to a full decode and let the mapping cope.
+            logger.warning("Typed %s decode failed (%s); decoding in full.", schema, e)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
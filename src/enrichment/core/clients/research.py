@@ -0,0 +1,46 @@
+# enrichment/core/clients/research.py
+"""
+Polygon access for the research and diagnostic scripts.
+
+One PolygonClient per process, built from config (POLYGON_API_KEY,
+POLYGON_BASE_URL, POLYGON_MAX_CALLS_PER_SEC) with the on-disk response
+cache at POLYGON_CACHE_PATH (default ./polygon_cache.sqlite), so reruns
+of a sweep only download bars they have not seen yet.
+
+    from src.enrichment.core.clients.research import fetch_minute_bars
+"""
+
+import threading
+from datetime import date
+
+from .. import config
+from .http_cache import ResponseCache
+from .polygon_client import PolygonClient
+
+DEFAULT_CACHE_PATH = "polygon_cache.sqlite"
+
+_client: PolygonClient | None = None
+_lock = threading.Lock()
+
+
+def cached_polygon() -> PolygonClient:
+    """The process's shared, cached PolygonClient (created on first use)."""
+    global _client
+    with _lock:
+        if _client is None:
+            cache = ResponseCache(
+                config.POLYGON_CACHE_PATH or DEFAULT_CACHE_PATH,
+                max_bytes=config.POLYGON_CACHE_MAX_MB * 1024 * 1024,
+            )
+            _client = PolygonClient(
+                config.POLYGON_API_KEY or "",
+                max_calls=config.POLYGON_MAX_CALLS_PER_SEC,
+                cache=cache,
+                base_url=config.POLYGON_BASE_URL,
+            )
+        return _client
+
+
+def fetch_minute_bars(ticker: str, start_date: date, end_date: date) -> list[dict]:
+    """1-minute bars for [start_date, end_date]; [] if Polygon fails."""
+    return cached_polygon().fetch_aggs(ticker, start_date, end_date, timespan="minute")
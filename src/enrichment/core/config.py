@@ -11,6 +11,14 @@ GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "profit-scout-data")
 
 # --- External APIs ---
 POLYGON_API_KEY = os.getenv("POLYGON_API_KEY")
+# Point at a stand-in (e.g. benchmarks/fake_polygon.py) to load-test without spending quota.
+POLYGON_BASE_URL = os.getenv("POLYGON_BASE_URL", "https://api.polygon.io").rstrip("/")
+# Request budget shared by every Polygon caller in a scanner run (calls per second).
+# 20/s is the live scanner's long-standing budget; raise it only if the plan allows.
+POLYGON_MAX_CALLS_PER_SEC = float(os.getenv("POLYGON_MAX_CALLS_PER_SEC", "20"))
+# Optional on-disk response cache (SQLite file); unset disables caching.
+POLYGON_CACHE_PATH = os.getenv("POLYGON_CACHE_PATH")
+POLYGON_CACHE_MAX_MB = int(os.getenv("POLYGON_CACHE_MAX_MB", "512"))
 
 # --- BigQuery ---
 BIGQUERY_DATASET = os.getenv("BIGQUERY_DATASET", "profit_scout")
@@ -30,6 +38,26 @@ CAND_TABLE = OPTIONS_CANDIDATES_TABLE_ID
 # Overnight Scanner
 OVERNIGHT_SIGNALS_TABLE = f"{PROJECT_ID}.{BIGQUERY_DATASET}.overnight_signals"
 OVERNIGHT_UNIVERSE_FILE = os.getenv("UNIVERSE_FILE", "overnight-universe.txt")
+# Per-stage scanner checkpoints (local dir or gs://bucket/prefix); unset disables resume.
+SCANNER_CHECKPOINT_URI = os.getenv("SCANNER_CHECKPOINT_URI")
+# Persisted sector/industry index for the cluster boost (local path or gs:// URI; "" disables).
+SCANNER_METADATA_INDEX_URI = os.getenv(
+    "SCANNER_METADATA_INDEX_URI", f"gs://{GCS_BUCKET_NAME}/overnight-scanner/metadata-index.json.gz"
+)
+SCANNER_METADATA_MAX_AGE_HOURS = float(os.getenv("SCANNER_METADATA_MAX_AGE_HOURS", "24"))
+# Daily archive of pre-scoring metric rows for offline re-scoring (local dir or gs:// URI; "" disables).
+SCANNER_METRICS_URI = os.getenv("SCANNER_METRICS_URI", f"gs://{GCS_BUCKET_NAME}/overnight-scanner/metrics")
+# Daily full-chain archive, date=/ticker= partitioned Parquet (local dir or gs:// URI; "" disables).
+SCANNER_CHAIN_ARCHIVE_URI = os.getenv("SCANNER_CHAIN_ARCHIVE_URI", f"gs://{GCS_BUCKET_NAME}/overnight-scanner/chains")
+# Upload threads for the chain archive; chains arriving while all of them are
+# busy and the queue is full are left out of the archive rather than stalling Pass 2.
+SCANNER_CHAIN_ARCHIVE_WRITERS = int(os.getenv("SCANNER_CHAIN_ARCHIVE_WRITERS", "4"))
+# Partial results of sharded scans (overnight-scanner/job.py), one file per shard (local dir or gs:// URI).
+SCANNER_SHARD_URI = os.getenv("SCANNER_SHARD_URI", f"gs://{GCS_BUCKET_NAME}/overnight-scanner/shards")
+# The job's --max-retries: a shard that fails on attempt N (0-based) >= this has given up.
+SCANNER_SHARD_MAX_RETRIES = int(os.getenv("SCANNER_SHARD_MAX_RETRIES", "1"))
+# A merge claim older than this (the job's --task-timeout) belongs to a dead task.
+SCANNER_MERGE_LOCK_TTL_SEC = float(os.getenv("SCANNER_MERGE_LOCK_TTL_SEC", "900"))
 
 # --- Score Aggregator: Regime-Aware Weighting ---
 
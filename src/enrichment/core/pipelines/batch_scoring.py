@@ -0,0 +1,229 @@
+# enrichment/core/pipelines/batch_scoring.py
+"""
+Vectorized whole-universe scoring and cluster boost.
+
+Column-at-a-time equivalent of overnight_scanner._score_ticker followed
+by _apply_cluster_boost. All six signal components, the divergence
+direction flip and the industry/direction cluster sizes are computed with
+array operations over every mover at once. Cluster sizes come from a
+bincount over (industry code, direction) keys.
+
+Two entry points:
+
+- score_arrays(cols, codes, params): numbers only (scores, components,
+  direction, cluster size/boost). This is what threshold sweeps use.
+- score_rows(rows, metadata, params): the same scored dicts, signal
+  strings included, that the scanner produces, in input order.
+
+ScoreParams holds every threshold so research can re-score with other
+cut-offs; its defaults are the scanner's. Check equivalence with
+scripts/tests_and_diagnostics/check_batch_scoring_equivalence.py.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Metric-row fields the scorer reads (float columns; missing -> 0).
+METRIC_FIELDS = (
+    "todaysChangePerc",
+    "call_dollar_vol",
+    "put_dollar_vol",
+    "call_vol_oi",
+    "put_vol_oi",
+    "call_active_strikes",
+    "put_active_strikes",
+    "call_uoa_depth",
+    "put_uoa_depth",
+)
+
+
+@dataclass(frozen=True)
+class ScoreParams:
+    min_dollar_volume: float = float(os.environ.get("MIN_DOLLAR_VOLUME", "500000"))
+    skew_strong: float = 3.0
+    skew_weak: float = 1.5
+    vol_oi_strong: float = 2.0
+    vol_oi_weak: float = 0.8
+    strikes_strong: int = 5
+    strikes_weak: int = 3
+    uoa_strong: float = 2_000_000
+    uoa_weak: float = 500_000
+    momentum_pct: float = 1.5
+    divergence_ratio: float = 2.0
+    divergence_min: float = 1_000_000
+    cluster_min_size: int = 4
+    cluster_min_score: int = 3
+    cluster_boost_threshold: int = 6
+    max_score: int = 10
+
+
+def columns_from_rows(rows: list[dict]) -> dict[str, np.ndarray]:
+    """Pass 2 metric rows -> float columns (None -> 0, like the scorer's `or 0`)."""
+    return {
+        f: np.array([r.get(f) or 0 for r in rows], dtype=np.float64)
+        for f in METRIC_FIELDS
+    }
+
+
+def industry_codes(tickers: list[str], metadata: dict) -> tuple[np.ndarray, list]:
+    """Intern each ticker's industry -> (codes, names); -1 = no industry."""
+    names: list = []
+    index: dict = {}
+    codes = np.full(len(tickers), -1, dtype=np.int64)
+    for i, t in enumerate(tickers):
+        industry = (metadata.get(t) or {}).get("industry")
+        if industry:
+            if industry not in index:
+                index[industry] = len(names)
+                names.append(industry)
+            codes[i] = index[industry]
+    return codes, names
+
+
+def _tier(value: np.ndarray, strong, weak, strict: bool = True) -> np.ndarray:
+    if strict:
+        return np.where(value > strong, 2, np.where(value > weak, 1, 0))
+    return np.where(value >= strong, 2, np.where(value >= weak, 1, 0))
+
+
+def score_arrays(cols: dict[str, np.ndarray], codes: np.ndarray, params: ScoreParams = ScoreParams()) -> dict:
+    """
+    Score every mover at once. Returns arrays: score (after cluster boost),
+    original_score, bullish (final direction), the six components, skew,
+    cluster_size and cluster_boost.
+    """
+    pct = cols["todaysChangePerc"]
+    call_dv, put_dv = cols["call_dollar_vol"], cols["put_dollar_vol"]
+    up = pct > 0
+
+    # SIGNAL 1: dollar-volume skew toward the price move
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skew = np.where(up, call_dv / np.maximum(put_dv, 1), put_dv / np.maximum(call_dv, 1))
+    skew_ok = ((call_dv + put_dv) > params.min_dollar_volume) & np.where(up, call_dv > 0, put_dv > 0)
+    s1 = np.where(skew_ok, _tier(skew, params.skew_strong, params.skew_weak), 0)
+
+    # SIGNALS 2-4 read the side matching the price move
+    s2 = _tier(np.where(up, cols["call_vol_oi"], cols["put_vol_oi"]), params.vol_oi_strong, params.vol_oi_weak)
+    strikes = np.where(up, cols["call_active_strikes"], cols["put_active_strikes"])
+    s3 = _tier(strikes, params.strikes_strong, params.strikes_weak, strict=False)
+    s4 = _tier(np.where(up, cols["call_uoa_depth"], cols["put_uoa_depth"]), params.uoa_strong, params.uoa_weak)
+
+    # SIGNAL 5: momentum; SIGNAL 6: divergence flips the direction
+    s5 = (np.abs(pct) > params.momentum_pct).astype(np.int64)
+    div_bear = up & (put_dv > call_dv * params.divergence_ratio) & (put_dv > params.divergence_min)
+    div_bull = ~up & (call_dv > put_dv * params.divergence_ratio) & (call_dv > params.divergence_min)
+    s6 = (div_bear | div_bull).astype(np.int64)
+    bullish = np.where(div_bear, False, np.where(div_bull, True, up))
+
+    original = s1 + s2 + s3 + s4 + s5 + s6
+
+    # Cluster boost: group-by (industry, direction) over qualifying tickers
+    has_ind = codes >= 0
+    key = np.where(has_ind, codes * 2 + bullish, 0)
+    n_keys = int(key.max()) + 1 if len(key) else 1
+    counts = np.bincount(key[has_ind & (original >= params.cluster_min_score)], minlength=n_keys)
+    cluster_size = np.where(has_ind, counts[key], 0)
+    boost = np.select([cluster_size >= 8, cluster_size >= 5], [3, 2], 1)
+    boost = np.where(
+        has_ind & (original < params.cluster_boost_threshold) & (cluster_size >= params.cluster_min_size),
+        boost, 0,
+    )
+    return {
+        "score": np.where(boost > 0, np.minimum(original + boost, params.max_score), original),
+        "original_score": original,
+        "bullish": bullish,
+        "components": np.stack([s1, s2, s3, s4, s5, s6], axis=1),
+        "skew": skew,
+        "cluster_size": cluster_size,
+        "cluster_boost": boost,
+    }
+
+
+def _signals(r: dict, i: int, out: dict, up: bool) -> list[str]:
+    """Signal strings for row i, formatted exactly as _score_ticker does."""
+    s1, s2, s3, s4, s5, s6 = (int(v) for v in out["components"][i])
+    pct = r.get("todaysChangePerc") or 0
+    signals = []
+    if s1:
+        side = "Call $ {:.1f}x puts" if up else "Put $ {:.1f}x calls"
+        signals.append(side.format(float(out["skew"][i])))
+    if s2:
+        v = r.get("call_vol_oi", 0) if up else r.get("put_vol_oi", 0)
+        signals.append(f"Vol/OI {v:.1f}x (very unusual)" if s2 == 2 else f"Vol/OI {v:.1f}x (unusual)")
+    if s3:
+        v = r.get("call_active_strikes", 0) if up else r.get("put_active_strikes", 0)
+        signals.append(f"{v} strikes active (institutional)" if s3 == 2 else f"{v} strikes active")
+    if s4:
+        v = r.get("call_uoa_depth", 0) if up else r.get("put_uoa_depth", 0)
+        signals.append(f"${v / 1e6:.1f}M new positioning" if s4 == 2 else f"${v / 1e3:.0f}K new positioning")
+    if s5:
+        signals.append(f"Price moved {pct:+.1f}%")
+    if s6:
+        signals.append("DIVERGENCE: heavy puts despite rally" if up else "DIVERGENCE: heavy calls despite selloff")
+    return signals
+
+
+def score_rows(rows: list[dict], metadata: dict, params: ScoreParams = ScoreParams()) -> list[dict]:
+    """
+    Batch equivalent of _apply_cluster_boost([_score_ticker(r) for r in rows], metadata):
+    same keys, values and signal strings, in input order.
+    """
+    tickers = [r["ticker"] for r in rows]
+    codes, _ = industry_codes(tickers, metadata)
+    out = score_arrays(columns_from_rows(rows), codes, params)
+    logger.info(
+        "Batch scored %d tickers: %d cluster-boosted.",
+        len(rows), int(np.count_nonzero(out["cluster_boost"])),
+    )
+
+    scored = []
+    for i, r in enumerate(rows):
+        pct = r.get("todaysChangePerc") or 0
+        bullish = bool(out["bullish"][i])
+        best = r.get("best_call") if bullish else r.get("best_put")
+        meta = metadata.get(r["ticker"], {})
+        call_dv = r.get("call_dollar_vol") or 0
+        put_dv = r.get("put_dollar_vol") or 0
+        scored.append({
+            "ticker": r["ticker"],
+            "direction": "BULLISH" if bullish else "BEARISH",
+            "overnight_score": int(out["score"][i]),
+            "original_score": int(out["original_score"][i]),
+            "cluster_boost": int(out["cluster_boost"][i]),
+            "cluster_size": int(out["cluster_size"][i]),
+            "sector": meta.get("sector") or None,
+            "industry": meta.get("industry") or None,
+            "price_change_pct": pct,
+            "underlying_price": r.get("underlying_price"),
+            "day_volume": r.get("day_volume"),
+            "call_dollar_volume": call_dv,
+            "put_dollar_volume": put_dv,
+            "total_options_dollar_volume": call_dv + put_dv,
+            "call_vol_oi_ratio": r.get("call_vol_oi"),
+            "put_vol_oi_ratio": r.get("put_vol_oi"),
+            "call_active_strikes": r.get("call_active_strikes"),
+            "put_active_strikes": r.get("put_active_strikes"),
+            "call_uoa_depth": r.get("call_uoa_depth"),
+            "put_uoa_depth": r.get("put_uoa_depth"),
+            "signals": _signals(r, i, out, pct > 0),
+            "recommended_contract": best.get("contract_symbol") if best else None,
+            "recommended_strike": best.get("strike") if best else None,
+            "recommended_expiration": best.get("expiration_date") if best else None,
+            "recommended_dte": best.get("dte") if best else None,
+            "recommended_mid_price": best.get("mid_price") if best else None,
+            "recommended_spread_pct": best.get("spread_pct") if best else None,
+            "contract_score": best.get("contract_score") if best else None,
+            "recommended_delta": best.get("delta") if best else None,
+            "recommended_gamma": best.get("gamma") if best else None,
+            "recommended_theta": best.get("theta") if best else None,
+            "recommended_vega": best.get("vega") if best else None,
+            "recommended_iv": best.get("implied_volatility") if best else None,
+            "recommended_volume": best.get("volume") if best else None,
+            "recommended_oi": best.get("open_interest") if best else None,
+        })
+    return scored
@@ -0,0 +1,167 @@
+# enrichment/core/pipelines/chain_archive.py
+"""
+Daily option-chain archive as a partitioned Parquet dataset.
+
+The Pass 2 CPU stage hands every chain it has reduced to a ChainArchive,
+whose writer threads store it as one zstd-compressed Parquet file:
+
+    <root>/date=YYYY-MM-DD/ticker=XYZ/chain.parquet
+
+root is a local directory or a gs://bucket/prefix URI. Each file is the
+chain's columnar form: the OptionChain fields as float64 columns,
+expiration_date as date32, is_call, and contract_symbol as a
+dictionary<int32, string> column. The Pass 1 mover row the chain was
+scored with is kept in the file's key-value metadata.
+
+read_chains() memory-maps a date's files (local roots) and yields
+(mover row, OptionChain) pairs, ready for _compute_flow_metrics or any
+research script that wants contract-level history without Polygon.
+"""
+
+import json
+import logging
+import queue
+import threading
+from datetime import date
+from typing import Iterator
+
+import numpy as np
+import pyarrow as pa
+
+from ..clients.option_chain import CHAIN_DTYPE, OptionChain
+from .object_store import ObjectStore
+
+logger = logging.getLogger(__name__)
+
+FILE_NAME = "chain.parquet"
+_FLOAT_FIELDS = [n for n in CHAIN_DTYPE.names if CHAIN_DTYPE[n].kind == "f"]
+_EPOCH = date(1970, 1, 1).toordinal()
+_DONE = object()
+
+SCHEMA = pa.schema(
+    [("contract_symbol", pa.dictionary(pa.int32(), pa.string()))]
+    + [(name, pa.float64()) for name in _FLOAT_FIELDS]
+    + [("expiration_date", pa.date32()), ("is_call", pa.bool_())]
+)
+
+
+def to_arrow(chain: OptionChain, ticker_info: dict | None = None) -> pa.Table:
+    """OptionChain -> Arrow table (columns straight from the structured array)."""
+    d = chain.data
+    symbols = pa.array(list(chain.symbols), type=pa.string()).dictionary_encode()
+    expiry = d["expiry"].astype(np.int32)
+    days = pa.array(expiry - _EPOCH, mask=expiry < 0, type=pa.int32()).cast(pa.date32())
+    arrays = (
+        [symbols]
+        + [pa.array(d[name], from_pandas=True) for name in _FLOAT_FIELDS]  # NaN -> null
+        + [days, pa.array(d["is_call"])]
+    )
+    meta = {"ticker": chain.ticker or (ticker_info or {}).get("ticker") or ""}
+    if ticker_info is not None:
+        meta["mover"] = json.dumps(ticker_info, default=str)
+    return pa.Table.from_arrays(arrays, schema=SCHEMA.with_metadata(meta))
+
+
+def from_arrow(table: pa.Table) -> tuple[dict | None, OptionChain]:
+    """Inverse of to_arrow: (mover row or None, OptionChain)."""
+    meta = table.schema.metadata or {}
+    n = table.num_rows
+    data = np.empty(n, dtype=CHAIN_DTYPE)
+    for name in _FLOAT_FIELDS:
+        data[name] = table.column(name).to_numpy(zero_copy_only=False)  # nulls -> NaN
+    exp = table.column("expiration_date").cast(pa.int32())
+    data["expiry"] = exp.fill_null(-1 - _EPOCH).to_numpy() + _EPOCH
+    data["is_call"] = table.column("is_call").to_numpy(zero_copy_only=False)
+    symbols = np.empty(n, dtype=object)
+    symbols[:] = table.column("contract_symbol").cast(pa.string()).to_pylist()
+    ticker = meta.get(b"ticker", b"").decode() or None
+    mover = json.loads(meta[b"mover"]) if b"mover" in meta else None
+    return mover, OptionChain(data, symbols, int(data["is_call"].sum()), ticker)
+
+
+def _tickers(store: ObjectStore, scan_date: date) -> list[str]:
+    partition = f"date={scan_date.isoformat()}/ticker="
+    suffix = "/" + FILE_NAME
+    return sorted(n[len(partition):-len(suffix)] for n in store.list(partition) if n.endswith(suffix))
+
+
+def _name(scan_date: date, ticker: str) -> str:
+    return f"date={scan_date.isoformat()}/ticker={ticker}/{FILE_NAME}"
+
+
+class ChainArchive:
+    """
+    Streams one scan date's chains to the archive from `writers` upload
+    threads. add() never blocks the scan: when `queue_size` chains are
+    already waiting (the store is slower than Pass 2), the chain is dropped
+    from the archive and counted; queue_size=0 queues without bound and
+    keeps every chain. close() drains the queue. Write failures are logged
+    and skipped.
+    """
+
+    def __init__(self, root: str, scan_date: date, queue_size: int = 64, writers: int = 4):
+        self.store = ObjectStore(root)
+        self.scan_date = scan_date
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self._count_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._writers = [threading.Thread(target=self._run, daemon=True) for _ in range(max(1, writers))]
+        for t in self._writers:
+            t.start()
+
+    def add(self, ticker_info: dict, chain):
+        if not isinstance(chain, OptionChain):
+            chain = OptionChain.from_records(chain, ticker_info["ticker"])
+        try:
+            self._queue.put_nowait((ticker_info, chain))
+        except queue.Full:
+            with self._count_lock:
+                self.dropped += 1
+                first = self.dropped == 1
+            if first:
+                logger.warning("Chain archive is behind the scan; dropping chains until it catches up.")
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            ticker_info, chain = item
+            try:
+                self.store.write_parquet(_name(self.scan_date, ticker_info["ticker"]), to_arrow(chain, ticker_info))
+                with self._count_lock:
+                    self.written += 1
+            except Exception as e:
+                with self._count_lock:
+                    self.failed += 1
+                logger.warning("[%s] Chain archive write failed: %s", ticker_info["ticker"], e)
+
+    def close(self) -> int:
+        for _ in self._writers:
+            self._queue.put(_DONE)
+        for t in self._writers:
+            t.join()
+        logger.log(
+            logging.WARNING if self.dropped else logging.INFO,
+            "Archived %d chains to %s/date=%s (%d failed, %d dropped).",
+            self.written, self.store.root, self.scan_date.isoformat(), self.failed, self.dropped,
+        )
+        return self.written
+
+
+def list_tickers(root: str, scan_date: date) -> list[str]:
+    """Tickers archived for `scan_date`."""
+    return _tickers(ObjectStore(root), scan_date)
+
+
+def read_chain(root: str, scan_date: date, ticker: str) -> tuple[dict | None, OptionChain]:
+    return from_arrow(ObjectStore(root).read_parquet(_name(scan_date, ticker), memory_map=True))
+
+
+def read_chains(root: str, scan_date: date, tickers: list[str] | None = None) -> Iterator[tuple[dict | None, OptionChain]]:
+    """Yield (mover row, OptionChain) for each archived ticker of `scan_date`, in ticker order."""
+    store = ObjectStore(root)
+    for ticker in tickers if tickers is not None else _tickers(store, scan_date):
+        yield from_arrow(store.read_parquet(_name(scan_date, ticker), memory_map=True))
@@ -0,0 +1,169 @@
+# enrichment/core/pipelines/flow_metrics.py
+"""
+Vectorized options-flow metrics over a columnar OptionChain.
+
+Drop-in replacement for the per-contract dict walk in overnight_scanner
+(_dollar_vol, _count_active_strikes, _uoa_depth, _best_contract and
+_compute_flow_metrics). Each side of the chain is reduced with masked
+array operations and the best contract is picked from a score vector.
+
+Results match the dict implementation exactly: missing values behave
+like the dict code's `or 0`, sums accumulate left to right (cumsum,
+not pairwise), and contract scores are rounded with Python's round()
+before the first-max pick. Use
+scripts/tests_and_diagnostics/check_flow_metrics_equivalence.py to
+re-verify after changing either implementation.
+"""
+
+from datetime import date
+
+import numpy as np
+
+from ..clients.option_chain import OptionChain
+
+
+def _nz(col: np.ndarray) -> np.ndarray:
+    """Missing (NaN) -> 0, like the dict code's `c.get(k) or 0`."""
+    return np.nan_to_num(col, nan=0.0)
+
+
+def _seq_sum(terms: np.ndarray) -> float:
+    """Left-to-right sum, bit-identical to a Python `total += x` loop."""
+    return float(np.cumsum(terms)[-1]) if len(terms) else 0.0
+
+
+def _opt(v: float, ndigits: int):
+    """round(v) if v else None, as the dict code reports optional greeks."""
+    return round(v, ndigits) if v else None
+
+
+def _side_aggregates(side: OptionChain, underlying_price: float) -> dict:
+    d = side.data
+    vol = _nz(d["volume"])
+    oi = _nz(d["open_interest"])
+    bid = _nz(d["bid"])
+    ask = _nz(d["ask"])
+    last = _nz(d["last_price"])
+
+    # mid = (bid + ask) / 2 when both quotes are positive, else last price.
+    mid = np.where((bid > 0) & (ask > 0), (bid + ask) / 2, last)
+    priced = mid != 0
+
+    dollar = priced & (vol != 0)
+    uoa = priced & (vol > oi)
+
+    atm_iv = None
+    if len(d) and underlying_price:
+        i = int(np.argmin(np.abs(_nz(d["strike"]) - underlying_price)))
+        iv = float(d["implied_volatility"][i])
+        atm_iv = None if np.isnan(iv) else iv
+
+    return {
+        "volume": int(vol.sum()),
+        "oi": int(oi.sum()),
+        "dollar_vol": _seq_sum(vol[dollar] * mid[dollar] * 100),
+        "active_strikes": int(np.count_nonzero(vol > np.maximum(oi * 0.5, 100))),
+        "uoa_depth": _seq_sum((vol[uoa] - oi[uoa]) * mid[uoa] * 100),
+        "atm_iv": atm_iv,
+    }
+
+
+def best_contract(
+    side: OptionChain, direction: str, underlying_price: float, today: date | None = None
+) -> dict | None:
+    """
+    Vectorized _best_contract over one side of the chain. A put with a
+    zero strike is excluded here, where the dict code would raise.
+    """
+    d = side.data
+    if not len(d):
+        return None
+    today = today or date.today()
+
+    expiry = d["expiry"].astype(np.int64)
+    dte = expiry - today.toordinal()
+    strike = _nz(d["strike"])
+    vol = _nz(d["volume"])
+    bid = _nz(d["bid"])
+    ask = _nz(d["ask"])
+    oi = _nz(d["open_interest"])
+
+    ok = (expiry >= 0) & (dte >= 7) & (dte <= 90) & (bid > 0) & (ask > 0)
+    mid = (bid + ask) / 2
+    ok &= mid > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread_pct = (ask - bid) / mid
+        ok &= (spread_pct <= 0.40) & (vol >= 10)
+
+        # Moneyness filter — widened for OTM institutional flow
+        if underlying_price and underlying_price > 0:
+            mny = strike / underlying_price if direction == "call" else underlying_price / strike
+            ok &= (mny >= 0.90) & (mny <= 1.25)
+
+    idx = np.flatnonzero(ok)
+    if not len(idx):
+        return None
+
+    vol, oi, mid, sp = vol[idx], oi[idx], mid[idx], spread_pct[idx]
+    delta = np.abs(_nz(d["delta"][idx]))
+    gamma = _nz(d["gamma"][idx])
+    theta = _nz(d["theta"][idx])
+
+    score = (
+        np.minimum(vol / 500, 5.0) * 2.0
+        + (1.0 - np.minimum(sp, 1.0)) * 3.0
+        + np.minimum(vol / np.maximum(oi, 1), 3.0) * 1.5
+        + gamma * 20.0
+        + np.where((delta >= 0.25) & (delta <= 0.50), 2.0, 0.0)  # Sweet spot delta bonus
+        - (np.abs(theta) / np.maximum(mid, 0.01)) * 1.0           # Theta drag penalty
+    )
+    # The dict code keeps the first candidate with the highest *rounded* score.
+    rounded = [round(float(s), 3) for s in score]
+    k = rounded.index(max(rounded))
+    i = int(idx[k])
+
+    row = d[i]
+    iv = float(_nz(row["implied_volatility"]))
+    g = float(gamma[k])
+    th = float(theta[k])
+    vega = float(_nz(row["vega"]))
+    return {
+        "contract_symbol": side.symbols[i],
+        "strike": float(strike[i]),
+        "expiration_date": side.expiration_date(i),
+        "dte": int(dte[i]),
+        "mid_price": round(float(mid[k]), 2),
+        "spread_pct": round(float(sp[k]), 4),
+        "volume": int(vol[k]),
+        "open_interest": int(oi[k]),
+        "implied_volatility": _opt(iv, 4),
+        "gamma": _opt(g, 6),
+        "delta": round(float(_nz(row["delta"])), 4),
+        "theta": _opt(th, 4),
+        "vega": _opt(vega, 4),
+        "contract_score": rounded[k],
+    }
+
+
+def compute_flow_metrics(chain: OptionChain, underlying_price: float, today: date | None = None) -> dict:
+    """Vectorized _compute_flow_metrics; same keys and values."""
+    calls, puts = chain.calls, chain.puts
+    c = _side_aggregates(calls, underlying_price)
+    p = _side_aggregates(puts, underlying_price)
+
+    return {
+        "call_dollar_vol": c["dollar_vol"],
+        "put_dollar_vol": p["dollar_vol"],
+        "call_vol_oi": c["volume"] / max(c["oi"], 1),
+        "put_vol_oi": p["volume"] / max(p["oi"], 1),
+        "call_active_strikes": c["active_strikes"],
+        "put_active_strikes": p["active_strikes"],
+        "call_uoa_depth": c["uoa_depth"],
+        "put_uoa_depth": p["uoa_depth"],
+        "atm_call_iv": c["atm_iv"],
+        "atm_put_iv": p["atm_iv"],
+        "total_call_volume": c["volume"],
+        "total_put_volume": p["volume"],
+        "best_call": best_contract(calls, "call", underlying_price, today),
+        "best_put": best_contract(puts, "put", underlying_price, today),
+    }
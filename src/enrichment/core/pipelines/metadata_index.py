@@ -0,0 +1,125 @@
+# enrichment/core/pipelines/metadata_index.py
+"""
+Persisted ticker -> (sector, industry) index for the cluster boost.
+
+Industry and sector names are interned: the file stores each distinct
+name once and every ticker as a pair of small integer codes (-1 = none).
+A ticker with both codes -1 is known to have no SIC classification, so
+it is not looked up again.
+
+The index is a gzip JSON document at a local path or a gs:// URI:
+
+    {"built_at": <epoch s>, "industries": [...], "sectors": [...],
+     "tickers": [...], "industry_codes": [...], "sector_codes": [...]}
+"""
+
+import gzip
+import json
+import logging
+import threading
+import time
+
+from .object_store import ObjectStore
+
+logger = logging.getLogger(__name__)
+
+_NONE = -1
+
+
+class MetadataIndex:
+    """Interned sector/industry lookup; thread-safe for concurrent add()."""
+
+    def __init__(self, built_at: float = 0.0):
+        self.built_at = built_at
+        self.industries: list[str] = []
+        self.sectors: list[str] = []
+        self._industry_code: dict[str, int] = {}
+        self._sector_code: dict[str, int] = {}
+        self._codes: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._codes
+
+    @staticmethod
+    def _intern(name: str | None, names: list[str], codes: dict[str, int]) -> int:
+        if not name:
+            return _NONE
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+        return code
+
+    def add(self, ticker: str, sector: str | None, industry: str | None):
+        with self._lock:
+            self._codes[ticker] = (
+                self._intern(industry, self.industries, self._industry_code),
+                self._intern(sector, self.sectors, self._sector_code),
+            )
+            self.dirty = True
+
+    def get(self, ticker: str) -> dict | None:
+        """{"sector", "industry"} like _load_metadata_from_polygon, or None if unknown."""
+        codes = self._codes.get(ticker)
+        if codes is None:
+            return None
+        i, s = codes
+        return {
+            "sector": self.sectors[s] if s != _NONE else None,
+            "industry": self.industries[i] if i != _NONE else None,
+        }
+
+    def age_seconds(self) -> float:
+        return time.time() - self.built_at
+
+    @classmethod
+    def from_metadata(cls, metadata: dict) -> "MetadataIndex":
+        """Build from a full {ticker: {"sector", "industry"}} map."""
+        index = cls(built_at=time.time())
+        for ticker, m in metadata.items():
+            index.add(ticker, m.get("sector"), m.get("industry"))
+        return index
+
+    @classmethod
+    def load(cls, uri: str) -> "MetadataIndex | None":
+        try:
+            store, name = ObjectStore.split(uri)
+            body = store.read_bytes(name)
+            if body is None:
+                return None
+            doc = json.loads(gzip.decompress(body))
+            index = cls(built_at=doc.get("built_at") or 0.0)
+            index.industries = doc["industries"]
+            index.sectors = doc["sectors"]
+            index._industry_code = {n: i for i, n in enumerate(index.industries)}
+            index._sector_code = {n: i for i, n in enumerate(index.sectors)}
+            index._codes = dict(zip(doc["tickers"], zip(doc["industry_codes"], doc["sector_codes"])))
+        except Exception as e:
+            logger.warning("Metadata index %s unreadable: %s", uri, e)
+            return None
+        logger.info(
+            "Loaded metadata index %s: %d tickers, %d industries, built %.1fh ago.",
+            uri, len(index), len(index.industries), index.age_seconds() / 3600,
+        )
+        return index
+
+    def save(self, uri: str):
+        with self._lock:
+            tickers = sorted(self._codes)
+            doc = {
+                "built_at": self.built_at,
+                "industries": self.industries,
+                "sectors": self.sectors,
+                "tickers": tickers,
+                "industry_codes": [self._codes[t][0] for t in tickers],
+                "sector_codes": [self._codes[t][1] for t in tickers],
+            }
+            self.dirty = False
+        store, name = ObjectStore.split(uri)
+        store.write_bytes(name, gzip.compress(json.dumps(doc, separators=(",", ":")).encode()), "application/gzip")
+        logger.info("Saved metadata index %s (%d tickers).", uri, len(tickers))
@@ -0,0 +1,128 @@
+# enrichment/core/pipelines/metrics_archive.py
+"""
+Daily archive of the overnight scanner's pre-scoring metric rows.
+
+Every Pass 2 metric row (the Pass 1 mover fields plus the flow metrics
+and best contracts that _score_ticker reads) is kept together with the
+sector/industry the cluster boost used, one Parquet file per scan date:
+
+    <root>/scan_date=YYYY-MM-DD/metrics.parquet
+
+root is a local directory or a gs://bucket/prefix URI. from_arrow()
+turns a day back into (rows, metadata) exactly as the scanner had them,
+so scoring and cluster boost can be re-run offline with other
+thresholds (backtesting_and_research/sweep_scoring_params.py) without
+refetching a single chain.
+
+best_call / best_put are stored as JSON text: their keys are fixed by
+the scanner, but only the sweep's reporting reads them.
+"""
+
+import json
+import logging
+from datetime import date
+
+import pyarrow as pa
+
+from .object_store import ObjectStore
+
+logger = logging.getLogger(__name__)
+
+FILE_NAME = "metrics.parquet"
+
+# (row key, arrow type); missing keys are written as nulls.
+COLUMNS = [
+    ("ticker", pa.string()),
+    ("todaysChangePerc", pa.float64()),
+    ("day_volume", pa.int64()),
+    ("underlying_price", pa.float64()),
+    ("prev_close", pa.float64()),
+    ("call_dollar_vol", pa.float64()),
+    ("put_dollar_vol", pa.float64()),
+    ("call_vol_oi", pa.float64()),
+    ("put_vol_oi", pa.float64()),
+    ("call_active_strikes", pa.int64()),
+    ("put_active_strikes", pa.int64()),
+    ("call_uoa_depth", pa.float64()),
+    ("put_uoa_depth", pa.float64()),
+    ("atm_call_iv", pa.float64()),
+    ("atm_put_iv", pa.float64()),
+    ("total_call_volume", pa.int64()),
+    ("total_put_volume", pa.int64()),
+    ("best_call", pa.string()),
+    ("best_put", pa.string()),
+    ("sector", pa.string()),
+    ("industry", pa.string()),
+]
+SCHEMA = pa.schema(COLUMNS)
+_JSON = ("best_call", "best_put")
+_META = ("sector", "industry")
+
+
+def _value(v, typ: pa.DataType):
+    if v is None:
+        return None
+    if pa.types.is_integer(typ):
+        return int(v)
+    if pa.types.is_floating(typ):
+        return float(v)
+    return v
+
+
+def to_arrow(rows: list[dict], metadata: dict) -> pa.Table:
+    """Metric rows (+ their sector/industry from metadata) -> one Arrow table."""
+    arrays = []
+    for name, typ in COLUMNS:
+        if name in _JSON:
+            values = [json.dumps(r[name], default=str) if r.get(name) else None for r in rows]
+        elif name in _META:
+            values = [(metadata.get(r["ticker"]) or {}).get(name) for r in rows]
+        else:
+            values = [_value(r.get(name), typ) for r in rows]
+        arrays.append(pa.array(values, type=typ))
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def from_arrow(table: pa.Table) -> tuple[list[dict], dict]:
+    """Inverse of to_arrow: (metric rows, ticker -> {sector, industry})."""
+    rows, metadata = [], {}
+    for rec in table.to_pylist():
+        meta = {k: rec.pop(k, None) for k in _META}
+        for k in _JSON:
+            rec[k] = json.loads(rec[k]) if rec.get(k) else None
+        if meta["sector"] or meta["industry"]:
+            metadata[rec["ticker"]] = meta
+        rows.append(rec)
+    return rows, metadata
+
+
+class MetricsArchive:
+    """Hive-style metrics.parquet per scan date, local or on GCS."""
+
+    def __init__(self, root: str):
+        self.store = ObjectStore(root)
+        self.root = self.store.root
+
+    def _name(self, scan_date: date) -> str:
+        return f"scan_date={scan_date.isoformat()}/{FILE_NAME}"
+
+    def write(self, table: pa.Table, scan_date: date) -> str:
+        name = self._name(scan_date)
+        self.store.write_parquet(name, table)
+        logger.info("Archived %d metric rows to %s/%s", table.num_rows, self.root, name)
+        return self.store.uri(name)
+
+    def dates(self) -> list[date]:
+        """Scan dates present in the archive, oldest first."""
+        out = set()
+        for n in self.store.list("scan_date="):
+            part, _, fname = n.partition("/")
+            if fname == FILE_NAME:
+                try:
+                    out.add(date.fromisoformat(part[len("scan_date="):]))
+                except ValueError:
+                    continue
+        return sorted(out)
+
+    def read(self, scan_date: date) -> pa.Table:
+        return self.store.read_parquet(self._name(scan_date))
@@ -0,0 +1,155 @@
+# enrichment/core/pipelines/object_store.py
+"""
+One storage root for the scanner's persisted state: a local directory or
+a gs://bucket/prefix URI, addressed by slash-separated names relative to
+the root.
+
+    store = ObjectStore("gs://bucket/overnight-scanner/shards/2026-10-16")
+    store.write_text("shard-000-of-004.json", doc)
+    store.list("shard-")          # names under the root starting with "shard-"
+
+Local writes go through a temporary file and a rename, so readers never
+see a partial file (GCS uploads are atomic already). create() is the one
+conditional write: it succeeds for exactly one caller per name, which is
+what single-owner locks are built on.
+"""
+
+import io
+import os
+
+_GCS = "gs://"
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+
+
+class ObjectStore:
+    """Read, write and list objects under a local or gs:// root."""
+
+    def __init__(self, root: str):
+        self.root = root.rstrip("/")
+        self.bucket = None
+        self.prefix = ""
+        if self.root.startswith(_GCS):
+            from google.cloud import storage
+
+            bucket, _, prefix = self.root[len(_GCS):].partition("/")
+            self.bucket = storage.Client().bucket(bucket)
+            self.prefix = prefix + "/" if prefix else ""
+
+    @classmethod
+    def split(cls, uri: str) -> tuple["ObjectStore", str]:
+        """(store of the parent, object name) for a single-object URI."""
+        parent, _, name = uri.rstrip("/").rpartition("/")
+        return cls(parent or "."), name
+
+    def uri(self, name: str) -> str:
+        return f"{self.root}/{name}"
+
+    def local_path(self, name: str) -> str | None:
+        """Filesystem path of `name`, or None on GCS."""
+        return None if self.bucket is not None else os.path.join(self.root, *name.split("/"))
+
+    # ---- reads -----------------------------------------------------------
+
+    def read_bytes(self, name: str) -> bytes | None:
+        """Contents of `name`, or None if it does not exist."""
+        if self.bucket is not None:
+            from google.api_core.exceptions import NotFound
+
+            try:
+                return self.bucket.blob(self.prefix + name).download_as_bytes()
+            except NotFound:
+                return None
+        try:
+            with open(self.local_path(name), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def read_text(self, name: str) -> str | None:
+        body = self.read_bytes(name)
+        return None if body is None else body.decode("utf-8")
+
+    def list(self, prefix: str = "") -> list[str]:
+        """Sorted names under the root that start with `prefix` (recursive)."""
+        if self.bucket is not None:
+            return sorted(b.name[len(self.prefix):] for b in self.bucket.list_blobs(prefix=self.prefix + prefix))
+        if not os.path.isdir(self.root):
+            return []
+        names = []
+        for dirpath, _, files in os.walk(self.root):
+            rel = os.path.relpath(dirpath, self.root).replace(os.sep, "/")
+            for f in files:
+                name = f if rel == "." else f"{rel}/{f}"
+                if name.startswith(prefix) and not f.endswith(".tmp"):
+                    names.append(name)
+        return sorted(names)
+
+    def read_parquet(self, name: str, memory_map: bool = False):
+        """`name` as a pyarrow Table (memory-mapped on local roots if asked)."""
+        import pyarrow.parquet as pq
+
+        path = self.local_path(name)
+        if path is not None:
+            return pq.read_table(path, memory_map=memory_map)
+        body = self.read_bytes(name)
+        if body is None:
+            raise FileNotFoundError(self.uri(name))
+        return pq.read_table(io.BytesIO(body))
+
+    # ---- writes ----------------------------------------------------------
+
+    def write_bytes(self, name: str, body: bytes, content_type: str = "application/octet-stream"):
+        if self.bucket is not None:
+            self.bucket.blob(self.prefix + name).upload_from_string(body, content_type=content_type)
+            return
+        path = self.local_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)  # readers never see a partial file
+
+    def write_text(self, name: str, text: str, content_type: str = "application/json"):
+        self.write_bytes(name, text.encode("utf-8"), content_type)
+
+    def write_parquet(self, name: str, table, compression: str = "zstd"):
+        import pyarrow.parquet as pq
+
+        buf = io.BytesIO()
+        pq.write_table(table, buf, compression=compression)
+        self.write_bytes(name, buf.getvalue(), PARQUET_CONTENT_TYPE)
+
+    def create(self, name: str, body: bytes = b"") -> bool:
+        """Write `name` only if it does not exist; True for exactly one caller."""
+        if self.bucket is not None:
+            from google.api_core.exceptions import PreconditionFailed
+
+            try:
+                # if_generation_match=0: create only if the object does not exist yet
+                self.bucket.blob(self.prefix + name).upload_from_string(body, if_generation_match=0)
+                return True
+            except PreconditionFailed:
+                return False
+        path = self.local_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        return True
+
+    def delete(self, name: str):
+        """Remove `name`; a missing object is not an error."""
+        if self.bucket is not None:
+            from google.api_core.exceptions import NotFound
+
+            try:
+                self.bucket.blob(self.prefix + name).delete()
+            except NotFound:
+                pass
+            return
+        try:
+            os.remove(self.local_path(name))
+        except FileNotFoundError:
+            pass
@@ -5,15 +5,32 @@ Scans 3,000+ tickers for institutional options positioning.
 Pure numeric scoring — zero LLM calls.
 """
 
+import asyncio
+import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date, datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
 
+import requests
 from google.cloud import bigquery, storage
 
 from .. import config
+from ..clients.adaptive_concurrency import AdaptiveConcurrency
+from ..clients.cassette import RECORD, REPLAY, Cassette, CassetteMiss
+from ..clients.http_cache import ResponseCache
+from ..clients.option_chain import OptionChain
 from ..clients.polygon_client import PolygonClient
+from . import batch_scoring, flow_metrics, metrics_archive, scan_shards, signal_sink
+from .chain_archive import ChainArchive, read_chains
+from .metadata_index import MetadataIndex
+from .scan_checkpoint import ScanCheckpoint
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,7 +43,41 @@ MIN_DOLLAR_VOLUME = float(
     __import__("os").environ.get("MIN_DOLLAR_VOLUME", "500000")
 )
 MIN_SCORE = int(__import__("os").environ.get("MIN_SCORE", "6"))
-MAX_WORKERS = 16
+MAX_WORKERS = int(__import__("os").environ.get("PASS2_IO_WORKERS", "16"))
+# Adaptive Pass 2 fan-out: start at PASS2_IO_WORKERS in-flight chains and let
+# AIMD move it between 1 and PASS2_IO_WORKERS_MAX on Polygon's latency/429s.
+PASS2_ADAPTIVE = __import__("os").environ.get("PASS2_ADAPTIVE", "true").lower() in ("1", "true", "yes")
+PASS2_IO_WORKERS_MAX = int(__import__("os").environ.get("PASS2_IO_WORKERS_MAX", "48"))
+# Async Pass 2: one event loop, many chains in flight under one token bucket
+PASS2_ASYNC = __import__("os").environ.get("PASS2_ASYNC", "false").lower() in ("1", "true", "yes")
+PASS2_MAX_IN_FLIGHT = int(__import__("os").environ.get("PASS2_MAX_IN_FLIGHT", "200"))
+# Fetch chains as columnar OptionChains and score them with the vectorized engine
+PASS2_COLUMNAR = __import__("os").environ.get("PASS2_COLUMNAR", "true").lower() in ("1", "true", "yes")
+# Streaming Pass 2: raw chains buffered between the network and CPU stages
+PASS2_QUEUE_SIZE = int(__import__("os").environ.get("PASS2_QUEUE_SIZE", "32"))
+PASS2_CPU_WORKERS = int(__import__("os").environ.get("PASS2_CPU_WORKERS", "2"))
+# >0: run chain analytics in this many worker processes instead of under the GIL
+PASS2_CPU_PROCESSES = int(__import__("os").environ.get("PASS2_CPU_PROCESSES", "0"))
+# Pass 2 scheduling: movers are fetched by expected signal value and nothing
+# new is started after the deadline (ET wall clock "HH:MM" and/or a budget
+# in seconds from the start of Pass 2; the earlier one wins). The wall
+# clock means its next occurrence within 12 hours, else today's, already past.
+PASS2_DEADLINE_ET = __import__("os").environ.get("PASS2_DEADLINE_ET")
+PASS2_BUDGET_SECONDS = float(__import__("os").environ.get("PASS2_BUDGET_SECONDS", "0"))
+# Score all movers at once with the vectorized engine (batch_scoring) after
+# Pass 2 instead of row by row as chains stream in; same rows either way.
+BATCH_SCORING = __import__("os").environ.get("SCANNER_BATCH_SCORING", "false").lower() in ("1", "true", "yes")
+RECENT_SIGNAL_DAYS = int(__import__("os").environ.get("RECENT_SIGNAL_DAYS", "5"))
+RECENT_SIGNAL_BOOST = float(__import__("os").environ.get("RECENT_SIGNAL_BOOST", "2.0"))
+# Record every Polygon response + the universe to this .json.gz for offline replay
+RECORD_CASSETTE = __import__("os").environ.get("SCANNER_RECORD_CASSETTE")
+# Where scored rows go: "bq_load" (one Parquet load job replacing the scan_date
+# partition), "parquet" (local files under SCANNER_PARQUET_DIR) or "streaming"
+# (legacy insert_rows_json)
+SINK = __import__("os").environ.get("SCANNER_SINK", "bq_load")
+PARQUET_DIR = __import__("os").environ.get("SCANNER_PARQUET_DIR")
+# Also write the end-of-run JSON manifest (stage timings, request metrics) here
+MANIFEST_PATH = __import__("os").environ.get("SCANNER_MANIFEST_PATH")
 # Cluster boost config
 CLUSTER_MIN_SIZE = 4         # Minimum qualifying tickers in same industry+direction
 CLUSTER_MIN_SCORE = 3        # Only count tickers scoring >= this toward cluster
@@ -190,10 +241,19 @@ _SIC_TO_SECTOR = {
 }
 
 
-def _load_metadata_from_polygon(poly) -> dict:
+def _sic_metadata(sic_description: str | None) -> dict:
+    sic = (sic_description or "").strip()
+    if not sic:
+        return {"sector": None, "industry": None}
+    return {"sector": _SIC_TO_SECTOR.get(sic, "Other"), "industry": _SIC_TO_INDUSTRY.get(sic, sic)}
+
+
+def _load_metadata_from_polygon(poly, strict: bool = False) -> dict:
     """
     Fetch sector/industry for all active US stock tickers from Polygon
     reference endpoint. Bulk paginated call — ~6 requests covers everything.
+    A failed page ends the fetch with what was loaded so far, or raises
+    with `strict`.
     """
     meta = {}
     url = f"{poly.BASE}/v3/reference/tickers"
@@ -205,6 +265,8 @@ def _load_metadata_from_polygon(poly) -> dict:
         try:
             data = poly._get(url, params=params)
         except Exception as e:
+            if strict:
+                raise
             logger.error("Polygon metadata fetch failed on page %d: %s", page, e)
             break
 
@@ -213,14 +275,7 @@ def _load_metadata_from_polygon(poly) -> dict:
             ticker = t.get("ticker")
             if not ticker:
                 continue
-            sic = (t.get("sic_description") or "").strip()
-            if sic:
-                industry = _SIC_TO_INDUSTRY.get(sic, sic)
-                sector = _SIC_TO_SECTOR.get(sic, "Other")
-            else:
-                industry = None
-                sector = None
-            meta[ticker] = {"sector": sector, "industry": industry}
+            meta[ticker] = _sic_metadata(t.get("sic_description"))
 
         next_url = data.get("next_url")
         if not next_url:
@@ -232,6 +287,75 @@ def _load_metadata_from_polygon(poly) -> dict:
     return meta
 
 
+def _open_metadata_index(poly: PolygonClient) -> tuple[MetadataIndex | None, threading.Thread | None]:
+    """
+    Load the persisted index. A missing index is built synchronously (the
+    old bulk fetch); one older than SCANNER_METADATA_MAX_AGE_HOURS is
+    rebuilt on a background thread and saved for the next run, while this
+    run keeps using the loaded copy.
+    """
+    uri = config.SCANNER_METADATA_INDEX_URI
+    if not uri:
+        return None, None
+
+    def _rebuild() -> MetadataIndex | None:
+        meta = _load_metadata_from_polygon(poly)
+        if not meta:
+            return None
+        fresh = MetadataIndex.from_metadata(meta)
+        try:
+            fresh.save(uri)
+        except Exception as e:
+            logger.error("Metadata index save failed: %s", e)
+        return fresh
+
+    index = MetadataIndex.load(uri)
+    if index is None or not len(index):
+        return _rebuild(), None
+    if index.age_seconds() < config.SCANNER_METADATA_MAX_AGE_HOURS * 3600:
+        return index, None
+    refresher = threading.Thread(target=_rebuild, name="metadata-index-refresh", daemon=True)
+    refresher.start()
+    return index, refresher
+
+
+def _close_metadata_index(index: MetadataIndex | None, refresher: threading.Thread | None):
+    """Wait for a background rebuild; otherwise persist any delta lookups."""
+    if refresher is not None:
+        refresher.join()
+    elif index is not None and index.dirty:
+        try:
+            index.save(config.SCANNER_METADATA_INDEX_URI)
+        except Exception as e:
+            logger.error("Metadata index save failed: %s", e)
+
+
+def _lookup_ticker_metadata(poly: PolygonClient, ticker: str, index: MetadataIndex):
+    try:
+        data = poly._get(f"{poly.BASE}/v3/reference/tickers/{ticker}")
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            index.add(ticker, None, None)  # unknown to Polygon; don't ask again
+        else:
+            logger.warning("[%s] Metadata lookup failed: %s", ticker, e)
+        return
+    except Exception as e:
+        logger.warning("[%s] Metadata lookup failed: %s", ticker, e)
+        return
+    m = _sic_metadata((data.get("results") or {}).get("sic_description"))
+    index.add(ticker, m["sector"], m["industry"])
+
+
+def _metadata_for(poly: PolygonClient, index: MetadataIndex, tickers: list[str]) -> dict:
+    """Index lookup for `tickers`, fetching only those the index has never seen."""
+    missing = [t for t in tickers if t not in index]
+    if missing:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            list(executor.map(lambda t: _lookup_ticker_metadata(poly, t, index), missing))
+        logger.info("Metadata index: %d delta lookups for unindexed tickers.", len(missing))
+    return {t: m for t in tickers if (m := index.get(t)) is not None}
+
+
 # =====================================================================
 # CLUSTER BOOST
 # =====================================================================
@@ -323,6 +447,8 @@ def _pass1_stock_snapshots(poly: PolygonClient, universe: set[str]) -> list[dict
     if not snapshot:
         logger.error("Pass 1: No snapshot data returned.")
         return []
+    # Pass 2 backfills missing contract underlying prices from this, not per-ticker snapshots
+    poly.price_index = poly.build_price_index(snapshot)
 
     movers = []
     for item in snapshot:
@@ -357,6 +483,61 @@ def _pass1_stock_snapshots(poly: PolygonClient, universe: set[str]) -> list[dict
     return movers
 
 
+# =====================================================================
+# PASS 2 SCHEDULING (priority order + deadline)
+# =====================================================================
+
+def _load_recent_signals(bq: bigquery.Client) -> set[str]:
+    """Tickers that scored >= MIN_SCORE in the last RECENT_SIGNAL_DAYS scans."""
+    q = f"""
+        SELECT DISTINCT ticker FROM `{config.OVERNIGHT_SIGNALS_TABLE}`
+        WHERE scan_date >= DATE_SUB(CURRENT_DATE('America/New_York'), INTERVAL {RECENT_SIGNAL_DAYS} DAY)
+          AND overnight_score >= {MIN_SCORE}
+    """
+    try:
+        tickers = {row["ticker"] for row in bq.query(q)}
+        logger.info("Loaded %d recent signal tickers.", len(tickers))
+        return tickers
+    except Exception as e:
+        logger.warning("Recent signals lookup failed (%s); ordering by flow only.", e)
+        return set()
+
+
+def _mover_priority(m: dict, recent_signals: set[str]) -> float:
+    """Expected signal value: |% change| x day dollar volume, boosted for recent signals."""
+    value = abs(m.get("todaysChangePerc") or 0) * (m.get("day_volume") or 0) * (m.get("underlying_price") or 0)
+    return value * RECENT_SIGNAL_BOOST if m["ticker"] in recent_signals else value
+
+
+def _prioritize_movers(movers: list[dict], recent_signals: set[str] | None = None) -> list[dict]:
+    recent_signals = recent_signals or set()
+    return sorted(movers, key=lambda m: (-_mover_priority(m, recent_signals), m["ticker"]))
+
+
+def _pass2_deadline(start: float | None = None) -> float | None:
+    """Epoch seconds after which Pass 2 starts no new fetches (None = unbounded)."""
+    start = start or time.time()
+    deadlines = []
+    if PASS2_BUDGET_SECONDS > 0:
+        deadlines.append(start + PASS2_BUDGET_SECONDS)
+    if PASS2_DEADLINE_ET:
+        now = datetime.fromtimestamp(start, ZoneInfo("America/New_York"))
+        hh, mm = (int(x) for x in PASS2_DEADLINE_ET.split(":"))
+        at = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        if at <= now:
+            if at + timedelta(days=1) - now <= timedelta(hours=12):
+                at += timedelta(days=1)  # evening start -> the next morning's deadline
+            else:
+                # A retry or late run that starts after today's deadline:
+                # it has passed, so Pass 2 starts no new fetches.
+                logger.warning(
+                    "Pass 2 deadline %s ET already passed at start (%s ET); no chains will be fetched.",
+                    PASS2_DEADLINE_ET, now.strftime("%H:%M"),
+                )
+        deadlines.append(at.timestamp())
+    return min(deadlines) if deadlines else None
+
+
 # =====================================================================
 # FLOW METRICS
 # =====================================================================
@@ -399,10 +580,12 @@ def _uoa_depth(contracts: list[dict]) -> float:
     return total
 
 
-def _best_contract(contracts: list[dict], direction: str, underlying_price: float) -> dict | None:
+def _best_contract(
+    contracts: list[dict], direction: str, underlying_price: float, today: date | None = None
+) -> dict | None:
     """Find the single best contract to trade with full Greeks."""
     candidates = []
-    today = date.today()
+    today = today or date.today()
 
     for c in contracts:
         strike = c.get("strike") or 0
@@ -481,8 +664,13 @@ def _best_contract(contracts: list[dict], direction: str, underlying_price: floa
     return max(candidates, key=lambda x: x["contract_score"])
 
 
-def _compute_flow_metrics(chain: list[dict], underlying_price: float) -> dict:
-    """Compute aggregate options flow metrics."""
+def _compute_flow_metrics(
+    chain: list[dict] | OptionChain, underlying_price: float, today: date | None = None
+) -> dict:
+    """Compute aggregate options flow metrics (DTE measured from `today`)."""
+    if isinstance(chain, OptionChain):
+        return flow_metrics.compute_flow_metrics(chain, underlying_price, today)
+
     calls = [c for c in chain if c.get("option_type") == "call"]
     puts = [c for c in chain if c.get("option_type") == "put"]
 
@@ -514,8 +702,8 @@ def _compute_flow_metrics(chain: list[dict], underlying_price: float) -> dict:
         "atm_put_iv": _atm_iv(puts),
         "total_call_volume": call_vol,
         "total_put_volume": put_vol,
-        "best_call": _best_contract(calls, "call", underlying_price),
-        "best_put": _best_contract(puts, "put", underlying_price),
+        "best_call": _best_contract(calls, "call", underlying_price, today),
+        "best_put": _best_contract(puts, "put", underlying_price, today),
     }
 
 
@@ -523,43 +711,275 @@ def _compute_flow_metrics(chain: list[dict], underlying_price: float) -> dict:
 # PASS 2: OPTIONS CHAINS (parallel, only movers)
 # =====================================================================
 
-def _process_ticker(poly: PolygonClient, ticker_info: dict) -> dict | None:
-    """Pass 2 worker: fetch chain + compute metrics for one mover."""
-    ticker = ticker_info["ticker"]
-    underlying_price = ticker_info.get("underlying_price") or 0
+_DONE = object()  # end-of-stream marker between Pass 2 stages
+
+
+def _past(deadline: float | None) -> bool:
+    return deadline is not None and time.time() >= deadline
 
+
+def _stopped(stop: threading.Event | None) -> bool:
+    return stop is not None and stop.is_set()
+
+
+def _fetch_chain(
+    poly: PolygonClient,
+    ticker_info: dict,
+    chains: queue.Queue,
+    deadline: float | None = None,
+    skipped: list[str] | None = None,
+    concurrency: AdaptiveConcurrency | None = None,
+    stop: threading.Event | None = None,
+):
+    """
+    Network stage: fetch one mover's chain and hand it to the CPU stage.
+    With `concurrency`, the fetch first waits for one of its slots. Once
+    `stop` is set the fetch is dropped.
+    """
+    ticker = ticker_info["ticker"]
+    if _stopped(stop):
+        return
+    if _past(deadline):
+        skipped.append(ticker)
+        return
     try:
-        chain = poly.fetch_options_chain(ticker, max_days=45)
-        if not chain:
-            return None
-        metrics = _compute_flow_metrics(chain, underlying_price)
-        return {**ticker_info, **metrics}
+        if concurrency is None:
+            chain = poly.fetch_options_chain(ticker, max_days=45, columnar=PASS2_COLUMNAR)
+        else:
+            with concurrency.slot(observe=False):  # the client reports each response
+                if _stopped(stop):
+                    return
+                if _past(deadline):
+                    skipped.append(ticker)
+                    return
+                chain = poly.fetch_options_chain(ticker, max_days=45, columnar=PASS2_COLUMNAR)
     except Exception as e:
         logger.error("[%s] Options fetch failed: %s", ticker, e)
-        return None
+        return
+    if chain:
+        chains.put((ticker_info, chain))  # blocks while the CPU stage is behind
+
+
+async def _fetch_chains_async(
+    poly: PolygonClient,
+    movers: list[dict],
+    chains: queue.Queue,
+    deadline: float | None = None,
+    skipped: list[str] | None = None,
+    stop: threading.Event | None = None,
+):
+    """
+    Async network stage: up to PASS2_MAX_IN_FLIGHT chains are paged
+    concurrently, all sharing the sync client's rate limiter. A slot is
+    held until its chain is queued, so back-pressure reaches the fetches.
+    Slots are granted in `movers` order (the semaphore is FIFO). Once
+    `stop` is set no new fetch starts.
+    """
+    from ..clients.async_polygon_client import AsyncPolygonClient
+
+    sem = asyncio.Semaphore(PASS2_MAX_IN_FLIGHT)
+
+    async def _one(apoly: AsyncPolygonClient, ticker_info: dict):
+        ticker = ticker_info["ticker"]
+        async with sem:
+            if _stopped(stop):
+                return
+            if _past(deadline):
+                skipped.append(ticker)
+                return
+            try:
+                chain = await apoly.fetch_options_chain(
+                    ticker, max_days=45, columnar=PASS2_COLUMNAR
+                )
+            except Exception as e:
+                logger.error("[%s] Options fetch failed: %s", ticker, e)
+                return
+            if chain:
+                await asyncio.to_thread(chains.put, (ticker_info, chain))
+
+    async with AsyncPolygonClient(
+        api_key=poly.api_key,
+        max_connections=PASS2_MAX_IN_FLIGHT,
+        rate_limiter=poly.rate_limiter,
+        cassette=poly.cassette,
+        metrics=poly.metrics,
+        price_index=poly.price_index,
+        base_url=poly.BASE,
+    ) as apoly:
+        await asyncio.gather(*(_one(apoly, info) for info in movers))
+
+
+def _reduce_chains(
+    chains: queue.Queue,
+    rows: queue.Queue,
+    today: date,
+    pool: ProcessPoolExecutor | None = None,
+    archive: ChainArchive | None = None,
+    stop: threading.Event | None = None,
+):
+    """
+    CPU stage: reduce each chain to its metric row and drop the contracts
+    (after handing them to `archive`, if any). With a process pool the
+    chain is shipped as packed arrays and this thread only waits on the
+    result. Once `stop` is set chains are discarded unreduced.
+    """
+    while True:
+        item = chains.get()
+        if item is _DONE:
+            rows.put(_DONE)
+            return
+        if _stopped(stop):
+            continue
+        ticker_info, chain = item
+        del item
+        try:
+            underlying_price = ticker_info.get("underlying_price") or 0
+            if pool is None:
+                metrics = _compute_flow_metrics(chain, underlying_price, today)
+            else:
+                if not isinstance(chain, OptionChain):
+                    chain = OptionChain.from_records(chain, ticker_info["ticker"])
+                metrics = pool.submit(
+                    flow_metrics.compute_flow_metrics, chain, underlying_price, today
+                ).result()
+            if archive is not None:
+                archive.add(ticker_info, chain)
+            rows.put({**ticker_info, **metrics})
+        except Exception as e:
+            logger.error("[%s] Metrics failed: %s", ticker_info["ticker"], e)
+        del chain
 
 
-def _pass2_options(poly: PolygonClient, movers: list[dict]) -> list[dict]:
-    """Fetch options chains in parallel for all movers."""
+def _stream_pass2(
+    poly: PolygonClient,
+    movers: list[dict],
+    deadline: float | None = None,
+    skipped: list[str] | None = None,
+    archive: ChainArchive | None = None,
+) -> Iterator[dict]:
+    """
+    Streaming Pass 2. Network workers (MAX_WORKERS threads, or the event
+    loop when PASS2_ASYNC) push raw chains into a queue bounded at
+    PASS2_QUEUE_SIZE; PASS2_CPU_WORKERS threads reduce each one to its
+    metric row as soon as it lands. Rows are yielded as they complete, so
+    at most workers + queue chains are ever held in memory.
+
+    With PASS2_CPU_PROCESSES > 0 the reduction runs in a process pool of
+    that size, leaving the GIL to the network stage.
+
+    Fetches start in `movers` order. Once `deadline` (epoch seconds) has
+    passed no new fetch is started; in-flight ones finish and the rest
+    are appended to `skipped`.
+
+    With an `archive`, every reduced chain is also queued for the chain
+    archive; the caller closes it.
+
+    If the consumer stops early (raises, or closes the generator), no new
+    fetch is started, in-flight ones are discarded, and every worker has
+    exited before the generator returns.
+    """
+    skipped = skipped if skipped is not None else []
     logger.info("Pass 2: Fetching options for %d movers...", len(movers))
-    results = []
+    chains: queue.Queue = queue.Queue(maxsize=PASS2_QUEUE_SIZE)
+    rows: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    today = poly.today()
+
+    pool = None
+    n_cpu = PASS2_CPU_WORKERS
+    if PASS2_CPU_PROCESSES > 0:
+        # forkserver: never fork a process that already has network threads
+        # running. Workers start with numpy + the metrics engine preloaded.
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([flow_metrics.__name__])
+        pool = ProcessPoolExecutor(max_workers=PASS2_CPU_PROCESSES, mp_context=ctx)
+        n_cpu = max(PASS2_CPU_WORKERS, PASS2_CPU_PROCESSES)
+        logger.info(
+            "Pass 2: %d IO workers, %d CPU processes.",
+            PASS2_MAX_IN_FLIGHT if PASS2_ASYNC else MAX_WORKERS, PASS2_CPU_PROCESSES,
+        )
 
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futs = {
-            executor.submit(_process_ticker, poly, info): info["ticker"]
-            for info in movers
-        }
-        for fut in as_completed(futs):
-            ticker = futs[fut]
+    cpu = [
+        threading.Thread(
+            target=_reduce_chains, args=(chains, rows, today, pool, archive, stop),
+            name=f"pass2-cpu-{i}", daemon=True,
+        )
+        for i in range(n_cpu)
+    ]
+    for t in cpu:
+        t.start()
+
+    concurrency = None
+    if PASS2_ADAPTIVE and not PASS2_ASYNC:
+        concurrency = AdaptiveConcurrency(
+            "pass2", initial=MAX_WORKERS, max_limit=max(PASS2_IO_WORKERS_MAX, MAX_WORKERS)
+        )
+        poly.concurrency = concurrency
+
+    def _produce():
+        try:
+            if PASS2_ASYNC:
+                asyncio.run(_fetch_chains_async(poly, movers, chains, deadline, skipped, stop))
+            else:
+                # The executor's work queue is FIFO, so fetches start in priority order
+                # (and take adaptive slots in that order too).
+                workers = concurrency.max_limit if concurrency is not None else MAX_WORKERS
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pass2-io") as executor:
+                    for info in movers:
+                        executor.submit(
+                            _fetch_chain, poly, info, chains, deadline, skipped, concurrency, stop
+                        )
+        except Exception as e:
+            logger.error("Pass 2 producer failed: %s", e)
+        finally:
+            for _ in cpu:
+                chains.put(_DONE)
+
+    producer = threading.Thread(target=_produce, name="pass2-producer", daemon=True)
+    producer.start()
+
+    start = time.monotonic()
+    n, finished = 0, 0
+    try:
+        while finished < len(cpu):
+            row = rows.get()
+            if row is _DONE:
+                finished += 1
+                continue
+            n += 1
+            if n == 1:
+                logger.info("Pass 2: first metric row after %.1fs.", time.monotonic() - start)
+            yield row
+    finally:
+        # Also reached when the consumer raises or closes the generator
+        # early. Queued fetches are dropped, queued chains and in-flight
+        # ones discarded; the producer's _DONE markers end the CPU threads.
+        stop.set()
+        done = 0
+        while True:
             try:
-                data = fut.result()
-                if data:
-                    results.append(data)
-            except Exception as e:
-                logger.error("[%s] Worker failed: %s", ticker, e)
+                done += chains.get_nowait() is _DONE
+            except queue.Empty:
+                break
+        for _ in range(done):
+            chains.put(_DONE)
+        producer.join()
+        for t in cpu:
+            t.join()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if concurrency is not None:
+            poly.concurrency = None
+
+    logger.info("Pass 2 complete: %d tickers with options data.", n)
+    logger.info("Pass 2 rate limiter: %s", poly.rate_limiter.stats())
+    if concurrency is not None:
+        logger.info("Pass 2 concurrency: %s", concurrency.stats())
 
-    logger.info("Pass 2 complete: %d tickers with options data.", len(results))
-    return results
+
+def _pass2_options(poly: PolygonClient, movers: list[dict]) -> list[dict]:
+    """Fetch options chains in parallel for all movers."""
+    return list(_stream_pass2(poly, movers))
 
 
 # =====================================================================
@@ -676,49 +1096,54 @@ def _score_ticker(data: dict) -> dict:
 # BIGQUERY OUTPUT
 # =====================================================================
 
+# overnight_signals columns; signal_sink.SCHEMA mirrors these names,
+# types and modes (check_signal_schema.py compares the two).
+OVERNIGHT_SIGNALS_SCHEMA = [
+    bigquery.SchemaField("scan_date", "DATE", mode="REQUIRED"),
+    bigquery.SchemaField("scan_timestamp", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("ticker", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("direction", "STRING"),
+    bigquery.SchemaField("overnight_score", "INTEGER"),
+    bigquery.SchemaField("price_change_pct", "FLOAT"),
+    bigquery.SchemaField("underlying_price", "FLOAT"),
+    bigquery.SchemaField("day_volume", "INTEGER"),
+    bigquery.SchemaField("call_dollar_volume", "FLOAT"),
+    bigquery.SchemaField("put_dollar_volume", "FLOAT"),
+    bigquery.SchemaField("total_options_dollar_volume", "FLOAT"),
+    bigquery.SchemaField("call_vol_oi_ratio", "FLOAT"),
+    bigquery.SchemaField("put_vol_oi_ratio", "FLOAT"),
+    bigquery.SchemaField("call_active_strikes", "INTEGER"),
+    bigquery.SchemaField("put_active_strikes", "INTEGER"),
+    bigquery.SchemaField("call_uoa_depth", "FLOAT"),
+    bigquery.SchemaField("put_uoa_depth", "FLOAT"),
+    bigquery.SchemaField("signals", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("recommended_contract", "STRING"),
+    bigquery.SchemaField("recommended_strike", "FLOAT"),
+    bigquery.SchemaField("recommended_expiration", "DATE"),
+    bigquery.SchemaField("recommended_dte", "INTEGER"),
+    bigquery.SchemaField("recommended_mid_price", "FLOAT"),
+    bigquery.SchemaField("recommended_spread_pct", "FLOAT"),
+    bigquery.SchemaField("contract_score", "FLOAT"),
+    bigquery.SchemaField("recommended_delta", "FLOAT"),
+    bigquery.SchemaField("recommended_gamma", "FLOAT"),
+    bigquery.SchemaField("recommended_theta", "FLOAT"),
+    bigquery.SchemaField("recommended_vega", "FLOAT"),
+    bigquery.SchemaField("recommended_iv", "FLOAT"),
+    bigquery.SchemaField("recommended_volume", "INTEGER"),
+    bigquery.SchemaField("recommended_oi", "INTEGER"),
+    bigquery.SchemaField("inserted_at", "TIMESTAMP"),
+    bigquery.SchemaField("sector", "STRING"),
+    bigquery.SchemaField("industry", "STRING"),
+    bigquery.SchemaField("cluster_size", "INTEGER"),
+    bigquery.SchemaField("cluster_boost", "INTEGER"),
+    bigquery.SchemaField("original_score", "INTEGER"),
+]
+
+
 def _ensure_table(bq: bigquery.Client):
     """Create overnight_signals table if it doesn't exist."""
     table_id = config.OVERNIGHT_SIGNALS_TABLE
-    schema = [
-        bigquery.SchemaField("scan_date", "DATE", mode="REQUIRED"),
-        bigquery.SchemaField("scan_timestamp", "TIMESTAMP", mode="REQUIRED"),
-        bigquery.SchemaField("ticker", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("direction", "STRING"),
-        bigquery.SchemaField("overnight_score", "INTEGER"),
-        bigquery.SchemaField("price_change_pct", "FLOAT"),
-        bigquery.SchemaField("underlying_price", "FLOAT"),
-        bigquery.SchemaField("day_volume", "INTEGER"),
-        bigquery.SchemaField("call_dollar_volume", "FLOAT"),
-        bigquery.SchemaField("put_dollar_volume", "FLOAT"),
-        bigquery.SchemaField("total_options_dollar_volume", "FLOAT"),
-        bigquery.SchemaField("call_vol_oi_ratio", "FLOAT"),
-        bigquery.SchemaField("put_vol_oi_ratio", "FLOAT"),
-        bigquery.SchemaField("call_active_strikes", "INTEGER"),
-        bigquery.SchemaField("put_active_strikes", "INTEGER"),
-        bigquery.SchemaField("call_uoa_depth", "FLOAT"),
-        bigquery.SchemaField("put_uoa_depth", "FLOAT"),
-        bigquery.SchemaField("signals", "STRING", mode="REPEATED"),
-        bigquery.SchemaField("recommended_contract", "STRING"),
-        bigquery.SchemaField("recommended_strike", "FLOAT"),
-        bigquery.SchemaField("recommended_expiration", "DATE"),
-        bigquery.SchemaField("recommended_dte", "INTEGER"),
-        bigquery.SchemaField("recommended_mid_price", "FLOAT"),
-        bigquery.SchemaField("recommended_spread_pct", "FLOAT"),
-        bigquery.SchemaField("contract_score", "FLOAT"),
-        bigquery.SchemaField("recommended_delta", "FLOAT"),
-        bigquery.SchemaField("recommended_gamma", "FLOAT"),
-        bigquery.SchemaField("recommended_theta", "FLOAT"),
-        bigquery.SchemaField("recommended_vega", "FLOAT"),
-        bigquery.SchemaField("recommended_iv", "FLOAT"),
-        bigquery.SchemaField("recommended_volume", "INTEGER"),
-        bigquery.SchemaField("recommended_oi", "INTEGER"),
-        bigquery.SchemaField("inserted_at", "TIMESTAMP"),
-        bigquery.SchemaField("sector", "STRING"),
-        bigquery.SchemaField("industry", "STRING"),
-        bigquery.SchemaField("cluster_size", "INTEGER"),
-        bigquery.SchemaField("cluster_boost", "INTEGER"),
-        bigquery.SchemaField("original_score", "INTEGER"),
-    ]
+    schema = OVERNIGHT_SIGNALS_SCHEMA
     table = bigquery.Table(table_id, schema=schema)
     table.time_partitioning = bigquery.TimePartitioning(
         type_=bigquery.TimePartitioningType.DAY, field="scan_date"
@@ -732,12 +1157,31 @@ def _ensure_table(bq: bigquery.Client):
         raise
 
 
-def _write_results(bq: bigquery.Client, scored: list[dict]):
-    """Write scored results to BigQuery."""
+def _write_results(bq: bigquery.Client | None, scored: list[dict], sink: str | None = None):
+    """Write scored results through the configured sink (SCANNER_SINK)."""
     if not scored:
         logger.info("No results to write.")
         return
 
+    sink = sink or SINK
+    if sink == "streaming":
+        _stream_results(bq, scored)
+        return
+
+    now = datetime.now(timezone.utc)
+    # Use EST date — scanner runs Friday night EST, UTC may already be Saturday
+    today = datetime.now(ZoneInfo("America/New_York")).date()
+    table = signal_sink.to_arrow(scored, today, now)
+    if sink == "parquet":
+        if not PARQUET_DIR:
+            raise ValueError("SCANNER_SINK=parquet requires SCANNER_PARQUET_DIR")
+        signal_sink.ParquetSink(PARQUET_DIR).write(table, today)
+    else:
+        signal_sink.BigQueryLoadSink(bq, config.OVERNIGHT_SIGNALS_TABLE, OVERNIGHT_SIGNALS_SCHEMA).write(table, today)
+
+
+def _stream_results(bq: bigquery.Client, scored: list[dict]):
+    """Legacy path: write scored results with BigQuery streaming inserts."""
     now = datetime.now(timezone.utc)
     # Use EST date — scanner runs Friday night EST, UTC may already be Saturday
     today = datetime.now(ZoneInfo("America/New_York")).date()
@@ -799,65 +1243,407 @@ def _write_results(bq: bigquery.Client, scored: list[dict]):
         logger.info("Wrote %d rows to %s", len(rows), config.OVERNIGHT_SIGNALS_TABLE)
 
 
+# =====================================================================
+# RUN INSTRUMENTATION
+# =====================================================================
+
+class _RunTimer:
+    """
+    Stage spans and counters for one scanner run. Spans with the same
+    name accumulate, so a stage timed piecemeal (e.g. scoring inside the
+    Pass 2 loop) reports its total.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.counts: dict = {}
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def mark(self, name: str):
+        """Record seconds since the run started (e.g. time to first row)."""
+        self.stages.setdefault(name, time.perf_counter() - self._t0)
+
+    def count(self, name: str, value):
+        self.counts[name] = value
+
+    def manifest(self, poly: PolygonClient, **extra) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "total_seconds": round(time.perf_counter() - self._t0, 3),
+            "stages_seconds": {k: round(v, 3) for k, v in self.stages.items()},
+            "counts": self.counts,
+            "polygon": poly.metrics.stats(),
+            "rate_limiter": poly.rate_limiter.stats(),
+            **extra,
+        }
+
+
+def _emit_manifest(timer: _RunTimer, poly: PolygonClient, **extra) -> dict:
+    """Log the run manifest as one JSON line and write it to MANIFEST_PATH if set."""
+    manifest = timer.manifest(poly, **extra)
+    logger.info("Scan manifest: %s", json.dumps(manifest, default=str))
+    if MANIFEST_PATH:
+        try:
+            with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, default=str)
+        except OSError as e:
+            logger.error("Could not write manifest to %s: %s", MANIFEST_PATH, e)
+    return manifest
+
+
 # =====================================================================
 # MAIN PIPELINE
 # =====================================================================
 
+def _collect_rows(
+    poly: PolygonClient,
+    universe: set[str],
+    recent_signals: set[str] | None,
+    deadline: float | None,
+    checkpoint: ScanCheckpoint | None,
+    timer: _RunTimer,
+    chain_archive: ChainArchive | None = None,
+    on_row=None,
+) -> tuple[list[dict], list[str]]:
+    """
+    Steps 3-5: Pass 1 movers of `universe`, then Pass 2 metric rows
+    (checkpointed rows first). Returns (rows, skipped tickers); `on_row`
+    is called on every row as it arrives.
+    """
+    # Step 3: Pass 1 - stock snapshots, filter movers
+    with timer.span("pass1"):
+        movers = checkpoint.load("movers") if checkpoint else None
+        if movers is None:
+            movers = _pass1_stock_snapshots(poly, universe)
+            if checkpoint and movers:
+                checkpoint.save("movers", movers)
+        elif poly.price_index is None:
+            # Resumed without Pass 1: the checkpointed mover prices stand in for the snapshot
+            poly.price_index = {m["ticker"]: m["underlying_price"] for m in movers if m.get("underlying_price")}
+    timer.count("movers", len(movers))
+    if not movers:
+        logger.info("No movers found. Nothing to scan.")
+        return [], []
+
+    # Steps 4-5: Pass 2 - options chains for movers, handed on as they stream in
+    done = checkpoint.rows() if checkpoint else []
+    done_tickers = {d["ticker"] for d in done}
+    movers = _prioritize_movers([m for m in movers if m["ticker"] not in done_tickers], recent_signals)
+    rows = list(done)
+    if on_row is not None:
+        for d in done:
+            on_row(d)
+    skipped: list[str] = []
+    try:
+        with timer.span("pass2"):
+            for d in _stream_pass2(poly, movers, deadline, skipped, chain_archive):
+                timer.mark("pass2_first_row")
+                if checkpoint:
+                    checkpoint.add_row(d)
+                rows.append(d)
+                if on_row is not None:
+                    on_row(d)
+    finally:
+        if checkpoint:
+            checkpoint.flush()
+    timer.count("resumed_rows", len(done))
+    timer.count("scored", len(rows))
+    timer.count("skipped", skipped)
+    if skipped:
+        logger.warning(
+            "Pass 2 deadline reached: skipped %d of %d movers (lowest priority): %s",
+            len(skipped), len(movers), ", ".join(skipped),
+        )
+    if poly.cassette is not None and not poly.cassette.replaying:
+        poly.cassette.meta["pass2_skipped"] = skipped
+    if not rows:
+        logger.info("No options data collected. Exiting.")
+    return rows, skipped
+
+
+def _scan(
+    poly: PolygonClient,
+    universe: set[str],
+    recent_signals: set[str] | None = None,
+    deadline: float | None = None,
+    checkpoint: ScanCheckpoint | None = None,
+    metadata_index: MetadataIndex | None = None,
+    timer: _RunTimer | None = None,
+    archive: metrics_archive.MetricsArchive | None = None,
+    scan_date: date | None = None,
+    chain_archive: ChainArchive | None = None,
+    metadata: dict | None = None,
+) -> list[dict]:
+    """
+    Steps 2-6: metadata, Pass 1, Pass 2, scoring and cluster boost.
+    Returns every scored ticker sorted by score (empty if nothing to score).
+    Pass 2 runs movers highest-priority first and stops starting new
+    fetches at `deadline`. With a checkpoint, completed stages and metric
+    rows from an earlier attempt are reused and only the rest is fetched.
+    With a metadata index, sector/industry comes from the index (plus
+    per-ticker lookups for unindexed scored tickers) instead of the bulk
+    reference fetch. Stage timings and counts go to `timer`. With an
+    archive, the pre-scoring metric rows and their sector/industry are
+    kept under `scan_date` (default: poly.today()) for offline re-scoring;
+    with a chain_archive, Pass 2 streams every chain into it. A given
+    `metadata` map (replay) is used as is. A recorded cassette keeps the
+    sector/industry of every scored ticker in its meta, so a replay
+    boosts exactly as this run did.
+    """
+    timer = timer or _RunTimer()
+    timer.count("universe", len(universe))
+
+    # Step 2: Load metadata for cluster detection (from Polygon API)
+    if metadata is None and metadata_index is None:
+        with timer.span("metadata"):
+            metadata = checkpoint.load("metadata") if checkpoint else None
+            if metadata is None:
+                metadata = _load_metadata_from_polygon(poly)
+                if checkpoint and metadata:
+                    checkpoint.save("metadata", metadata)
+
+    # Steps 3-5: Pass 1 movers, then Pass 2 metric rows (scored as they stream in)
+    scored: list[dict] = []
+
+    def _score_row(d: dict):
+        with timer.span("scoring"):
+            scored.append(_score_ticker(d))
+
+    rows, _ = _collect_rows(
+        poly, universe, recent_signals, deadline, checkpoint, timer, chain_archive,
+        on_row=None if BATCH_SCORING else _score_row,
+    )
+    if not rows:
+        return []
+
+    # Step 6: Apply industry cluster boost
+    if metadata is None:
+        with timer.span("metadata"):
+            metadata = _metadata_for(poly, metadata_index, [d["ticker"] for d in rows])
+    if poly.cassette is not None and not poly.cassette.replaying:
+        poly.cassette.meta["metadata"] = {d["ticker"]: metadata[d["ticker"]] for d in rows if d["ticker"] in metadata}
+    if archive is not None:
+        with timer.span("metrics_archive"):
+            try:
+                archive.write(metrics_archive.to_arrow(rows, metadata), scan_date or poly.today())
+            except Exception as e:
+                logger.warning("Metrics archive write failed (scan continues): %s", e)
+    with timer.span("cluster_boost"):
+        if BATCH_SCORING:
+            scored = _batch_score(rows, metadata)
+        else:
+            scored = _apply_cluster_boost(scored, metadata)
+        scored.sort(key=lambda x: x["overnight_score"], reverse=True)
+    return scored
+
+
+def _batch_score(rows: list[dict], metadata: dict) -> list[dict]:
+    """batch_scoring.score_rows with this module's thresholds."""
+    params = batch_scoring.ScoreParams(
+        min_dollar_volume=MIN_DOLLAR_VOLUME,
+        cluster_min_size=CLUSTER_MIN_SIZE,
+        cluster_min_score=CLUSTER_MIN_SCORE,
+        cluster_boost_threshold=CLUSTER_BOOST_THRESHOLD,
+    )
+    return batch_scoring.score_rows(rows, metadata, params)
+
+
+def run_chain_archive(root: str, scan_date: date, metadata: dict | None = None) -> list[dict]:
+    """
+    Re-run metrics, scoring and cluster boost on one archived day of chains
+    (see chain_archive). No network: chains are memory-mapped from `root`.
+    Pass `metadata` (ticker -> sector/industry, e.g. from the metrics
+    archive) to reproduce the cluster boost; without it nothing is boosted.
+    """
+    scored = []
+    for mover, chain in read_chains(root, scan_date):
+        if mover is None:
+            continue
+        metrics = _compute_flow_metrics(chain, mover.get("underlying_price") or 0, scan_date)
+        scored.append(_score_ticker({**mover, **metrics}))
+    scored = _apply_cluster_boost(scored, metadata or {})
+    scored.sort(key=lambda x: x["overnight_score"], reverse=True)
+    return scored
+
+
+def run_replay(cassette_path: str) -> list[dict]:
+    """
+    Re-run a recorded scan offline from a cassette: same universe, same
+    Polygon responses, same sector/industry metadata, no GCS, BigQuery or
+    network. Returns scored rows;
+    with SCANNER_PARQUET_DIR set they (and the metric rows, and the chains
+    under chains/) are also written there as Parquet.
+    """
+    cassette = Cassette(cassette_path, mode=REPLAY)
+    poly = PolygonClient(api_key="replay", cassette=cassette)
+    universe = set(cassette.meta.get("universe") or [])
+    recent_signals = set(cassette.meta.get("recent_signals") or [])
+    metadata = cassette.meta.get("metadata")
+    if metadata is None:
+        # Older cassettes: the bulk reference pages, if the recorded run fetched them
+        try:
+            metadata = _load_metadata_from_polygon(poly, strict=True)
+        except CassetteMiss:
+            raise RuntimeError(
+                f"{cassette_path} holds no sector/industry metadata (recorded with the metadata "
+                "index before it was kept in the cassette); re-record it to replay the cluster boost."
+            ) from None
+    logger.info("Replaying %s (as of %s, %d tickers).", cassette_path, cassette.as_of, len(universe))
+    timer = _RunTimer()
+    archive = metrics_archive.MetricsArchive(PARQUET_DIR) if PARQUET_DIR else None
+    # Offline: a complete local archive matters more than a few MB of queued chains.
+    chains = ChainArchive(f"{PARQUET_DIR.rstrip('/')}/chains", cassette.as_of, queue_size=0) if PARQUET_DIR else None
+    try:
+        scored = _scan(
+            poly, universe, recent_signals, timer=timer, archive=archive,
+            chain_archive=chains, metadata=metadata,
+        )
+    finally:
+        if chains is not None:
+            with timer.span("chain_archive_wait"):
+                chains.close()
+    if PARQUET_DIR and scored:
+        with timer.span("parquet_write"):
+            now = datetime.now(timezone.utc)
+            table = signal_sink.to_arrow(scored, cassette.as_of, now)
+            signal_sink.ParquetSink(PARQUET_DIR).write(table, cassette.as_of)
+    _emit_manifest(timer, poly, mode="replay", cassette=cassette_path, as_of=cassette.as_of.isoformat())
+    return scored
+
+
 def run_pipeline():
     """Main entry point for the overnight scanner."""
     logger.info("=" * 60)
     logger.info("OVERNIGHT FLOW SCANNER v1 — Starting")
     logger.info("=" * 60)
 
+    timer = _RunTimer()
     bq = bigquery.Client(project=config.PROJECT_ID)
-    poly = PolygonClient(api_key=config.POLYGON_API_KEY)
+    cache = None
+    if config.POLYGON_CACHE_PATH:
+        cache = ResponseCache(
+            config.POLYGON_CACHE_PATH, max_bytes=config.POLYGON_CACHE_MAX_MB * 1024 * 1024
+        )
+    cassette = Cassette(RECORD_CASSETTE, mode=RECORD) if RECORD_CASSETTE else None
+    poly = PolygonClient(
+        api_key=config.POLYGON_API_KEY,
+        max_calls=config.POLYGON_MAX_CALLS_PER_SEC,
+        cache=cache,
+        cassette=cassette,
+        base_url=config.POLYGON_BASE_URL,
+    )
 
     # Check idempotency — skip if already ran today (EST)
-    today_str = datetime.now(ZoneInfo("America/New_York")).date().isoformat()
-    check_q = f"""
-        SELECT COUNT(*) as cnt FROM `{config.OVERNIGHT_SIGNALS_TABLE}`
-        WHERE scan_date = '{today_str}'
-    """
-    try:
-        result = list(bq.query(check_q))
-        if result and result[0]["cnt"] > 0:
-            logger.info("Already scanned for %s. Skipping.", today_str)
-            return
-    except Exception:
-        pass  # Table might not exist yet
+    today_str = _scan_date_et()
+    if _already_scanned(bq, today_str):
+        return
 
     # Ensure output table exists
     _ensure_table(bq)
 
+    checkpoint = None
+    if config.SCANNER_CHECKPOINT_URI:
+        checkpoint = ScanCheckpoint(config.SCANNER_CHECKPOINT_URI, today_str)
+
     # Step 1: Load universe
-    universe = _load_universe()
+    with timer.span("universe"):
+        universe = set(checkpoint.load("universe") or []) if checkpoint else set()
+        if not universe:
+            universe = _load_universe()
+            if checkpoint and universe:
+                checkpoint.save("universe", sorted(universe))
     if not universe:
         logger.error("Empty universe. Aborting.")
         return
 
-    # Step 2: Load metadata for cluster detection (from Polygon API)
-    metadata = _load_metadata_from_polygon(poly)
-
-    # Step 3: Pass 1 - stock snapshots, filter movers
-    movers = _pass1_stock_snapshots(poly, universe)
-    if not movers:
-        logger.info("No movers found. Nothing to scan.")
+    recent_signals = _load_recent_signals(bq)
+    if cassette is not None:
+        cassette.meta["universe"] = sorted(universe)
+        cassette.meta["recent_signals"] = sorted(recent_signals)
+    with timer.span("metadata"):
+        metadata_index, refresher = _open_metadata_index(poly)
+    archive = None
+    if config.SCANNER_METRICS_URI:
+        archive = metrics_archive.MetricsArchive(config.SCANNER_METRICS_URI)
+    chains = None
+    if config.SCANNER_CHAIN_ARCHIVE_URI:
+        chains = ChainArchive(
+            config.SCANNER_CHAIN_ARCHIVE_URI, date.fromisoformat(today_str), writers=config.SCANNER_CHAIN_ARCHIVE_WRITERS
+        )
+    try:
+        scored = _scan(
+            poly,
+            universe,
+            recent_signals,
+            deadline=_pass2_deadline(),
+            checkpoint=checkpoint,
+            metadata_index=metadata_index,
+            timer=timer,
+            archive=archive,
+            scan_date=date.fromisoformat(today_str),
+            chain_archive=chains,
+        )
+    finally:
+        if chains is not None:
+            with timer.span("chain_archive_wait"):
+                chains.close()
+        with timer.span("metadata_refresh_wait"):
+            _close_metadata_index(metadata_index, refresher)
+    if cassette is not None:
+        cassette.save()
+    if not scored:
+        _emit_manifest(timer, poly, mode="live", scan_date=today_str)
         return
 
-    # Step 4: Pass 2 - options chains for movers
-    enriched = _pass2_options(poly, movers)
-    if not enriched:
-        logger.info("No options data collected. Exiting.")
-        return
+    # Step 7: Filter to min score
+    top = _log_top(scored)
 
-    # Step 5: Score individually
-    scored = [_score_ticker(d) for d in enriched]
+    # Step 6: Write ALL scored tickers (not just top 10) for analysis
+    # But mark which ones made the cut
+    with timer.span("bq_write"):
+        _write_results(bq, scored)
+
+    if cache is not None:
+        logger.info("Polygon response cache: %s", cache.stats())
+    _emit_manifest(
+        timer, poly, mode="live", scan_date=today_str, top=len(top),
+        cache=cache.stats() if cache is not None else None,
+    )
 
-    # Step 6: Apply industry cluster boost
-    scored = _apply_cluster_boost(scored, metadata)
-    scored.sort(key=lambda x: x["overnight_score"], reverse=True)
+    logger.info("Overnight scanner complete. %d signals surfaced.", len(top))
+    return top
 
-    # Step 7: Filter to min score
+
+def _scan_date_et() -> str:
+    return datetime.now(ZoneInfo("America/New_York")).date().isoformat()
+
+
+def _already_scanned(bq: bigquery.Client, today_str: str) -> bool:
+    check_q = f"""
+        SELECT COUNT(*) as cnt FROM `{config.OVERNIGHT_SIGNALS_TABLE}`
+        WHERE scan_date = '{today_str}'
+    """
+    try:
+        result = list(bq.query(check_q))
+        if result and result[0]["cnt"] > 0:
+            logger.info("Already scanned for %s. Skipping.", today_str)
+            return True
+    except Exception:
+        pass  # Table might not exist yet
+    return False
+
+
+def _log_top(scored: list[dict]) -> list[dict]:
+    """Log and return the top 10 tickers scoring >= MIN_SCORE."""
     top = [s for s in scored if s["overnight_score"] >= MIN_SCORE][:10]
 
     logger.info("=" * 60)
@@ -879,10 +1665,211 @@ def run_pipeline():
             " | ".join(t.get("signals", [])),
         )
     logger.info("=" * 60)
+    return top
 
-    # Step 6: Write ALL scored tickers (not just top 10) for analysis
-    # But mark which ones made the cut
-    _write_results(bq, scored)
 
-    logger.info("Overnight scanner complete. %d signals surfaced.", len(top))
+# =====================================================================
+# SHARDED RUNS (N local processes or N Cloud Run job tasks)
+# =====================================================================
+
+def run_shard(index: int, count: int, root: str | None = None, merge: bool = True) -> list[dict] | None:
+    """
+    Pass 1 + Pass 2 for the tickers of shard `index` of `count` (see
+    scan_shards), written as a partial result under `root` (default
+    SCANNER_SHARD_URI). The Polygon rate limit is split evenly between
+    shards since they share one API key. With `merge`, the shard that
+    finds every partial present runs run_merge() (once, via claim_merge;
+    a failed merge releases the claim for the task's retry). A failed
+    scan is recorded for the other shards; whichever task sees the last
+    missing shard give up logs an ERROR, since nothing will merge.
+    """
+    timer = _RunTimer()
+    root = root or config.SCANNER_SHARD_URI
+    today_str = _scan_date_et()
+    logger.info("OVERNIGHT FLOW SCANNER — shard %d/%d for %s", index, count, today_str)
+    store = scan_shards.ShardStore(root, today_str)
+    try:
+        rows, skipped, manifest = _scan_shard(index, count, today_str, timer)
+    except Exception as e:
+        attempt = int(__import__("os").environ.get("CLOUD_RUN_TASK_ATTEMPT", "0"))
+        try:
+            store.write_failure(index, count, attempt, e)
+            if merge:
+                _report_unmergeable(store, count)
+        except Exception as report_error:
+            logger.warning("Could not record shard %d/%d failure: %s", index, count, report_error)
+        raise
+    if rows is None:
+        return None
+
+    store.write_partial(index, count, rows, skipped, manifest)
+    if not merge:
+        return None
+    missing = store.missing(count)
+    if missing:
+        if not _report_unmergeable(store, count):
+            logger.info("Shard %d/%d done; waiting on shards %s to merge.", index, count, missing)
+        return None
+    if not store.claim_merge(count, config.SCANNER_MERGE_LOCK_TTL_SEC):
+        logger.info("Shard %d/%d done; merge already claimed.", index, count)
+        return None
+    try:
+        return run_merge(count, root)
+    except Exception:
+        store.release_merge(count)
+        raise
+
+
+def _report_unmergeable(store: scan_shards.ShardStore, count: int) -> bool:
+    """ERROR (and True) when every missing partial belongs to a shard out of retries."""
+    missing = store.missing(count)
+    if not missing or set(store.failed(count, config.SCANNER_SHARD_MAX_RETRIES)) != set(missing):
+        return False
+    logger.error(
+        "Shards %s of %d failed on their last attempt; %s will not be merged. "
+        "Re-run them, then merge with `python job.py --merge %d`.",
+        missing, count, store.uri, count,
+    )
+    return True
+
+
+def _scan_shard(index: int, count: int, today_str: str, timer: _RunTimer):
+    """(rows, skipped, manifest) for one shard, or (None, None, None) if the day is already scanned."""
+    bq = bigquery.Client(project=config.PROJECT_ID)
+    if _already_scanned(bq, today_str):
+        return None, None, None
+    poly = PolygonClient(
+        api_key=config.POLYGON_API_KEY,
+        max_calls=max(1.0, config.POLYGON_MAX_CALLS_PER_SEC / count),
+        base_url=config.POLYGON_BASE_URL,
+    )
+
+    checkpoint = None
+    if config.SCANNER_CHECKPOINT_URI:
+        checkpoint = ScanCheckpoint(
+            f"{config.SCANNER_CHECKPOINT_URI.rstrip('/')}/shard-{index:03d}-of-{count:03d}", today_str
+        )
+    with timer.span("universe"):
+        full = _load_universe()
+        if not full:
+            # Recorded as this shard's failure, so the others do not wait on it.
+            raise RuntimeError(f"Empty universe for shard {index}/{count}.")
+        universe = scan_shards.shard_universe(full, index, count)
+    timer.count("universe", len(universe))
+    if not universe:
+        # A small universe split many ways: an empty partial keeps the merge going.
+        logger.info("Shard %d/%d has no tickers of %d; writing an empty partial.", index, count, len(full))
+        return [], [], timer.manifest(poly, mode="shard", index=index, count=count)
+    recent_signals = _load_recent_signals(bq)
+
+    chains = None
+    if config.SCANNER_CHAIN_ARCHIVE_URI:
+        chains = ChainArchive(
+            config.SCANNER_CHAIN_ARCHIVE_URI, date.fromisoformat(today_str), writers=config.SCANNER_CHAIN_ARCHIVE_WRITERS
+        )
+    try:
+        rows, skipped = _collect_rows(
+            poly, universe, recent_signals, _pass2_deadline(), checkpoint, timer, chains,
+        )
+    finally:
+        if chains is not None:
+            with timer.span("chain_archive_wait"):
+                chains.close()
+    return rows, skipped, timer.manifest(poly, mode="shard", index=index, count=count)
+
+
+def run_merge(count: int, root: str | None = None) -> list[dict] | None:
+    """
+    Steps 6-7 over every shard's partial: metadata, metrics archive,
+    scoring, the global cluster boost, sort, top-10 and the one
+    BigQuery write for the scan date.
+    """
+    timer = _RunTimer()
+    root = root or config.SCANNER_SHARD_URI
+    today_str = _scan_date_et()
+    bq = bigquery.Client(project=config.PROJECT_ID)
+    if _already_scanned(bq, today_str):
+        return None
+    _ensure_table(bq)
+    poly = PolygonClient(
+        api_key=config.POLYGON_API_KEY,
+        max_calls=config.POLYGON_MAX_CALLS_PER_SEC,
+        base_url=config.POLYGON_BASE_URL,
+    )
+
+    with timer.span("load_partials"):
+        partials = scan_shards.ShardStore(root, today_str).load(count)
+    rows = [d for p in partials for d in p["rows"]]
+    skipped = [t for p in partials for t in p["skipped"]]
+    timer.count("shards", count)
+    timer.count("scored", len(rows))
+    timer.count("skipped", skipped)
+    logger.info("Merging %d shards: %d metric rows, %d skipped movers.", count, len(rows), len(skipped))
+    shard_manifests = [p.get("manifest") for p in partials]
+    if not rows:
+        _emit_manifest(timer, poly, mode="merge", scan_date=today_str, shards=shard_manifests)
+        return None
+
+    with timer.span("metadata"):
+        metadata_index, refresher = _open_metadata_index(poly)
+        try:
+            if metadata_index is None:
+                metadata = _load_metadata_from_polygon(poly)
+            else:
+                metadata = _metadata_for(poly, metadata_index, [d["ticker"] for d in rows])
+        finally:
+            _close_metadata_index(metadata_index, refresher)
+    if config.SCANNER_METRICS_URI:
+        with timer.span("metrics_archive"):
+            try:
+                archive = metrics_archive.MetricsArchive(config.SCANNER_METRICS_URI)
+                archive.write(metrics_archive.to_arrow(rows, metadata), date.fromisoformat(today_str))
+            except Exception as e:
+                logger.warning("Metrics archive write failed (merge continues): %s", e)
+    with timer.span("cluster_boost"):
+        if BATCH_SCORING:
+            scored = _batch_score(rows, metadata)
+        else:
+            scored = _apply_cluster_boost([_score_ticker(d) for d in rows], metadata)
+        scored.sort(key=lambda x: x["overnight_score"], reverse=True)
+
+    top = _log_top(scored)
+    with timer.span("bq_write"):
+        _write_results(bq, scored)
+    _emit_manifest(timer, poly, mode="merge", scan_date=today_str, top=len(top), shards=shard_manifests)
+    logger.info("Overnight scanner complete (%d shards). %d signals surfaced.", count, len(top))
     return top
+
+
+def run_sharded_local(count: int, root: str | None = None) -> list[dict] | None:
+    """
+    run_shard() for every shard as `count` local processes, then
+    run_merge() here. Partials go to `root` (default SCANNER_SHARD_URI).
+    """
+    root = root or config.SCANNER_SHARD_URI
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(target=run_shard, args=(i, count, root, False), name=f"scan-shard-{i}")
+        for i in range(count)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    failed = [i for i, p in enumerate(procs) if p.exitcode != 0]
+    if failed:
+        raise RuntimeError(f"Scanner shards {failed} of {count} failed.")
+    return run_merge(count, root)
+
+
+def run_job() -> list[dict] | None:
+    """
+    Cloud Run job entry point: task CLOUD_RUN_TASK_INDEX of
+    CLOUD_RUN_TASK_COUNT scans its shard; with a single task this is
+    run_pipeline().
+    """
+    env = __import__("os").environ
+    count = int(env.get("CLOUD_RUN_TASK_COUNT", "1"))
+    if count <= 1:
+        return run_pipeline()
+    return run_shard(int(env.get("CLOUD_RUN_TASK_INDEX", "0")), count)
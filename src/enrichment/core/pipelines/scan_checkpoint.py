@@ -0,0 +1,76 @@
+# enrichment/core/pipelines/scan_checkpoint.py
+"""
+Per-stage checkpoints for resumable overnight scanner runs.
+
+A checkpoint lives under <root>/<scan_date>/, where root is a local
+directory or a gs://bucket/prefix URI:
+
+    universe.json   metadata.json   movers.json     whole-stage results
+    rows-00000.jsonl, rows-00001.jsonl, ...         Pass 2 metric rows
+
+Stage files are written once. Metric rows are buffered and flushed as a
+new numbered part every `flush_every` rows (GCS objects cannot be
+appended to), so a crash loses at most one buffer. A restart on the same
+scan date reloads every stage that exists and only fetches the tickers
+that have no row yet.
+"""
+
+import json
+import logging
+import threading
+
+from .object_store import ObjectStore
+
+logger = logging.getLogger(__name__)
+
+
+class ScanCheckpoint:
+    """Checkpoint store for one scan date."""
+
+    def __init__(self, root: str, scan_date: str, flush_every: int = 50):
+        uri = f"{root.rstrip('/')}/{scan_date}"
+        self.uri = uri
+        self.store = ObjectStore(uri)
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._buffer: list[dict] = []
+        self._parts = len(self.store.list("rows-"))
+
+    def load(self, stage: str):
+        """Saved result of `stage`, or None if the stage never completed."""
+        text = self.store.read_text(f"{stage}.json")
+        if text is None:
+            return None
+        logger.info("Checkpoint: resuming %s from %s.", stage, self.uri)
+        return json.loads(text)
+
+    def save(self, stage: str, value):
+        self.store.write_text(f"{stage}.json", json.dumps(value, separators=(",", ":")))
+
+    def rows(self) -> list[dict]:
+        """Every metric row flushed by earlier attempts."""
+        rows = []
+        for name in self.store.list("rows-"):
+            text = self.store.read_text(name) or ""
+            rows.extend(json.loads(line) for line in text.splitlines() if line)
+        if rows:
+            logger.info("Checkpoint: %d metric rows already done in %s.", len(rows), self.uri)
+        return rows
+
+    def add_row(self, row: dict):
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        text = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in self._buffer)
+        self.store.write_text(f"rows-{self._parts:05d}.jsonl", text, "application/x-ndjson")
+        self._parts += 1
+        self._buffer = []
@@ -0,0 +1,121 @@
+# enrichment/core/pipelines/scan_shards.py
+"""
+Deterministic universe sharding and partial results for split scans.
+
+A ticker belongs to shard crc32(ticker) % count, so every worker (local
+process or Cloud Run task) agrees on the split without coordination and
+a ticker stays in the same shard from night to night.
+
+Each shard worker runs Pass 1 and Pass 2 for its tickers and writes one
+partial file of pre-scoring metric rows:
+
+    <root>/<scan_date>/shard-003-of-008.json
+
+root is a local directory or a gs://bucket/prefix URI. The merge step
+(overnight_scanner.run_merge) needs every partial of the same shard
+count: scoring, the cluster boost, the sort and top-N and the BigQuery
+write only make sense over the whole universe. claim_merge() lets the
+last worker to finish run the merge once; a merge that fails releases
+the claim, and a claim older than the task timeout is taken over, so a
+retried task can merge again. Merging twice is harmless (the load sink
+replaces the scan_date partition), a merge that never runs is not.
+
+A shard whose scan raises leaves failed-003-of-008.json (the attempt and
+the error) instead of a partial, so the workers can tell a shard that is
+still running from one that has run out of retries.
+"""
+
+import json
+import logging
+import time
+import zlib
+
+from .object_store import ObjectStore
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(ticker: str, count: int) -> int:
+    """Stable shard index of `ticker` (crc32, not Python's salted hash())."""
+    return zlib.crc32(ticker.encode("utf-8")) % count if count > 1 else 0
+
+
+def shard_universe(universe: set[str], index: int, count: int) -> set[str]:
+    return {t for t in universe if shard_of(t, count) == index}
+
+
+class ShardStore:
+    """Partial results of one scan date's shards."""
+
+    def __init__(self, root: str, scan_date: str):
+        uri = f"{root.rstrip('/')}/{scan_date}"
+        self.uri = uri
+        self.store = ObjectStore(uri)
+
+    @staticmethod
+    def _name(index: int, count: int) -> str:
+        return f"shard-{index:03d}-of-{count:03d}.json"
+
+    @staticmethod
+    def _failure_name(index: int, count: int) -> str:
+        return f"failed-{index:03d}-of-{count:03d}.json"
+
+    @staticmethod
+    def _lock_name(count: int) -> str:
+        return f"merge-of-{count:03d}.lock"
+
+    def write_partial(self, index: int, count: int, rows: list[dict], skipped: list[str], manifest: dict | None = None):
+        doc = {"index": index, "count": count, "rows": rows, "skipped": skipped, "manifest": manifest}
+        self.store.write_text(self._name(index, count), json.dumps(doc, separators=(",", ":"), default=str))
+        self.store.delete(self._failure_name(index, count))  # an earlier attempt's failure
+        logger.info("Shard %d/%d: wrote %d metric rows to %s.", index, count, len(rows), self.uri)
+
+    def write_failure(self, index: int, count: int, attempt: int, error: Exception):
+        doc = {"index": index, "count": count, "attempt": attempt, "error": repr(error), "at": time.time()}
+        self.store.write_text(self._failure_name(index, count), json.dumps(doc))
+
+    def failed(self, count: int, last_attempt: int) -> list[int]:
+        """Shards without a partial whose attempt `last_attempt` (or later) failed."""
+        out = []
+        for i in self.missing(count):
+            body = self.store.read_text(self._failure_name(i, count))
+            if body is not None and json.loads(body).get("attempt", 0) >= last_attempt:
+                out.append(i)
+        return out
+
+    def missing(self, count: int) -> list[int]:
+        present = set(self.store.list("shard-"))
+        return [i for i in range(count) if self._name(i, count) not in present]
+
+    def load(self, count: int) -> list[dict]:
+        """Every shard's partial document (raises if any is missing)."""
+        missing = self.missing(count)
+        if missing:
+            raise FileNotFoundError(f"{len(missing)} of {count} shards missing in {self.uri}: {missing}")
+        return [json.loads(self.store.read_text(self._name(i, count))) for i in range(count)]
+
+    def claim_merge(self, count: int, stale_after: float) -> bool:
+        """
+        True for one caller per scan date and shard count, unless the
+        claim is `stale_after` seconds old (its merge died without
+        releasing it), in which case the next caller takes it over.
+        """
+        name = self._lock_name(count)
+        body = json.dumps({"claimed_at": time.time()}).encode()
+        if self.store.create(name, body):
+            return True
+        held = self.store.read_text(name)
+        try:
+            claimed_at = json.loads(held)["claimed_at"] if held else 0.0
+        except (ValueError, KeyError, TypeError):
+            claimed_at = 0.0  # a lock from before claims were timestamped
+        age = time.time() - claimed_at
+        if age < stale_after:
+            return False
+        logger.warning("Merge claim %s is %.0fs old; taking it over.", self.store.uri(name), age)
+        self.store.delete(name)
+        return self.store.create(name, body)
+
+    def release_merge(self, count: int):
+        """Give up the merge claim (the merge failed) so a retry can claim it."""
+        self.store.delete(self._lock_name(count))
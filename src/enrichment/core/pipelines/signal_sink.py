@@ -0,0 +1,168 @@
+# enrichment/core/pipelines/signal_sink.py
+"""
+Batch sinks for the overnight scanner's scored rows.
+
+to_arrow() turns the scored dicts into one Arrow table whose columns
+match the overnight_signals schema (see overnight_scanner._ensure_table).
+The table is then written in one go:
+
+- BigQueryLoadSink: a single Parquet load job into the scan_date
+  partition (table$YYYYMMDD, WRITE_TRUNCATE). The write is atomic and a
+  rerun replaces the day instead of appending duplicates; nothing sits in
+  the streaming buffer.
+- ParquetSink: <root>/scan_date=YYYY-MM-DD/overnight_signals.parquet, for
+  offline runs, replays and tests.
+"""
+
+import io
+import logging
+import os
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+_TS = pa.timestamp("us", tz="UTC")
+
+# (column, arrow type) in overnight_signals order; values come from the
+# scored row under the same key unless filled in by to_arrow().
+COLUMNS = [
+    ("scan_date", pa.date32()),
+    ("scan_timestamp", _TS),
+    ("ticker", pa.string()),
+    ("direction", pa.string()),
+    ("overnight_score", pa.int64()),
+    ("price_change_pct", pa.float64()),
+    ("underlying_price", pa.float64()),
+    ("day_volume", pa.int64()),
+    ("call_dollar_volume", pa.float64()),
+    ("put_dollar_volume", pa.float64()),
+    ("total_options_dollar_volume", pa.float64()),
+    ("call_vol_oi_ratio", pa.float64()),
+    ("put_vol_oi_ratio", pa.float64()),
+    ("call_active_strikes", pa.int64()),
+    ("put_active_strikes", pa.int64()),
+    ("call_uoa_depth", pa.float64()),
+    ("put_uoa_depth", pa.float64()),
+    ("signals", pa.list_(pa.string())),
+    ("recommended_contract", pa.string()),
+    ("recommended_strike", pa.float64()),
+    ("recommended_expiration", pa.date32()),
+    ("recommended_dte", pa.int64()),
+    ("recommended_mid_price", pa.float64()),
+    ("recommended_spread_pct", pa.float64()),
+    ("contract_score", pa.float64()),
+    ("recommended_delta", pa.float64()),
+    ("recommended_gamma", pa.float64()),
+    ("recommended_theta", pa.float64()),
+    ("recommended_vega", pa.float64()),
+    ("recommended_iv", pa.float64()),
+    ("recommended_volume", pa.int64()),
+    ("recommended_oi", pa.int64()),
+    ("inserted_at", _TS),
+    ("sector", pa.string()),
+    ("industry", pa.string()),
+    ("cluster_size", pa.int64()),
+    ("cluster_boost", pa.int64()),
+    ("original_score", pa.int64()),
+]
+# REQUIRED in overnight_signals; a nullable Parquet column would make the
+# load job relax them, which BigQuery rejects on WRITE_TRUNCATE.
+REQUIRED = {"scan_date", "scan_timestamp", "ticker"}
+SCHEMA = pa.schema([pa.field(name, typ, nullable=name not in REQUIRED) for name, typ in COLUMNS])
+
+
+def _as_date(v) -> date | None:
+    if isinstance(v, date):
+        return v
+    try:
+        return date.fromisoformat(str(v)[:10]) if v else None
+    except ValueError:
+        return None
+
+
+def _column(scored: list[dict], name: str, typ: pa.DataType) -> pa.Array:
+    values = [s.get(name) for s in scored]
+    if pa.types.is_integer(typ):
+        values = [int(v) if v is not None else None for v in values]
+    elif pa.types.is_floating(typ):
+        values = [float(v) if v is not None else None for v in values]
+    elif pa.types.is_list(typ):
+        values = [list(v or []) for v in values]
+    return pa.array(values, type=typ)
+
+
+def to_arrow(scored: list[dict], scan_date: date, now: datetime) -> pa.Table:
+    """Scored rows -> overnight_signals-shaped Arrow table, built column by column."""
+    n = len(scored)
+    fixed = {
+        "scan_date": pa.array([scan_date] * n, type=pa.date32()),
+        "scan_timestamp": pa.array([now] * n, type=_TS),
+        "inserted_at": pa.array([now] * n, type=_TS),
+        "recommended_expiration": pa.array(
+            [_as_date(s.get("recommended_expiration")) for s in scored], type=pa.date32()
+        ),
+    }
+    table = pa.Table.from_arrays(
+        [fixed[name] if name in fixed else _column(scored, name, typ) for name, typ in COLUMNS],
+        schema=SCHEMA,
+    )
+    for name in REQUIRED:  # Arrow does not enforce nullable=False itself
+        if table.column(name).null_count:
+            raise ValueError(f"overnight_signals.{name} is REQUIRED but {table.column(name).null_count} rows have none")
+    return table
+
+
+def _parquet_bytes(table: pa.Table) -> bytes:
+    buf = io.BytesIO()
+    pq.write_table(table, buf, compression="zstd")
+    return buf.getvalue()
+
+
+class ParquetSink:
+    """Hive-style local Parquet files, one per scan date (overwritten on rerun)."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def write(self, table: pa.Table, scan_date: date) -> str:
+        part = os.path.join(self.root, f"scan_date={scan_date.isoformat()}")
+        os.makedirs(part, exist_ok=True)
+        path = os.path.join(part, "overnight_signals.parquet")
+        pq.write_table(table, path, compression="zstd")
+        logger.info("Wrote %d rows to %s", table.num_rows, path)
+        return path
+
+
+class BigQueryLoadSink:
+    """One Parquet load job that replaces the scan_date partition.
+
+    `schema` (the table's bigquery.SchemaField list) is passed to the load
+    job so it never infers or relaxes column modes from the file.
+    """
+
+    def __init__(self, bq, table_id: str, schema: list | None = None):
+        self.bq = bq
+        self.table_id = table_id
+        self.schema = schema
+
+    def write(self, table: pa.Table, scan_date: date):
+        from google.cloud import bigquery
+
+        parquet_options = bigquery.ParquetOptions()
+        parquet_options.enable_list_inference = True  # list<string> -> REPEATED STRING
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            parquet_options=parquet_options,
+        )
+        if self.schema is not None:
+            job_config.schema = self.schema
+        destination = f"{self.table_id}${scan_date:%Y%m%d}"
+        job = self.bq.load_table_from_file(
+            io.BytesIO(_parquet_bytes(table)), destination, job_config=job_config
+        )
+        job.result()
+        logger.info("Loaded %d rows into %s (job %s)", table.num_rows, destination, job.job_id)
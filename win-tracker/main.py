@@ -30,6 +30,7 @@ DATASET = "profit_scout"
 ENRICHED_TABLE = f"{PROJECT_ID}.{DATASET}.overnight_signals_enriched"
 PERFORMANCE_TABLE = f"{PROJECT_ID}.{DATASET}.signal_performance"
 POLYGON_API_KEY = os.getenv("POLYGON_API_KEY", "").strip()
+POLYGON_BASE_URL = os.getenv("POLYGON_BASE_URL", "https://api.polygon.io").rstrip("/")
 
 # X/Twitter credentials
 X_API_KEY = os.getenv("X_API_KEY", "").strip()
@@ -263,7 +264,7 @@ def get_price_history(ticker: str, signal_date: date, days_after: int = 3) -> li
 
     start_date = signal_date + timedelta(days=1)  # day after signal
 
-    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_date.isoformat()}/{end_date.isoformat()}"
+    url = f"{POLYGON_BASE_URL}/v2/aggs/ticker/{ticker}/range/1/day/{start_date.isoformat()}/{end_date.isoformat()}"
     params = {"adjusted": "true", "sort": "asc", "apiKey": POLYGON_API_KEY}
 
     for attempt in range(3):